@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """SpatialDDS spec consistency gate.
 
-Two permanent build checks, run per spec version:
+Permanent build checks, run per spec version:
 
   1. IDL fence drift (universal): every literal ```idl block in
      sections/v<ver>/ that declares a `const string MODULE_ID` MUST match the
@@ -16,14 +16,51 @@ Two permanent build checks, run per spec version:
      identifiers with k < the active minor. This is the C.15 version grep kept
      as a permanent gate.
 
-Usage: check_spec_consistency.py [version]   (default: 1.7)
-Exit status is nonzero if any check fails.
+  3. Enum value uniqueness (universal): no enum in idl/v<ver>/ assigns the
+     same @value, or declares the same enumerator, twice.
+
+  4. Manifest validity (universal): every manifests/v<ver>/*.json parses, and
+     a `schema_version` identifier, where present, names the manifest's own
+     spec version (required from 1.7 on).
+
+Checks are classes registered with @register. Each declares the file kinds it
+consumes ("section", "idl", "manifest"); the engine streams every input file
+once, hands each line to all checks for that kind, and fans the files out over
+a process pool. The canonical MODULE_ID index behind check 1 is cached in
+.build-cache/ (invalidated per file by mtime and size), and fences are compared
+by normalized-body hash first, reading the canonical file only on a mismatch.
+A drifted block is reported with a compact unified diff against its canonical
+file, and --json writes the same findings as a machine-readable report.
+Failures are merged in registration order, then file order, so the report is
+stable regardless of scheduling. The generated SpatialDDS-<ver>-full.md can be
+gated as a section input with --full.
+
+With --since REV only the files changed since that git revision are gated,
+plus every section whose literal fences depend on a changed canonical IDL
+file; a file's verdict never depends on files outside that set, so the
+failures reported are exactly those a full run would report for it.
+
+Usage: check_spec_consistency.py [--full] [-j N] [--since REV] [--json PATH] [version ... | --all]   (default: 1.7)
+Exit status is nonzero if any check fails in any requested version.
 """
+import argparse
+import difflib
+import hashlib
+import json
 import os
 import re
+import subprocess
 import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT, ".build-cache")
+INDEX_FORMAT = 2
+# Drift reports show this many context lines per hunk and at most
+# DIFF_MAX_LINES diff lines per drifted block.
+DIFF_CONTEXT = 2
+DIFF_MAX_LINES = 40
 FENCE_OPEN = "`" * 3 + "idl"
 FENCE_CLOSE = "`" * 3
 
@@ -36,123 +73,613 @@ UNIFIED_MINOR_FROM = (1, 7)
 MODULE_ID_RE = re.compile(r'const\s+string\s+MODULE_ID\s*=\s*"([^"]+)"')
 DUAL_ID_RE = re.compile(r'\bspatial\.[A-Za-z0-9_.]+@[0-9]+\.[0-9]+')
 SLASH_ID_RE = re.compile(r'\bspatial\.[A-Za-z0-9_.]+/1\.([0-9]+)')
+ENUM_OPEN_RE = re.compile(r'\benum\s+(\w+)\s*\{')
+ENUM_VALUE_RE = re.compile(r'@value\(\s*(-?(?:0[xX][0-9a-fA-F]+|[0-9]+))\s*\)\s*(\w+)')
+SCHEMA_VERSION_RE = re.compile(r'^spatial\.[A-Za-z0-9_.]+/([0-9]+\.[0-9]+)$')
+
+# File kinds a check can consume.
+SECTION, IDL, MANIFEST = "section", "idl", "manifest"
+
+# Everything a check needs to know about the version it is gating.
+Version = namedtuple("Version", "version major minor sections_dir idl_dir manifest_dir")
+
+
+def version_context(version):
+    """Build the Version for 'MAJOR.MINOR'; raises ValueError if malformed."""
+    major, minor = (int(x) for x in version.split("."))
+    return Version(
+        version, major, minor,
+        os.path.join(ROOT, "sections", f"v{version}"),
+        os.path.join(ROOT, "idl", f"v{version}"),
+        os.path.join(ROOT, "manifests", f"v{version}"),
+    )
+
+
+def normalized_hash(text):
+    """sha256 of text with surrounding whitespace trimmed, as fences are compared."""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def cached_index(name, paths, summarize):
+    """Map each path (relative to ROOT) -> summarize(text), persisted in .build-cache/.
+
+    The index is stored as .build-cache/<name>.json; a file whose (mtime_ns,
+    size) matches its cache entry is not read again. The result is identical to
+    summarizing every file afresh, and the cache is rewritten only when it
+    changed. summarize must return JSON-serializable values.
+    """
+    path = os.path.join(CACHE_DIR, name + ".json")
+    try:
+        with open(path, encoding="utf-8") as fp:
+            cached = json.load(fp)
+        if cached.get("format") != INDEX_FORMAT:
+            cached = {}
+    except (OSError, ValueError):
+        cached = {}
+    previous = cached.get("files", {})
+
+    files = {}
+    for rel in paths:
+        st = os.stat(os.path.join(ROOT, rel))
+        entry = previous.get(rel)
+        if not entry or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+            with open(os.path.join(ROOT, rel), encoding="utf-8") as fp:
+                text = fp.read()
+            entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "value": summarize(text)}
+        files[rel] = entry
+
+    if files != previous:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fp:
+                json.dump({"format": INDEX_FORMAT, "files": files}, fp, indent=1, sort_keys=True)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # read-only checkout: the index still works, just uncached
+    return {rel: entry["value"] for rel, entry in files.items()}
+
 
+def idl_files(idl_dir):
+    """Paths (relative to ROOT) of every .idl file under idl_dir, sorted."""
+    paths = []
+    for dirpath, dirs, names in os.walk(idl_dir):
+        dirs.sort()
+        for fn in sorted(names):
+            if fn.endswith(".idl"):
+                paths.append(os.path.relpath(os.path.join(dirpath, fn), ROOT))
+    return paths
 
-def iter_idl_fences(md_text):
-    """Yield (line_no, body) for each ```idl ... ``` block (1-indexed opener)."""
-    lines = md_text.split("\n")
-    i = 0
-    while i < len(lines):
-        if lines[i].strip() == FENCE_OPEN:
-            body = []
-            j = i + 1
-            while j < len(lines) and lines[j].strip() != FENCE_CLOSE:
-                body.append(lines[j])
-                j += 1
-            yield i + 1, "\n".join(body)
-            i = j
-        i += 1
+
+def _summarize_idl(text):
+    m = MODULE_ID_RE.search(text)
+    return {"module_id": m.group(1) if m else None, "sha256": normalized_hash(text)}
 
 
 def load_canonical(idl_dir):
-    """Map MODULE_ID string -> (filename, trimmed content)."""
+    """Map MODULE_ID string -> (filename, normalized body sha256), via cached_index()."""
+    index = cached_index("canonical-idl-" + os.path.basename(idl_dir), idl_files(idl_dir), _summarize_idl)
     by_module = {}
-    for dirpath, _, files in os.walk(idl_dir):
-        for fn in sorted(files):
-            if not fn.endswith(".idl"):
-                continue
-            path = os.path.join(dirpath, fn)
-            text = open(path, encoding="utf-8").read()
-            m = MODULE_ID_RE.search(text)
-            if m:
-                rel = os.path.relpath(path, ROOT)
-                by_module[m.group(1)] = (rel, text.strip())
+    for rel, entry in index.items():
+        if entry["module_id"]:
+            by_module[entry["module_id"]] = (rel, entry["sha256"])
     return by_module
 
 
-def check_fence_drift(sections_dir, idl_dir):
-    failures = []
-    canonical = load_canonical(idl_dir)
-    for fn in sorted(os.listdir(sections_dir)):
-        if not fn.endswith(".md"):
-            continue
-        path = os.path.join(sections_dir, fn)
-        text = open(path, encoding="utf-8").read()
-        for line_no, body in iter_idl_fences(text):
-            stripped = body.strip()
-            if stripped.startswith("{{include:"):
-                continue  # build expands includes; nothing to drift
-            m = MODULE_ID_RE.search(body)
-            if not m:
-                continue  # excerpt / abridged snippet, not a full-module copy
-            module_id = m.group(1)
-            loc = f"sections/{os.path.basename(sections_dir)}/{fn}:{line_no}"
-            if module_id not in canonical:
-                failures.append(
-                    f"{loc}: literal IDL block declares MODULE_ID "
-                    f'"{module_id}" with no canonical file under {os.path.relpath(idl_dir, ROOT)}'
-                )
+def fence_module_ids(text):
+    """Sorted MODULE_IDs declared by literal ```idl blocks, as check 1 sees them."""
+    found, body = set(), None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if body is None:
+            if stripped == FENCE_OPEN:
+                body = []
+        elif stripped == FENCE_CLOSE:
+            found.update(_fence_module_id(body))
+            body = None
+        else:
+            body.append(line)
+    if body is not None:
+        found.update(_fence_module_id(body))
+    return sorted(found)
+
+
+def _fence_module_id(body):
+    text = "\n".join(body)
+    if text.strip().startswith("{{include:"):
+        return []
+    m = MODULE_ID_RE.search(text)
+    return [m.group(1)] if m else []
+
+
+_canonical_cache = {}
+
+
+def canonical_for(idl_dir):
+    """load_canonical(), loaded at most once per process and directory."""
+    if idl_dir not in _canonical_cache:
+        _canonical_cache[idl_dir] = load_canonical(idl_dir)
+    return _canonical_cache[idl_dir]
+
+
+def canonical_text(rel):
+    """Content of a canonical IDL file, for the full compare on a hash miss."""
+    with open(os.path.join(ROOT, rel), encoding="utf-8") as fp:
+        return fp.read()
+
+
+def leading_newlines(text):
+    """Lines dropped from the top of text by strip(), to keep diff line numbers true."""
+    return text[:len(text) - len(text.lstrip())].count("\n")
+
+
+def _hunk_range(start, length):
+    if length == 1:
+        return str(start + 1)
+    return f"{start + (1 if length else 0)},{length}"
+
+
+def drift_diff(a, b, a_first=1, b_first=1, context=DIFF_CONTEXT, max_lines=DIFF_MAX_LINES):
+    """Unified-diff hunks turning literal lines a into canonical lines b.
+
+    Drifted copies usually differ in a few lines of a long file, so the common
+    prefix and suffix are trimmed before difflib sees the rest; only the
+    changed middle (plus context) pays for sequence matching. a_first/b_first
+    are the file line numbers of a[0]/b[0]. Returns (lines, truncated) with at
+    most max_lines lines.
+    """
+    n = min(len(a), len(b))
+    lo = 0
+    while lo < n and a[lo] == b[lo]:
+        lo += 1
+    hi = 0
+    while hi < n - lo and a[-1 - hi] == b[-1 - hi]:
+        hi += 1
+    start = max(0, lo - context)
+    keep = max(0, hi - context)
+    matcher = difflib.SequenceMatcher(None, a[start:len(a) - keep], b[start:len(b) - keep], autojunk=False)
+
+    lines = []
+    for group in matcher.get_grouped_opcodes(context):
+        i1, i2 = group[0][1] + start, group[-1][2] + start
+        j1, j2 = group[0][3] + start, group[-1][4] + start
+        lines.append(
+            f"@@ -{_hunk_range(i1 + a_first - 1, i2 - i1)} "
+            f"+{_hunk_range(j1 + b_first - 1, j2 - j1)} @@"
+        )
+        for tag, ai1, ai2, bj1, bj2 in group:
+            if tag == "equal":
+                lines += [" " + line for line in a[ai1 + start:ai2 + start]]
                 continue
-            can_rel, can_body = canonical[module_id]
-            if stripped != can_body:
-                failures.append(
-                    f"{loc}: literal IDL block for {module_id} has DRIFTED from "
-                    f"canonical {can_rel}. Re-sync the block or convert it to "
-                    f"{{{{include:{can_rel}}}}}."
+            lines += ["-" + line for line in a[ai1 + start:ai2 + start]]
+            lines += ["+" + line for line in b[bj1 + start:bj2 + start]]
+    if len(lines) > max_lines:
+        return lines[:max_lines], True
+    return lines, False
+
+
+# ---------------------------------------------------------------------------
+# Check registry. A check is a class with:
+#   kinds            file kinds it consumes (SECTION, IDL, MANIFEST)
+#   applies(ver)     whether it runs for a Version at all (default: always)
+#   __init__(ver)    one instance per (version, file)
+#   begin(label)     before the first line of the file
+#   feed(no, line)   every line, 1-indexed, without the trailing newline
+#   end()            after the last line
+#   failures         list of {"check", "message", ...} records, read after
+#                    end(); fail(message, **detail) appends one
+# ---------------------------------------------------------------------------
+
+CHECKS = []
+
+
+def register(cls):
+    """Class decorator adding a check to the gate, in report order."""
+    CHECKS.append(cls)
+    return cls
+
+
+class Check:
+    name = None
+    kinds = ()
+
+    @staticmethod
+    def applies(ver):
+        return True
+
+    def __init__(self, ver):
+        self.ver = ver
+        self.failures = []
+
+    def fail(self, message, **detail):
+        self.failures.append({"check": self.name, "message": message, **detail})
+
+    def begin(self, label):
+        self.label = label
+
+    def feed(self, line_no, line):
+        pass
+
+    def end(self):
+        pass
+
+
+@register
+class FenceDriftCheck(Check):
+    """Check 1: literal ```idl blocks declaring a MODULE_ID match canonical."""
+
+    name = "fence-drift"
+    kinds = (SECTION,)
+
+    def begin(self, label):
+        super().begin(label)
+        self.body = None
+
+    def feed(self, line_no, line):
+        stripped = line.strip()
+        if self.body is None:
+            if stripped == FENCE_OPEN:
+                self.body = []
+                self.open_line = line_no
+        elif stripped == FENCE_CLOSE:
+            self._block()
+            self.body = None
+        else:
+            self.body.append(line)
+
+    def end(self):
+        if self.body is not None:  # unterminated fence runs to end of file
+            self._block()
+
+    def _block(self):
+        body = "\n".join(self.body)
+        stripped = body.strip()
+        if stripped.startswith("{{include:"):
+            return  # build expands includes; nothing to drift
+        m = MODULE_ID_RE.search(body)
+        if not m:
+            return  # excerpt / abridged snippet, not a full-module copy
+        module_id = m.group(1)
+        loc = f"{self.label}:{self.open_line}"
+        canonical = canonical_for(self.ver.idl_dir)
+        if module_id not in canonical:
+            self.fail(
+                f"{loc}: literal IDL block declares MODULE_ID "
+                f'"{module_id}" with no canonical file under {os.path.relpath(self.ver.idl_dir, ROOT)}'
+            )
+            return
+        can_rel, can_hash = canonical[module_id]
+        if normalized_hash(stripped) == can_hash:
+            return
+        raw = canonical_text(can_rel)
+        if stripped == raw.strip():
+            return
+        hunks, truncated = drift_diff(
+            stripped.splitlines(), raw.strip().splitlines(),
+            self.open_line + 1 + leading_newlines(body), 1 + leading_newlines(raw),
+        )
+        self.fail(
+            f"{loc}: literal IDL block for {module_id} has DRIFTED from "
+            f"canonical {can_rel}. Re-sync the block or convert it to "
+            f"{{{{include:{can_rel}}}}}.",
+            file=self.label, line=self.open_line, module_id=module_id,
+            canonical=can_rel, diff=hunks, truncated=truncated,
+        )
+
+
+@register
+class IdentifierCheck(Check):
+    """Check 2: no dual @-form identifiers and no stale /1.<k> identifiers."""
+
+    name = "identifiers"
+    kinds = (SECTION,)
+
+    @staticmethod
+    def applies(ver):
+        return (ver.major, ver.minor) >= UNIFIED_MINOR_FROM
+
+    def feed(self, line_no, line):
+        if "spatial." not in line or "{{include:" in line:
+            return
+        loc = f"{self.label}:{line_no}"
+        for m in DUAL_ID_RE.finditer(line):
+            self.fail(
+                f"{loc}: retired dual identifier form '{m.group(0)}' "
+                f"(use spatial.<profile>/MAJOR.MINOR)"
+            )
+        for m in SLASH_ID_RE.finditer(line):
+            if int(m.group(1)) < self.ver.minor:
+                self.fail(
+                    f"{loc}: stale identifier '{m.group(0)}' "
+                    f"(active minor is 1.{self.ver.minor})"
                 )
-    return failures
 
 
-def check_identifiers(sections_dir, minor):
-    failures = []
-    for fn in sorted(os.listdir(sections_dir)):
-        if not fn.endswith(".md"):
-            continue
-        path = os.path.join(sections_dir, fn)
-        for i, line in enumerate(open(path, encoding="utf-8"), 1):
-            if "{{include:" in line:
-                continue
-            loc = f"sections/{os.path.basename(sections_dir)}/{fn}:{i}"
-            for m in DUAL_ID_RE.finditer(line):
-                failures.append(
-                    f"{loc}: retired dual identifier form '{m.group(0)}' "
-                    f"(use spatial.<profile>/MAJOR.MINOR)"
+@register
+class EnumValueCheck(Check):
+    """Check 3: @value numbers and enumerator names are unique per enum."""
+
+    name = "enum-values"
+    kinds = (IDL,)
+
+    def begin(self, label):
+        super().begin(label)
+        self.enum = None
+
+    def feed(self, line_no, line):
+        code = line.split("//", 1)[0]
+        if self.enum is None:
+            m = ENUM_OPEN_RE.search(code)
+            if not m:
+                return
+            self.enum, self.values, self.names = m.group(1), {}, set()
+            code = code[m.end():]
+        for m in ENUM_VALUE_RE.finditer(code):
+            value, name = int(m.group(1), 0), m.group(2)
+            loc = f"{self.label}:{line_no}"
+            if name in self.names:
+                self.fail(f"{loc}: enum {self.enum} declares {name} twice")
+            if value in self.values:
+                self.fail(
+                    f"{loc}: enum {self.enum} assigns @value({value}) to both "
+                    f"{self.values[value]} and {name}"
                 )
-            for m in SLASH_ID_RE.finditer(line):
-                if int(m.group(1)) < minor:
-                    failures.append(
-                        f"{loc}: stale identifier '{m.group(0)}' "
-                        f"(active minor is 1.{minor})"
-                    )
-    return failures
+            self.names.add(name)
+            self.values.setdefault(value, name)
+        if "}" in code:
+            self.enum = None
+
+
+@register
+class ManifestCheck(Check):
+    """Check 4: manifest JSON parses and its schema_version matches the spec version."""
+
+    name = "manifests"
+    kinds = (MANIFEST,)
+
+    def begin(self, label):
+        super().begin(label)
+        self.lines = []
 
+    def feed(self, line_no, line):
+        self.lines.append(line)
+
+    def end(self):
+        try:
+            doc = json.loads("\n".join(self.lines))
+        except ValueError as exc:
+            self.fail(f"{self.label}:{getattr(exc, 'lineno', 1)}: invalid JSON ({exc})")
+            return
+        schema_version = doc.get("schema_version") if isinstance(doc, dict) else None
+        if schema_version is None:
+            if (self.ver.major, self.ver.minor) >= UNIFIED_MINOR_FROM:
+                self.fail(f"{self.label}: missing schema_version")
+            return
+        m = SCHEMA_VERSION_RE.match(str(schema_version))
+        if not m or m.group(1) != self.ver.version:
+            self.fail(
+                f"{self.label}: schema_version '{schema_version}' does not name "
+                f"spec version {self.ver.version}"
+            )
+
+
+def scan(path, label, checks):
+    """Stream path once, feeding every line to every check."""
+    for check in checks:
+        check.begin(label)
+    with open(path, encoding="utf-8") as fp:
+        for line_no, line in enumerate(fp, 1):
+            line = line.rstrip("\n")
+            for check in checks:
+                check.feed(line_no, line)
+    for check in checks:
+        check.end()
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+def collect_inputs(ver, full=False):
+    """(kind, path, label) for every file gated for one version, in report order."""
+    inputs = [
+        (SECTION, os.path.join(ver.sections_dir, fn), f"sections/v{ver.version}/{fn}")
+        for fn in sorted(os.listdir(ver.sections_dir))
+        if fn.endswith(".md")
+    ]
+    full_doc = f"SpatialDDS-{ver.version}-full.md"
+    if full and os.path.isfile(os.path.join(ROOT, full_doc)):
+        inputs.append((SECTION, os.path.join(ROOT, full_doc), full_doc))
+    for dirpath, dirs, files in os.walk(ver.idl_dir):
+        dirs.sort()
+        for fn in sorted(files):
+            if fn.endswith(".idl"):
+                path = os.path.join(dirpath, fn)
+                inputs.append((IDL, path, os.path.relpath(path, ROOT)))
+    if os.path.isdir(ver.manifest_dir):
+        for fn in sorted(os.listdir(ver.manifest_dir)):
+            if fn.endswith(".json"):
+                path = os.path.join(ver.manifest_dir, fn)
+                inputs.append((MANIFEST, path, os.path.relpath(path, ROOT)))
+    return inputs
+
+
+def changed_since(rev):
+    """Paths (relative to ROOT) that differ between rev and the working tree.
+
+    Raises subprocess.CalledProcessError if git rejects the revision.
+    """
+    out = subprocess.run(
+        ["git", "-C", ROOT, "diff", "--name-only", "--relative", rev, "--"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return {line for line in out.splitlines() if line}
+
+
+def select_changed(ver, inputs, changed):
+    """Restrict inputs to the files whose verdict can differ after `changed`.
+
+    Changed sections, IDL files and manifests are rechecked as themselves. A
+    changed canonical IDL file also pulls in every section (and the full
+    document) with a fence declaring its MODULE_ID, found through a cached
+    reverse index of fence MODULE_IDs per section. Fences naming a MODULE_ID
+    with no canonical owner fail regardless of what changed, so they are
+    always rechecked; that also covers a deleted or renamed canonical file.
+    A change to this script rechecks everything.
+    """
+    if os.path.relpath(os.path.abspath(__file__), ROOT) in changed:
+        return inputs
+    idl_rel = os.path.relpath(ver.idl_dir, ROOT) + os.sep
+    idl_index = cached_index(
+        "canonical-idl-" + os.path.basename(ver.idl_dir), idl_files(ver.idl_dir), _summarize_idl
+    )
+    owned = {entry["module_id"] for entry in idl_index.values() if entry["module_id"]}
+    touched = {idl_index[rel]["module_id"] for rel in changed if rel in idl_index}
+    section_labels = [label for kind, _, label in inputs if kind == SECTION]
+    fences = cached_index(f"fence-ids-v{ver.version}", section_labels, fence_module_ids)
+    full_doc = f"SpatialDDS-{ver.version}-full.md"
+    sections_changed = any(label in changed for label in section_labels if label != full_doc)
+    idl_changed = any(rel.startswith(idl_rel) for rel in changed)
+
+    selected = []
+    for kind, path, label in inputs:
+        if label in changed:
+            keep = True
+        elif kind == SECTION:
+            ids = set(fences[label])
+            keep = bool(ids & touched or ids - owned)
+            # The generated document follows its sources; any change re-gates it.
+            if label == full_doc:
+                keep = keep or sections_changed or idl_changed
+        else:
+            keep = False
+        if keep:
+            selected.append((kind, path, label))
+    return selected
+
+
+def run_file(job):
+    """Worker: run every applicable check over one file; return [(check index, failures)]."""
+    version, kind, path, label = job
+    ver = version_context(version)
+    checks = [
+        (i, cls(ver)) for i, cls in enumerate(CHECKS)
+        if kind in cls.kinds and cls.applies(ver)
+    ]
+    if not checks:
+        return []
+    scan(path, label, [c for _, c in checks])
+    return [(i, c.failures) for i, c in checks]
+
+
+def check_versions(versions, full=False, jobs=None, changed=None):
+    """Gate several versions at once; return {version: [failure record, ...]}.
+
+    With changed (a set of ROOT-relative paths), only the inputs picked by
+    select_changed() are gated. Raises ValueError for a malformed version and
+    FileNotFoundError for a missing sections/ or idl/ directory.
+    """
+    work = []
+    for version in versions:
+        ver = version_context(version)
+        for d in (ver.sections_dir, ver.idl_dir):
+            if not os.path.isdir(d):
+                raise FileNotFoundError(f"missing directory {d}")
+        inputs = collect_inputs(ver, full)
+        if changed is not None:
+            inputs = select_changed(ver, inputs, changed)
+        work += [(version, kind, path, label) for kind, path, label in inputs]
+        # Refresh the persisted index once here so workers only stat files.
+        canonical_for(ver.idl_dir)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(work) <= 1:
+        results = [run_file(job) for job in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(run_file, work, chunksize=max(1, len(work) // (jobs * 4))))
+
+    # Stable merge: per version, registration order of checks, then file order.
+    merged = {version: [[] for _ in CHECKS] for version in versions}
+    for job, result in zip(work, results):
+        for i, failures in result:
+            merged[job[0]][i] += failures
+    return {version: [f for per_check in merged[version] for f in per_check] for version in versions}
+
+
+def all_versions():
+    """Versions that have both a sections/ and an idl/ tree, oldest first."""
+    versions = []
+    for entry in os.listdir(os.path.join(ROOT, "sections")):
+        if entry.startswith("v") and os.path.isdir(os.path.join(ROOT, "idl", entry)):
+            versions.append(entry[1:])
+    return sorted(versions, key=lambda v: tuple(int(x) for x in v.split(".")))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SpatialDDS spec consistency gate.")
+    parser.add_argument("versions", nargs="*", help="spec versions to gate (default: 1.7)")
+    parser.add_argument("--all", action="store_true", help="gate every version")
+    parser.add_argument("--full", action="store_true", help="also gate SpatialDDS-<ver>-full.md")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--since", metavar="REV", help="only gate files changed since a git revision")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write a machine-readable report ('-': stdout, with the text report on stderr)")
+    args = parser.parse_args(argv)
+    versions = all_versions() if args.all else (args.versions or ["1.7"])
 
-def main():
-    version = sys.argv[1] if len(sys.argv) > 1 else "1.7"
     try:
-        major, minor = (int(x) for x in version.split("."))
+        changed = changed_since(args.since) if args.since else None
+    except (OSError, subprocess.CalledProcessError) as exc:
+        detail = getattr(exc, "stderr", None) or exc
+        print(f"error: cannot diff against '{args.since}': {str(detail).strip()}", file=sys.stderr)
+        return 2
+
+    try:
+        results = check_versions(versions, full=args.full, jobs=args.jobs, changed=changed)
     except ValueError:
-        print(f"error: bad version '{version}' (expected e.g. 1.7)", file=sys.stderr)
+        bad = next((v for v in versions if not re.fullmatch(r"[0-9]+\.[0-9]+", v)), versions[0])
+        print(f"error: bad version '{bad}' (expected e.g. 1.7)", file=sys.stderr)
         return 2
+    except FileNotFoundError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    # With --json - stdout carries only the JSON document.
+    out = sys.stderr if args.json == "-" else sys.stdout
+    failed = []
+    for version in versions:
+        failures = results[version]
+        if failures:
+            print(f"Spec consistency FAILED for v{version} ({len(failures)} issue(s)):\n", file=out)
+            for f in failures:
+                print(f"  - {f['message']}", file=out)
+                if f.get("diff"):
+                    print(f"      --- {f['file']} (literal)\n      +++ {f['canonical']} (canonical)", file=out)
+                    for line in f["diff"]:
+                        print(f"      {line}", file=out)
+                    if f["truncated"]:
+                        print(f"      ... diff truncated at {DIFF_MAX_LINES} lines", file=out)
+            failed.append(version)
+        else:
+            print(f"Spec consistency OK for v{version} (IDL fences match canonical; identifiers clean).", file=out)
+
+    if len(versions) > 1:
+        print(f"\n{len(versions) - len(failed)}/{len(versions)} version(s) clean"
+              + (f"; FAILED: {', '.join('v' + v for v in failed)}" if failed else "."), file=out)
 
-    sections_dir = os.path.join(ROOT, "sections", f"v{version}")
-    idl_dir = os.path.join(ROOT, "idl", f"v{version}")
-    for d in (sections_dir, idl_dir):
-        if not os.path.isdir(d):
-            print(f"error: missing directory {d}", file=sys.stderr)
-            return 2
-
-    failures = check_fence_drift(sections_dir, idl_dir)
-    if (major, minor) >= UNIFIED_MINOR_FROM:
-        failures += check_identifiers(sections_dir, minor)
-
-    if failures:
-        print(f"Spec consistency FAILED for v{version} ({len(failures)} issue(s)):\n")
-        for f in failures:
-            print(f"  - {f}")
-        return 1
-    print(f"Spec consistency OK for v{version} (IDL fences match canonical; identifiers clean).")
-    return 0
+    if args.json:
+        report = {
+            "versions": {v: {"ok": not results[v], "failures": results[v]} for v in versions},
+            "failed": failed,
+        }
+        text = json.dumps(report, indent=2) + "\n"
+        if args.json == "-":
+            sys.stdout.write(text)
+        else:
+            with open(args.json, "w", encoding="utf-8") as fp:
+                fp.write(text)
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
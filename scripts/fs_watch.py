@@ -0,0 +1,149 @@
+"""Minimal file-change watcher: inotify on Linux, mtime polling elsewhere.
+
+make_watcher(trees, flat) returns an object whose changes(timeout) blocks
+until a file under one of the trees (recursively), or a file directly inside
+one of the flat (directory, glob) pairs, is created, modified, moved or
+deleted, then returns the set of affected paths. A short settle window
+coalesces the burst of events an editor produces on save. inotify is driven
+through ctypes so no third-party package is needed; if it is unavailable
+(non-Linux, watch limit exhausted) a polling watcher with the same interface
+is used.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+SETTLE_S = 0.05
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    def __init__(self, trees: list[Path], flat: list[tuple[Path, str]]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, Path] = {}
+        # Flat directories are watched without recursion, and only names
+        # matching their pattern are reported from them.
+        self.flat = dict(flat)
+        try:
+            for d in trees:
+                self._watch_tree(d)
+            for directory in self.flat:
+                self._watch(directory)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def _watch(self, directory: Path) -> None:
+        wd = self._add(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.dirs[wd] = directory
+
+    def _watch_tree(self, root: Path) -> None:
+        if not root.is_dir():
+            return
+        self._watch(root)
+        for dirpath, dirnames, _ in os.walk(root):
+            for name in dirnames:
+                self._watch(Path(dirpath) / name)
+
+    def _read(self) -> set[Path]:
+        changed: set[Path] = set()
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if directory in self.flat:
+                if not mask & IN_ISDIR and fnmatch.fnmatch(path.name, self.flat[directory]):
+                    changed.add(path)
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_tree(path)
+                    changed.update(p for p in path.rglob("*") if p.is_file())
+                continue
+            changed.add(path)
+        return changed
+
+    def changes(self, timeout: float | None = None) -> set[Path]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = self._read()
+        while select.select([self.fd], [], [], SETTLE_S)[0]:
+            changed |= self._read()
+        return changed
+
+
+class PollingWatcher:
+    def __init__(self, trees: list[Path], flat: list[tuple[Path, str]], interval: float = 0.3) -> None:
+        self.trees = trees
+        self.flat = flat
+        self.interval = interval
+        self.state = self._snapshot()
+
+    def _snapshot(self) -> dict[Path, tuple[int, int]]:
+        state = {}
+        paths = [p for d in self.trees if d.is_dir() for p in d.rglob("*")]
+        paths += [p for d, pattern in self.flat for p in d.glob(pattern)]
+        for path in paths:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            if not path.is_dir():
+                state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def changes(self, timeout: float | None = None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval)
+            current = self._snapshot()
+            changed = {p for p in current.keys() | self.state.keys() if current.get(p) != self.state.get(p)}
+            self.state = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+
+def make_watcher(trees: list[Path], flat: list[tuple[Path, str]]) -> InotifyWatcher | PollingWatcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(trees, flat)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(trees, flat)
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""Shared engine for the dataset conformance harnesses.
+
+A harness (deepsense6g_harness_v*.py, nuscenes_harness_v2.py) creates one
+Harness and registers its checks with @harness.check. A check is a plain
+function check(out, ctx): it reports through out.add(...) into its own
+Findings buffer and reads whatever the harness passes as ctx (the IDL
+mirrors of the selected spec version, say). Nothing runs at import, so a CI
+driver can import several harnesses and run each against many spec
+revisions in one process.
+
+Harness.run() executes the checks on a thread pool, or a process pool with
+processes=True (ctx and the findings must then pickle). A check declared
+with after=(...) starts only once those checks have finished; if one of them
+raised, it is not run and reports an ERROR finding instead. The buffers are
+merged in registration order, so the findings, and every report built from
+them, are the same however the checks were scheduled.
+
+With record=True every check reads ctx through an InputRecorder, which
+notes each mirror entry and plain ctx value the check looked at. Those reads
+are what harness_store.py keys stored results on, so an incremental run can
+reuse a check's findings when everything it read is unchanged. A check that
+reads anything else (another module's code, dataset files) is registered
+with cache=False; reading a ctx attribute that is neither a mirror group nor
+a plain value (ctx.MIRROR.version, say) has the same effect.
+
+print_report() is the modality/coverage report the DeepSense harnesses
+print; findings_json() gives the findings in the harness results layout.
+
+Usage: imported by the harness scripts; not run directly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import textwrap
+import traceback
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, List, Optional
+
+
+# ── Severity / Status ──────────────────────────────────────────────
+class Sev(Enum):
+    PASS = "PASS"
+    INFO = "INFO"
+    GAP = "GAP"
+    MISMATCH = "MISMATCH"
+    MISSING = "MISSING"
+    ERROR = "ERROR"      # the check itself failed
+
+
+@dataclass
+class Finding:
+    modality: str
+    check_id: str
+    title: str
+    severity: Sev
+    detail: str
+    v1_severity: Optional[Sev] = None   # severity in an earlier harness run, where tracked
+
+    def to_dict(self) -> dict:
+        return {
+            "modality": self.modality,
+            "check_id": self.check_id,
+            "title": self.title,
+            "severity": self.severity.value,
+            "detail": self.detail,
+        }
+
+
+class Findings:
+    """The findings one check reports; each check run gets a fresh buffer."""
+
+    def __init__(self, check: str) -> None:
+        self.check = check
+        self.items: List[Finding] = []
+
+    def add(self, modality, check_id, title, severity, detail, v1_severity=None):
+        self.items.append(Finding(modality, check_id, title, severity, detail, v1_severity))
+
+
+@dataclass(frozen=True)
+class Check:
+    name: str
+    fn: Callable
+    after: tuple = ()
+    cache: bool = True     # findings depend on the ctx reads alone
+
+
+@dataclass
+class Outcome:
+    """What running one check produced."""
+    findings: List[Finding] = field(default_factory=list)
+    failed: bool = False
+    inputs: Optional[list] = None   # recorded ctx reads, when recording and cacheable
+
+
+# ── Input recording ───────────────────────────────────────────────
+PLAIN = (str, int, float, bool, type(None))
+AMBIGUOUS = "<ambiguous>"
+
+
+def _plain(value) -> bool:
+    if isinstance(value, (list, tuple)):
+        return all(_plain(v) for v in value)
+    return isinstance(value, PLAIN)
+
+
+def read_input(ctx, attr: str, name: Optional[str]):
+    """Value of one recorded read: a mirror entry (None if undeclared) or a plain ctx value."""
+    value = getattr(ctx, attr, None)
+    if name is None:
+        return list(value) if isinstance(value, tuple) else value
+    if name == "*":
+        return {k: read_input(ctx, attr, k) for k in sorted(value)}
+    try:
+        return value[name] if name in value else None
+    except LookupError:   # MirrorError: declared with different content in two modules
+        return AMBIGUOUS
+
+
+class _GroupReads(Mapping):
+    """A mirror group that notes which entries a check looked up."""
+
+    def __init__(self, recorder: "InputRecorder", attr: str, group) -> None:
+        self._recorder, self._attr, self._group = recorder, attr, group
+
+    def _note(self, name) -> None:
+        if isinstance(name, str):
+            self._recorder.note(self._attr, name)
+
+    def __getitem__(self, name):
+        self._note(name)
+        return self._group[name]
+
+    def __contains__(self, name) -> bool:
+        self._note(name)
+        return name in self._group
+
+    def __iter__(self):
+        self._recorder.note(self._attr, "*")
+        return iter(self._group)
+
+    def __len__(self) -> int:
+        self._recorder.note(self._attr, "*")
+        return len(self._group)
+
+    def __getattr__(self, name):
+        self._recorder.opaque = True   # version, digest, ...: not an entry
+        return getattr(self._group, name)
+
+
+class InputRecorder:
+    """ctx as a check sees it while its reads are recorded."""
+
+    def __init__(self, ctx) -> None:
+        self._ctx = ctx
+        self._reads: dict[tuple, object] = {}
+        self.opaque = False
+
+    def note(self, attr: str, name: Optional[str]) -> None:
+        if (attr, name) not in self._reads:
+            self._reads[(attr, name)] = read_input(self._ctx, attr, name)
+
+    def __getattr__(self, attr):
+        value = getattr(self._ctx, attr)
+        if isinstance(value, Mapping):
+            return _GroupReads(self, attr, value)
+        if _plain(value):
+            self.note(attr, None)
+        else:
+            self.opaque = True
+        return value
+
+    def inputs(self) -> Optional[list]:
+        """[attr, name, value] per read, sorted; None if the check read something unrecordable."""
+        if self.opaque:
+            return None
+        return [[attr, name, value] for (attr, name), value in
+                sorted(self._reads.items(), key=lambda kv: (kv[0][0], kv[0][1] or ""))]
+
+
+def run_check(check: Check, ctx, record: bool = False) -> Outcome:
+    """Worker: run one check into a fresh buffer; an exception becomes an ERROR finding."""
+    out = Findings(check.name)
+    recorder = InputRecorder(ctx) if record and check.cache else None
+    try:
+        check.fn(out, recorder if recorder is not None else ctx)
+    except Exception as exc:
+        where = traceback.extract_tb(exc.__traceback__)[-1]
+        out.add(check.name, check.name, "Check raised an exception", Sev.ERROR,
+                f"{type(exc).__name__}: {exc} (line {where.lineno})")
+        return Outcome(out.items, failed=True)
+    return Outcome(out.items, inputs=recorder.inputs() if recorder is not None else None)
+
+
+class Harness:
+    """Registry of one harness's checks, in registration order."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.checks: dict[str, Check] = {}
+
+    def check(self, fn=None, *, after=(), cache=True):
+        """Register fn(out, ctx) as a check; usable bare or as @harness.check(after=(...), cache=False)."""
+        def register(fn):
+            if fn.__name__ in self.checks:
+                raise ValueError(f"{self.name}: check {fn.__name__} registered twice")
+            self.checks[fn.__name__] = Check(fn.__name__, fn, tuple(after), cache)
+            return fn
+        return register(fn) if fn is not None else register
+
+    def _validate(self) -> None:
+        for c in self.checks.values():
+            unknown = [d for d in c.after if d not in self.checks]
+            if unknown:
+                raise ValueError(f"{self.name}: {c.name} runs after unknown check(s) {', '.join(unknown)}")
+        state: dict[str, int] = {}   # 1 = on the current path, 2 = done
+
+        def visit(name: str, path: tuple) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"{self.name}: dependency cycle {' -> '.join(path + (name,))}")
+            state[name] = 1
+            for dep in self.checks[name].after:
+                visit(dep, path + (name,))
+            state[name] = 2
+
+        for name in self.checks:
+            visit(name, ())
+
+    def run(self, ctx=None, *, jobs: int | None = None, processes: bool = False) -> List[Finding]:
+        """Run every check and return the merged findings, in registration order."""
+        outcomes = self.execute(ctx, jobs=jobs, processes=processes)
+        return [f for name in self.checks for f in outcomes[name].findings]
+
+    def execute(self, ctx=None, *, jobs: int | None = None, processes: bool = False,
+                record: bool = False, reuse: Optional[dict] = None) -> dict[str, Outcome]:
+        """Outcome of every check; checks named in reuse take that Outcome instead of running."""
+        self._validate()
+        outcomes: dict[str, Outcome] = dict(reuse or {})
+        pending = {name: c for name, c in self.checks.items() if name not in outcomes}
+
+        def ready() -> list[Check]:
+            batch = []
+            for name, c in list(pending.items()):
+                if all(d in outcomes for d in c.after):
+                    del pending[name]
+                    failed = [d for d in c.after if outcomes[d].failed]
+                    if failed:
+                        outcomes[name] = Outcome([Finding(name, name, "Check skipped", Sev.ERROR,
+                                                          f"depends on failed check(s) {', '.join(failed)}")],
+                                                 failed=True)
+                    else:
+                        batch.append(c)
+            return batch
+
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1:
+            while pending:
+                for c in ready():
+                    outcomes[c.name] = run_check(c, ctx, record)
+        else:
+            pool_type = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            with pool_type(max_workers=jobs) as pool:
+                running = {}
+                while pending or running:
+                    for c in ready():
+                        running[pool.submit(run_check, c, ctx, record)] = c.name
+                    if not running:
+                        continue  # skipped checks may have made more checks ready
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        outcomes[running.pop(future)] = future.result()
+        return outcomes
+
+
+def add_engine_arguments(parser: argparse.ArgumentParser) -> None:
+    """The scheduling and results-store options every harness takes."""
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="checks to run at once (default: CPU count; 1 runs them in order)")
+    parser.add_argument("--processes", action="store_true", help="use a process pool instead of threads")
+    parser.add_argument("--store", nargs="?", const="", default=None, metavar="DB",
+                        help="append this run to a results store (default DB: .build-cache/harness-results.sqlite)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reuse stored findings of checks whose IDL inputs are unchanged (implies --store)")
+
+
+def run_harness(harness: Harness, ctx, args, *, spec_version: str | None = None) -> List[Finding]:
+    """harness.run() with the options of add_engine_arguments().
+
+    Runs are stored under ctx.MIRROR's version and IDL digest; a harness
+    without IDL-derived mirrors passes the spec version it was written for.
+    """
+    if args.store is None and not args.incremental:
+        return harness.run(ctx, jobs=args.jobs, processes=args.processes)
+    import harness_store
+
+    mirror = getattr(ctx, "MIRROR", None)
+    if spec_version is None and mirror is None:
+        raise ValueError(f"{harness.name}: storing a run needs ctx.MIRROR or an explicit spec_version")
+    return harness_store.run(harness, ctx, spec_version or mirror.version, mirror.digest if mirror else "",
+                             store=args.store or None, incremental=args.incremental,
+                             jobs=args.jobs, processes=args.processes)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# Report
+# ═══════════════════════════════════════════════════════════════════
+def severity_icon(s):
+    return {"PASS":"✅","INFO":"ℹ️","GAP":"⚠️","MISMATCH":"🔶","MISSING":"❌","ERROR":"💥"}.get(s.value,"?")
+
+
+def modalities(findings):
+    """Modalities in first-seen order."""
+    seen = []
+    for f in findings:
+        if f.modality not in seen:
+            seen.append(f.modality)
+    return seen
+
+
+def findings_json(findings):
+    return [f.to_dict() for f in findings]
+
+
+def print_report(findings, title):
+    """Per-modality findings, coverage matrix and deferred items; returns the totals."""
+    print("=" * 80)
+    print(title)
+    print("=" * 80)
+
+    mods = modalities(findings)
+    total = len(findings)
+    passes = sum(1 for f in findings if f.severity == Sev.PASS)
+    gaps = sum(1 for f in findings if f.severity == Sev.GAP)
+    missing = sum(1 for f in findings if f.severity == Sev.MISSING)
+
+    print(f"\nSummary: {passes}/{total} PASS | {gaps} GAP | {missing} MISSING\n")
+
+    for mod in mods:
+        mod_findings = [f for f in findings if f.modality == mod]
+        mod_pass = sum(1 for f in mod_findings if f.severity == Sev.PASS)
+        print(f"\n{'─' * 70}")
+        print(f"  {mod}  ({mod_pass}/{len(mod_findings)} pass)")
+        print(f"{'─' * 70}")
+        for f in mod_findings:
+            icon = severity_icon(f.severity)
+            print(f"  {icon} {f.check_id}: {f.title}")
+            for line in textwrap.wrap(f.detail, width=72):
+                print(f"       {line}")
+
+    # Coverage matrix
+    print(f"\n{'=' * 80}")
+    print("Coverage Matrix")
+    print(f"{'=' * 80}")
+    print(f"  {'Modality':<20} {'Checks':>7} {'Pass':>6} {'Gap':>5} {'Missing':>8} {'Coverage':>9}")
+    print(f"  {'─'*20} {'─'*7} {'─'*6} {'─'*5} {'─'*8} {'─'*9}")
+
+    grand_total = grand_pass = grand_gap = grand_missing = 0
+    for mod in mods:
+        mf = [f for f in findings if f.modality == mod]
+        mp = sum(1 for f in mf if f.severity == Sev.PASS)
+        mg = sum(1 for f in mf if f.severity == Sev.GAP)
+        mm = sum(1 for f in mf if f.severity == Sev.MISSING)
+        mc = len(mf)
+        pct = f"{100*mp/mc:.0f}%" if mc > 0 else "—"
+        print(f"  {mod:<20} {mc:>7} {mp:>6} {mg:>5} {mm:>8} {pct:>9}")
+        grand_total += mc; grand_pass += mp; grand_gap += mg; grand_missing += mm
+
+    pct = f"{100*grand_pass/grand_total:.0f}%" if grand_total > 0 else "—"
+    print(f"  {'─'*20} {'─'*7} {'─'*6} {'─'*5} {'─'*8} {'─'*9}")
+    print(f"  {'TOTAL':<20} {grand_total:>7} {grand_pass:>6} {grand_gap:>5} {grand_missing:>8} {pct:>9}")
+
+    # Deferred items summary
+    print(f"\n{'─' * 70}")
+    print("Deferred Items (under separate discussion)")
+    print(f"{'─' * 70}")
+    deferred = [f for f in findings if "Deferred" in f.detail or "deferred" in f.detail]
+    for f in deferred:
+        print(f"  {severity_icon(f.severity)} {f.check_id}: {f.title}")
+
+    return {
+        "total_checks": grand_total,
+        "passes": grand_pass,
+        "gaps": grand_gap,
+        "missing": grand_missing,
+    }
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""Append-only SQLite store of conformance harness results.
+
+Each harness run (--store) appends one row to `runs`, keyed by harness, spec
+version and the git revision of the checkout, plus one row per check and one
+per finding. Nothing is updated or deleted, so the store is the history of
+conformance across every revision and spec version it has seen:
+
+  runs      id, harness, spec_version, git_rev, dirty, idl_digest, started
+  checks    run_id, name, code, reads, input_key, reused_from
+  findings  run_id, check_name, seq, modality, check_id, title, severity,
+            detail, v1_severity
+
+A check's input_key is the sha256 of its harness, name, the source of the
+harness file (code) and every ctx read it made while running (reads, see
+harness_engine.InputRecorder). With --incremental a harness first looks up,
+for each check, the input_key its earlier read sets give on the current
+ctx; a check with a stored match reuses those findings instead of running.
+So sweeping a harness across spec revisions runs only the checks whose IDL
+inputs changed. Checks registered with cache=False, checks that read
+something unrecordable and checks that raised are never reused.
+
+The default store is .build-cache/harness-results.sqlite under the
+repository root.
+
+Usage: harness_store.py [--store DB] runs [--harness H] [--spec VER] [--limit N]
+       harness_store.py [--store DB] diff OLD NEW [--harness H] [--spec VER] [--json]
+       harness_store.py [--store DB] history CHECK_ID [--harness H] [--spec VER]
+   (OLD/NEW: a git revision prefix, or #ID for one run)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness_engine import Finding, Outcome, Sev, read_input
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STORE = ROOT / ".build-cache" / "harness-results.sqlite"
+STORE_FORMAT = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id           INTEGER PRIMARY KEY,
+    harness      TEXT NOT NULL,
+    spec_version TEXT NOT NULL,
+    git_rev      TEXT NOT NULL,
+    dirty        INTEGER NOT NULL,
+    idl_digest   TEXT NOT NULL,
+    started      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (harness, spec_version, git_rev);
+
+CREATE TABLE IF NOT EXISTS checks (
+    run_id      INTEGER NOT NULL REFERENCES runs (id),
+    name        TEXT NOT NULL,
+    code        TEXT NOT NULL,
+    reads       TEXT,            -- JSON [[attr, name], ...]; NULL when not reusable
+    input_key   TEXT,            -- NULL when not reusable
+    reused_from INTEGER,         -- run the findings were taken from
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS checks_input ON checks (input_key);
+CREATE INDEX IF NOT EXISTS checks_code ON checks (name, code);
+
+CREATE TABLE IF NOT EXISTS findings (
+    run_id      INTEGER NOT NULL REFERENCES runs (id),
+    check_name  TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    modality    TEXT NOT NULL,
+    check_id    TEXT NOT NULL,
+    title       TEXT NOT NULL,
+    severity    TEXT NOT NULL,
+    detail      TEXT NOT NULL,
+    v1_severity TEXT,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS findings_check ON findings (check_id, run_id);
+CREATE INDEX IF NOT EXISTS findings_run ON findings (run_id, modality, check_id);
+"""
+
+# Severity changes between two runs, keyed by (modality, check_id); a check
+# present in only one run shows NULL on the other side.
+CHANGES_SQL = """
+SELECT a.modality, a.check_id, coalesce(b.title, a.title), a.severity, b.severity
+  FROM findings a
+  LEFT JOIN findings b ON b.run_id = :new AND b.modality = a.modality AND b.check_id = a.check_id
+ WHERE a.run_id = :old AND b.severity IS NOT a.severity
+UNION ALL
+SELECT b.modality, b.check_id, b.title, NULL, b.severity
+  FROM findings b
+ WHERE b.run_id = :new AND NOT EXISTS (
+       SELECT 1 FROM findings a WHERE a.run_id = :old AND a.modality = b.modality AND a.check_id = b.check_id)
+"""
+
+
+class StoreError(ValueError):
+    """A store of another format, or a revision that names no stored run."""
+
+
+def git_revision(root: Path = ROOT) -> tuple[str, bool]:
+    """(HEAD commit, whether tracked files differ from it); ("unknown", False) outside git."""
+    try:
+        rev = subprocess.run(["git", "-C", str(root), "rev-parse", "HEAD"],
+                             capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "-C", str(root), "status", "--porcelain", "--untracked-files=no"],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return rev, bool(status.strip())
+
+
+def input_key(harness: str, check: str, code: str, inputs: list) -> str:
+    blob = json.dumps([harness, check, code, inputs], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class Store:
+    """One results database."""
+
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = Path(path) if path else DEFAULT_STORE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, STORE_FORMAT):
+            raise StoreError(f"{self.path}: store format {version}, expected {STORE_FORMAT}")
+        with self.db:
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {STORE_FORMAT}")
+        self._code: dict[str, str] = {}
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "Store":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def code(self, fn) -> str:
+        """sha256 of the source file defining a check."""
+        path = inspect.getsourcefile(fn)
+        if path not in self._code:
+            self._code[path] = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+        return self._code[path]
+
+    # ── Incremental runs ──────────────────────────────────────────
+    def reusable(self, harness, ctx) -> dict[str, tuple[int, Outcome]]:
+        """(run id, stored outcome) of the checks whose recorded reads give the same values on ctx."""
+        reuse = {}
+        for name, check in harness.checks.items():
+            if not check.cache:
+                continue
+            code = self.code(check.fn)
+            read_sets = self.db.execute(
+                "SELECT DISTINCT c.reads FROM checks c JOIN runs r ON r.id = c.run_id "
+                "WHERE c.name = ? AND c.code = ? AND r.harness = ? AND c.input_key IS NOT NULL",
+                (name, code, harness.name)).fetchall()
+            for (reads,) in read_sets:
+                inputs = [[attr, key, read_input(ctx, attr, key)] for attr, key in json.loads(reads)]
+                row = self.db.execute(
+                    "SELECT run_id FROM checks WHERE input_key = ? ORDER BY run_id DESC LIMIT 1",
+                    (input_key(harness.name, name, code, inputs),)).fetchone()
+                if row is not None:
+                    reuse[name] = (row[0], Outcome(self.findings(row[0], name), inputs=inputs))
+                    break
+        return reuse
+
+    def findings(self, run_id: int, check_name: str | None = None) -> list[Finding]:
+        sql = "SELECT modality, check_id, title, severity, detail, v1_severity FROM findings WHERE run_id = ?"
+        params: tuple = (run_id,)
+        if check_name is not None:
+            sql += " AND check_name = ?"
+            params += (check_name,)
+        return [Finding(mod, cid, title, Sev(sev), detail, Sev(v1) if v1 else None)
+                for mod, cid, title, sev, detail, v1 in self.db.execute(sql + " ORDER BY seq", params)]
+
+    def add_run(self, harness, spec_version: str, idl_digest: str, outcomes: dict[str, Outcome],
+                reused: dict[str, int] | None = None, *, git_rev: tuple[str, bool] | None = None) -> int:
+        """Append one run; reused maps the checks that did not run to the run they were taken from."""
+        rev, dirty = git_rev or git_revision()
+        with self.db:
+            run_id = self.db.execute(
+                "INSERT INTO runs (harness, spec_version, git_rev, dirty, idl_digest, started) VALUES (?, ?, ?, ?, ?, ?)",
+                (harness.name, spec_version, rev, int(dirty), idl_digest,
+                 datetime.now(timezone.utc).isoformat(timespec="seconds"))).lastrowid
+            seq = 0
+            for name, check in harness.checks.items():
+                outcome = outcomes[name]
+                code = self.code(check.fn)
+                reads = key = None
+                if outcome.inputs is not None and not outcome.failed:
+                    reads = json.dumps([[attr, k] for attr, k, _ in outcome.inputs])
+                    key = input_key(harness.name, name, code, outcome.inputs)
+                self.db.execute("INSERT INTO checks VALUES (?, ?, ?, ?, ?, ?)",
+                                (run_id, name, code, reads, key, (reused or {}).get(name)))
+                for f in outcome.findings:
+                    self.db.execute("INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                    (run_id, name, seq, f.modality, f.check_id, f.title, f.severity.value,
+                                     f.detail, f.v1_severity.value if f.v1_severity else None))
+                    seq += 1
+        return run_id
+
+    # ── Queries ───────────────────────────────────────────────────
+    def runs(self, harness: str | None = None, spec: str | None = None, limit: int | None = None) -> list[tuple]:
+        """(id, started, harness, spec_version, git_rev, dirty, checks, reused, passes, findings), newest first."""
+        where, params = self._where(harness, spec)
+        sql = (f"SELECT r.id, r.started, r.harness, r.spec_version, r.git_rev, r.dirty, "
+               f"(SELECT count(*) FROM checks c WHERE c.run_id = r.id), "
+               f"(SELECT count(*) FROM checks c WHERE c.run_id = r.id AND c.reused_from IS NOT NULL), "
+               f"(SELECT count(*) FROM findings f WHERE f.run_id = r.id AND f.severity = 'PASS'), "
+               f"(SELECT count(*) FROM findings f WHERE f.run_id = r.id) "
+               f"FROM runs r {where} ORDER BY r.id DESC")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self.db.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _where(harness, spec, rev_prefix=None) -> tuple[str, tuple]:
+        clauses, params = [], ()
+        for column, value in (("r.harness", harness), ("r.spec_version", spec)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params += (value,)
+        if rev_prefix is not None:
+            clauses.append("r.git_rev LIKE ? || '%'")
+            params += (rev_prefix,)
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def resolve(self, revision: str, harness: str | None = None, spec: str | None = None) -> list[tuple]:
+        """(harness, spec_version, run id) of the newest run at a revision, per harness and spec version."""
+        if revision.startswith("#"):
+            row = self.db.execute("SELECT harness, spec_version, id FROM runs WHERE id = ?",
+                                  (int(revision[1:]),)).fetchone()
+            if row is None:
+                raise StoreError(f"no run {revision}")
+            return [row]
+        where, params = self._where(harness, spec, revision)
+        rows = self.db.execute(f"SELECT r.harness, r.spec_version, max(r.id) FROM runs r {where} "
+                               f"GROUP BY r.harness, r.spec_version ORDER BY r.harness, r.spec_version",
+                               params).fetchall()
+        if not rows:
+            raise StoreError(f"no stored run at revision {revision}")
+        revs = {r for (r,) in self.db.execute(f"SELECT DISTINCT r.git_rev FROM runs r {where}", params)}
+        if len(revs) > 1:
+            raise StoreError(f"revision {revision} is ambiguous: {', '.join(sorted(r[:12] for r in revs))}")
+        return rows
+
+    def changes(self, old: int, new: int) -> list[tuple]:
+        """(modality, check_id, title, old severity, new severity) of every check that changed."""
+        return self.db.execute(CHANGES_SQL + " ORDER BY 1, 2", {"old": old, "new": new}).fetchall()
+
+    def history(self, check_id: str, harness: str | None = None, spec: str | None = None) -> list[tuple]:
+        """(run id, started, harness, spec_version, git_rev, severity, detail) of one check, oldest first."""
+        where, params = self._where(harness, spec)
+        where = (where + " AND" if where else "WHERE") + " f.check_id = ?"
+        return self.db.execute(f"SELECT r.id, r.started, r.harness, r.spec_version, r.git_rev, f.severity, f.detail "
+                               f"FROM findings f JOIN runs r ON r.id = f.run_id {where} ORDER BY r.id",
+                               params + (check_id,)).fetchall()
+
+
+def run(harness, ctx, spec_version: str, idl_digest: str, *, store=None, incremental: bool = False,
+        jobs=None, processes: bool = False) -> list[Finding]:
+    """Run a harness, reusing stored findings if incremental, and append the run to the store."""
+    with Store(store) as db:
+        reuse = db.reusable(harness, ctx) if incremental else {}
+        outcomes = harness.execute(ctx, jobs=jobs, processes=processes, record=True,
+                                   reuse={name: outcome for name, (_, outcome) in reuse.items()})
+        run_id = db.add_run(harness, spec_version, idl_digest, outcomes, {name: rid for name, (rid, _) in reuse.items()})
+        print(f"{harness.name}: stored run #{run_id} in {db.path}"
+              + (f" ({len(reuse)} of {len(harness.checks)} checks reused)" if incremental else ""),
+              file=sys.stderr)
+    return [f for name in harness.checks for f in outcomes[name].findings]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--store", default=None, metavar="DB", help=f"results store (default: {DEFAULT_STORE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p_runs = commands.add_parser("runs", help="list stored runs, newest first")
+    p_diff = commands.add_parser("diff", help="checks whose severity changed between two revisions")
+    p_diff.add_argument("old")
+    p_diff.add_argument("new")
+    p_diff.add_argument("--json", action="store_true")
+    p_hist = commands.add_parser("history", help="severity of one check across the stored runs")
+    p_hist.add_argument("check_id")
+    for p in (p_runs, p_diff, p_hist):
+        p.add_argument("--harness", default=None, help="e.g. deepsense6g_v3, nuscenes_v2")
+        p.add_argument("--spec", default=None, help="spec version, e.g. 1.7")
+    p_runs.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.store and not Path(args.store).exists():
+        print(f"error: {args.store}: no such store", file=sys.stderr)
+        return 2
+    try:
+        with Store(args.store) as db:
+            if args.command == "runs":
+                print(f"{'run':>5}  {'started':<25} {'harness':<16} {'spec':<5} {'revision':<13} "
+                      f"{'checks':>6} {'reused':>6} {'pass':>9}")
+                for rid, started, harness, spec, rev, dirty, checks, reused, passes, total in \
+                        db.runs(args.harness, args.spec, args.limit):
+                    print(f"{rid:>5}  {started:<25} {harness:<16} {spec:<5} {rev[:12] + ('+' if dirty else ''):<13} "
+                          f"{checks:>6} {reused:>6} {f'{passes}/{total}':>9}")
+                return 0
+            if args.command == "history":
+                rows = db.history(args.check_id, args.harness, args.spec)
+                if not rows:
+                    print(f"error: no stored findings for {args.check_id}", file=sys.stderr)
+                    return 1
+                previous = {}
+                for rid, started, harness, spec, rev, sev, detail in rows:
+                    changed = previous.get((harness, spec)) not in (None, sev)
+                    previous[(harness, spec)] = sev
+                    print(f"#{rid:<5} {started}  {harness} {spec}  {rev[:12]}  {sev}{'  (changed)' if changed else ''}")
+                return 0
+            old = db.resolve(args.old, args.harness, args.spec)
+            new = db.resolve(args.new, args.harness, args.spec)
+            if len(old) == 1 and len(new) == 1:
+                pairs = [(old[0], new[0])]   # two runs: compare them even across spec versions
+            else:
+                at_new = {(h, s): (h, s, rid) for h, s, rid in new}
+                pairs = [(o, at_new[o[:2]]) for o in old if o[:2] in at_new]
+            report = [{"harness": o[0],
+                       "old": {"spec_version": o[1], "run": o[2]},
+                       "new": {"spec_version": n[1], "run": n[2]},
+                       "changes": [{"modality": m, "check_id": c, "title": t, "old": a, "new": b}
+                                   for m, c, t, a, b in db.changes(o[2], n[2])]}
+                      for o, n in pairs]
+    except (sqlite3.Error, StoreError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    if not report:
+        print("no harness and spec version has runs at both revisions")
+    for entry in report:
+        print(f"{entry['harness']} {entry['old']['spec_version']} (#{entry['old']['run']}) → "
+              f"{entry['new']['spec_version']} (#{entry['new']['run']}): {len(entry['changes'])} changed")
+        for c in entry["changes"]:
+            print(f"  {c['check_id']:<8} {c['old'] or '—':>8} → {c['new'] or '—':<8} {c['modality']}: {c['title']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""Generate a Python package of slotted classes from idl/v<ver>.
+
+Each IDL file becomes one module of the package (idl/v1.7/rad.idl ->
+spatialdds_v1_7/rad.py):
+
+  - structs become __slots__ classes whose constructor takes every member
+    (base struct members first) as a keyword with its IDL default: zero,
+    False, "", b"" for octet sequences, the first enumerator, and a fresh
+    list, array or nested object for the rest; @optional members default
+    to None;
+  - enums become IntEnum classes with their @value numbers;
+  - unions become tagged classes holding (discriminator, value), with one
+    property per branch that raises AttributeError unless it is selected;
+  - consts become module constants, and typedefs of constructed types
+    become aliases.
+
+Instances carry no __dict__, so they are several times smaller than the
+dicts the harnesses use, and the objects are accepted as values by xcdr2
+(structs by attribute, unions unpack as (discriminator, value)). The
+package __init__ imports a module only when one of its names is first used.
+Members named after Python keywords (from, global) are stored as from_,
+global_ and also readable under the IDL name.
+
+Output is generated, not committed: by default it goes to
+generated/python/spatialdds_v<ver>/ (gitignored). Unchanged files are left
+untouched and modules for deleted IDL files are removed.
+
+Usage: idl_codegen.py [--idl-version 1.7] [--examples] [-o DIR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import keyword
+import sys
+import time
+from pathlib import Path
+
+from idl_parser import (
+    ROOT, Const, Enum, IdlError, SequenceType, StringType, Struct, Typedef, TypeRef, UnionDef,
+    load_version,
+)
+
+OUTPUT_DIR = ROOT / "generated" / "python"
+
+INT_PRIMITIVES = frozenset({
+    "octet", "char", "wchar", "int8", "uint8", "int16", "uint16", "int32", "uint32", "int64", "uint64",
+})
+FLOAT_PRIMITIVES = frozenset({"float", "double", "long double"})
+
+RUNTIME = '''\
+"""Base classes shared by the generated SpatialDDS type modules. Do not edit."""
+
+from __future__ import annotations
+
+UNSET = object()
+
+
+class Struct:
+    """Slotted IDL struct; _fields lists the IDL member names, base first."""
+
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self._fields)
+
+    __hash__ = None  # mutable, like the dicts it replaces
+
+    def __repr__(self) -> str:
+        members = ", ".join(f"{n}={getattr(self, n)!r}" for n in self._fields)
+        return f"{type(self).__name__}({members})"
+
+    def to_dict(self) -> dict:
+        """Members by IDL name (shallow)."""
+        return {n: getattr(self, n) for n in self._fields}
+
+
+class Union:
+    """Tagged IDL union: a discriminator and the value of the branch it selects."""
+
+    __slots__ = ("discriminator", "value")
+    _cases: dict = {}            # label -> branch name
+    _labels: dict = {}           # branch name -> first label
+    _default_case: str | None = None
+    _factories: dict = {}        # branch name -> default value factory
+    _discriminator_default = 0
+
+    def __init__(self, discriminator=UNSET, value=UNSET) -> None:
+        self.discriminator = self._discriminator_default if discriminator is UNSET else discriminator
+        if value is UNSET:
+            member = self.member
+            value = None if member is None else self._factories[member]()
+        self.value = value
+
+    @property
+    def member(self) -> str | None:
+        """Name of the selected branch, or None."""
+        return self._cases.get(self.discriminator, self._default_case)
+
+    def __iter__(self):
+        # Unpacks as (discriminator, value), the form xcdr2 encodes.
+        yield self.discriminator
+        yield self.value
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.discriminator == other.discriminator and self.value == other.value
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.discriminator!r}, {self.member}={self.value!r})"
+
+
+def branch(name: str) -> property:
+    def get(self):
+        if self.member != name:
+            raise AttributeError(f"{type(self).__name__} holds {self.member or 'no branch'}, not {name}")
+        return self.value
+
+    def set(self, value) -> None:
+        if name not in self._labels:
+            raise AttributeError(f"{name} is the default branch; set discriminator and value instead")
+        self.discriminator = self._labels[name]
+        self.value = value
+
+    return property(get, set, doc=f"The {name} branch; AttributeError unless selected.")
+
+
+def alias(cls: type, name: str, attribute: str) -> None:
+    """Make member `name` (a Python keyword) readable as an attribute of cls."""
+    setattr(cls, name, property(lambda self: getattr(self, attribute),
+                                lambda self, value: setattr(self, attribute, value)))
+'''
+
+
+def attribute(name: str) -> str:
+    """Python attribute for an IDL identifier."""
+    return name + "_" if keyword.iskeyword(name) else name
+
+
+def module_name(path: str) -> str:
+    stem = Path(path).stem.replace("-", "_")
+    return attribute(stem if stem.isidentifier() else "_" + stem)
+
+
+class Generator:
+    """Emits one module per IDL file of a Schema."""
+
+    def __init__(self, schema, version: str) -> None:
+        self.schema = schema
+        self.version = version
+        self.modules: dict[str, str] = {}  # IDL file -> Python module
+        self.names: dict[int, tuple[str, str]] = {}  # id(node) -> (module, Python name)
+        # Python name -> {what it denotes: module that defines it}; typedef
+        # aliases denote their target, so re-exports do not make a name ambiguous.
+        self.exports: dict[str, dict[object, str]] = {}
+        for f in schema.files:
+            self.modules[f.path] = module_name(f.path)
+        taken: dict[str, set[str]] = {m: set() for m in self.modules.values()}
+        for scoped, d in schema.decls.items():
+            if isinstance(d.node, (Struct, UnionDef, Enum)):
+                module = self.modules[d.file]
+                name = d.node.name
+                if name in taken[module]:
+                    name = scoped.replace("::", "_")
+                taken[module].add(name)
+                self.names[id(d.node)] = (module, name)
+
+    # -- type expressions --
+
+    def ref(self, node, module: str, imports: set[str]) -> str:
+        """Expression naming a generated class from inside `module`."""
+        owner, name = self.names[id(node)]
+        if owner == module:
+            return name
+        imports.add(owner)
+        return f"_{owner}.{name}"
+
+    def describe(self, spec, scope: str, dims: tuple[int, ...], module: str, imports: set[str]):
+        """(annotation, default expression or None if a literal, literal) for a member type."""
+        target, typedef_dims, scope = self.schema.resolve(spec, scope)
+        dims = dims + typedef_dims
+        if isinstance(target, TypeRef):
+            if target.name == "boolean":
+                annotation, literal = "bool", "False"
+            elif target.name in FLOAT_PRIMITIVES:
+                annotation, literal = "float", "0.0"
+            elif target.name in INT_PRIMITIVES:
+                annotation, literal = "int", "0"
+            else:
+                raise IdlError(module, 0, f"no Python mapping for {target.name}")
+            factory = None
+        elif isinstance(target, StringType):
+            annotation, literal, factory = "str", '""', None
+        elif isinstance(target, SequenceType):
+            element, element_dims, _ = self.schema.resolve(target.element, scope)
+            if isinstance(element, TypeRef) and element.name in ("octet", "uint8") and not element_dims:
+                annotation, literal, factory = "bytes", 'b""', None
+            else:
+                inner, _, _ = self.describe(target.element, scope, (), module, imports)
+                annotation, literal, factory = f"list[{inner}]", None, "[]"
+        else:
+            cls = self.ref(target, module, imports)
+            annotation, literal = cls, None
+            if isinstance(target, Enum):
+                first = next(iter(target.values()), None)
+                factory = f"{cls}.{first}" if first is not None else f"{cls}(0)"
+            else:
+                factory = f"{cls}()"
+        for i, n in enumerate(reversed(dims)):
+            annotation = f"list[{annotation}]"
+            if i == 0 and factory is None:
+                factory = f"[{literal}] * {n}"  # immutable elements can be shared
+            else:
+                factory = f"[{factory} for _ in range({n})]"
+            literal = None
+        return annotation, factory, literal
+
+    # -- definitions --
+
+    def struct(self, node: Struct, scope: str, module: str, imports: set[str]) -> list[str]:
+        members = []  # (IDL name, annotation, factory, literal, optional, declared here)
+        base_cls = "_rt.Struct"
+        chain, s, s_scope = [], node, scope
+        while s.base is not None:
+            base_name = self.schema.lookup(s.base, s_scope)
+            base = self.schema.decls[base_name]
+            chain.append((base.node, base.scope))
+            s, s_scope = base.node, base.scope
+        if chain:
+            base_cls = self.ref(chain[0][0], module, imports)
+        for owner, owner_scope in [*reversed(chain), (node, scope)]:
+            for m in owner.members:
+                dims = tuple(int(self.schema.evaluate(d, owner_scope)) for d in m.dims)
+                annotation, factory, literal = self.describe(m.type, owner_scope, dims, module, imports)
+                members.append((m.name, annotation, factory, literal, m.optional, owner is node))
+        _, cls = self.names[id(node)]
+        own = [attribute(name) for name, *_, mine in members if mine]
+        lines = [
+            f"class {cls}({base_cls}):",
+            f'    """{qualified(scope, node.name)} ({node.extensibility})."""',
+            "",
+            f"    __slots__ = {tuple(own)!r}",
+            f"    _fields = {tuple(m[0] for m in members)!r}",
+            "",
+        ]
+        params, body = ["self"], []
+        for name, annotation, factory, literal, optional, _ in members:
+            arg = attribute(name)
+            if optional:
+                params.append(f"{arg}: {annotation} | None = None")
+                body.append(f"self.{arg} = {arg}")
+            elif factory is None:
+                params.append(f"{arg}: {annotation} = {literal}")
+                body.append(f"self.{arg} = {arg}")
+            else:
+                params.append(f"{arg}: {annotation} | None = None")
+                body.append(f"self.{arg} = {factory} if {arg} is None else {arg}")
+        lines.append(f"    def __init__({', '.join(params)}) -> None:")
+        lines += [f"        {b}" for b in body] or ["        pass"]
+        for name, *_ in members:
+            if keyword.iskeyword(name):
+                lines += ["", "", f"_rt.alias({cls}, {name!r}, {attribute(name)!r})"]
+        return lines
+
+    def union(self, node: UnionDef, scope: str, module: str, imports: set[str]) -> list[str]:
+        _, cls = self.names[id(node)]
+        disc_annotation, disc_factory, disc_literal = self.describe(node.discriminator, scope, (), module, imports)
+        cases, labels, factories, default_case = {}, {}, {}, None
+        for case in node.cases:
+            m = case.member
+            dims = tuple(int(self.schema.evaluate(d, scope)) for d in m.dims)
+            _, factory, literal = self.describe(m.type, scope, dims, module, imports)
+            factories[m.name] = f"lambda: {factory if factory is not None else literal}"
+            for label in case.labels:
+                value = self.schema.evaluate(label, scope)
+                cases.setdefault(value, m.name)
+                labels.setdefault(m.name, value)
+            if case.default:
+                default_case = m.name
+        lines = [
+            f"class {cls}(_rt.Union):",
+            f'    """{qualified(scope, node.name)} ({node.extensibility}): switch ({getattr(node.discriminator, "name", disc_annotation)})."""',
+            "",
+            "    __slots__ = ()",
+            f"    _cases = {{{', '.join(f'{k!r}: {v!r}' for k, v in cases.items())}}}",
+            f"    _labels = {{{', '.join(f'{k!r}: {v!r}' for k, v in labels.items())}}}",
+            f"    _default_case = {default_case!r}",
+            "    _factories = {",
+            *[f"        {name!r}: {factory}," for name, factory in factories.items()],
+            "    }",
+            f"    _discriminator_default = {disc_factory if disc_factory is not None else disc_literal}",
+            "",
+        ]
+        lines += [f"    {attribute(name)} = _rt.branch({name!r})" for name in factories]
+        return lines
+
+    def enum(self, node: Enum, scope: str) -> list[str]:
+        _, cls = self.names[id(node)]
+        lines = [f"class {cls}(IntEnum):", f'    """{qualified(scope, node.name)}."""', ""]
+        lines += [f"    {attribute(name)} = {value}" for name, value in node.values().items()]
+        return lines
+
+    def module(self, f) -> str:
+        """Source of the module for IDL file f."""
+        module = self.modules[f.path]
+        imports: set[str] = set()
+        blocks: list[list[str]] = []
+        uses_enum = False
+        local_names = {name for owner, name in self.names.values() if owner == module}
+        defined: set[str] = set()
+        for scoped, d in self.schema.decls.items():
+            if d.file != f.path:
+                continue
+            node = d.node
+            if id(node) in self.names:
+                self.exports.setdefault(self.names[id(node)][1], {})[id(node)] = module
+            if isinstance(node, Struct):
+                blocks.append(self.struct(node, d.scope, module, imports))
+            elif isinstance(node, UnionDef):
+                blocks.append(self.union(node, d.scope, module, imports))
+            elif isinstance(node, Enum):
+                blocks.append(self.enum(node, d.scope))
+                uses_enum = True
+            elif isinstance(node, Const):
+                name = attribute(node.name)
+                if name in local_names or name in defined:
+                    continue
+                defined.add(name)
+                self.exports.setdefault(name, {})[scoped] = module
+                blocks.append([f"{name} = {self.schema.evaluate(node.value, d.scope)!r}"])
+            elif isinstance(node, Typedef) and not node.dims:
+                try:
+                    target, dims, _ = self.schema.resolve(node.type, d.scope)
+                except KeyError:
+                    continue
+                if dims or not isinstance(target, (Struct, UnionDef, Enum)):
+                    continue  # plain Python types; nothing to alias
+                name = attribute(node.name)
+                if name in local_names or name in defined:
+                    continue  # the alias would shadow a class (events.idl re-exports its enums)
+                defined.add(name)
+                self.exports.setdefault(name, {}).setdefault(id(target), self.names[id(target)][0])
+                blocks.append([f"{name} = {self.ref(target, module, imports)}"])
+        header = [
+            f'"""{f.module_id or Path(f.path).name}: types generated from {f.path}. Do not edit."""',
+            "",
+            "from __future__ import annotations",
+            "",
+        ]
+        if uses_enum:
+            header += ["from enum import IntEnum", ""]
+        header.append("from . import _runtime as _rt")
+        header += [f"from . import {owner} as _{owner}" for owner in sorted(imports)]
+        out, previous = header, None
+        for block in blocks:
+            # Classes are set apart by two blank lines; runs of consts stay together.
+            if previous is None or len(block) > 1 or len(previous) > 1:
+                out += ["", ""]
+            out += block
+            previous = block
+        return "\n".join(out) + "\n"
+
+    def package(self) -> dict[str, str]:
+        """{file name: source} for the whole package."""
+        files = {"_runtime.py": RUNTIME}
+        for f in self.schema.files:
+            files[f"{self.modules[f.path]}.py"] = self.module(f)
+        unique = {name: next(iter(meanings.values()))
+                  for name, meanings in sorted(self.exports.items()) if len(meanings) == 1}
+        lines = [
+            f'"""SpatialDDS {self.version} types, generated from idl/v{self.version} by scripts/idl_codegen.py.',
+            "",
+            "Names defined by exactly one module are available here and import that",
+            "module on first use; the rest (MODULE_ID, ...) live in the modules themselves.",
+            "Do not edit.",
+            '"""',
+            "",
+            "from __future__ import annotations",
+            "",
+            "import importlib",
+            "",
+            "_EXPORTS = {",
+            *[f"    {name!r}: {module!r}," for name, module in unique.items()],
+            "}",
+            "__all__ = sorted(_EXPORTS)",
+            "",
+            "",
+            "def __getattr__(name: str):",
+            "    module = _EXPORTS.get(name)",
+            "    if module is None:",
+            '        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")',
+            "    value = getattr(importlib.import_module(f\".{module}\", __name__), name)",
+            "    globals()[name] = value",
+            "    return value",
+            "",
+            "",
+            "def __dir__() -> list[str]:",
+            "    return __all__",
+        ]
+        files["__init__.py"] = "\n".join(lines) + "\n"
+        return files
+
+
+def qualified(scope: str, name: str) -> str:
+    return f"{scope}::{name}" if scope else name
+
+
+def write_package(files: dict[str, str], directory: Path) -> tuple[list[Path], list[Path]]:
+    """Write files into directory; return (written, removed). Unchanged files are skipped."""
+    directory.mkdir(parents=True, exist_ok=True)
+    written, removed = [], []
+    for name, source in files.items():
+        path = directory / name
+        if not path.is_file() or path.read_text(encoding="utf-8") != source:
+            path.write_text(source, encoding="utf-8")
+            written.append(path)
+    for path in sorted(directory.glob("*.py")):
+        if path.name not in files:
+            path.unlink()
+            removed.append(path)
+    return written, removed
+
+
+def package_name(version: str) -> str:
+    return "spatialdds_v" + version.replace(".", "_")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--idl-version", default="1.7", help="idl/v<ver> tree to generate from (default: 1.7)")
+    parser.add_argument("--examples", action="store_true", help="also generate idl/v<ver>/examples/")
+    parser.add_argument("-o", "--output", type=Path, default=OUTPUT_DIR,
+                        help=f"directory to create the package in (default: {OUTPUT_DIR.relative_to(ROOT)})")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        schema = load_version(args.idl_version, examples=args.examples)
+        files = Generator(schema, args.idl_version).package()
+    except (IdlError, FileNotFoundError, KeyError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    directory = args.output / package_name(args.idl_version)
+    written, removed = write_package(files, directory)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{directory}: {len(files)} module(s), {len(written)} written, {len(removed)} removed in {elapsed:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""Structural diff between two idl/v<ver>/ trees, for rollout gates.
+
+Both trees are loaded through idl_parser (served from the AST cache) and
+compared declaration by declaration, by fully scoped name:
+
+  - types added, removed, or moved to another module (same short name);
+  - struct members added, removed or reordered, member types changed, and
+    sequence/string bounds changed (typedefs followed, bounds evaluated);
+  - union discriminators and cases, enum enumerators and their values;
+  - typedef targets and const values, and each file's MODULE_ID.
+
+Every change that a reader of one version cannot accept from a writer of the
+other is also listed as a violation, following the XTypes assignability
+rules for the type's extensibility: a FINAL type may not change at all, an
+APPENDABLE struct may only append members at the end and an APPENDABLE enum
+or union may only gain enumerators or cases. Removed or moved types, changed
+extensibility and narrowed bounds (a sample from the older writer can exceed
+them) are violations too. For each changed struct, field_map lists where
+each new member sits in the old one (null for new members): the translation
+plan for a bridge between the two versions.
+
+The full diff is printed as JSON with --json; otherwise a summary per pair
+and its violations. A warm run over every version takes well under a second.
+
+Usage: idl_diff.py [--json] [--examples] [--strict] [version ...]   (default: every consecutive pair)
+Two versions diff that pair; more diff each consecutive pair. With --strict
+the exit status is nonzero if any pair has a violation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import sys
+import time
+from dataclasses import dataclass
+
+from idl_parser import (
+    Const, Enum, IdlError, SequenceType, StringType, Struct, Typedef, TypeRef, UnionDef, extensibility,
+    load_version,
+)
+from validate_idl import all_versions
+
+TYPE_KINDS = {Struct: "struct", UnionDef: "union", Enum: "enum"}
+
+
+@dataclass(frozen=True)
+class Sig:
+    """A member type with typedefs followed: full text, text without bounds, and the bounds."""
+    text: str
+    erased: str
+    bounds: tuple[int | None, ...]
+
+
+def scoped_name(schema, node, scope: str) -> str:
+    name = schema.lookup(node.name, scope)
+    if name is None or schema[name] is not node:
+        name = next(n for n, d in schema.decls.items() if d.node is node)
+    return name
+
+
+def signature(schema, spec, scope: str, dims=()) -> Sig:
+    """Sig of a type spec as used in scope, with extra array dimensions dims."""
+    try:
+        target, typedef_dims, scope_of = schema.resolve(spec, scope)
+        extra = [int(schema.evaluate(d, scope)) for d in dims]
+    except (KeyError, TypeError, ValueError):
+        name = getattr(spec, "name", type(spec).__name__)
+        return Sig(f"?{name}", f"?{name}", ())
+    suffix = "".join(f"[{d}]" for d in (*extra, *typedef_dims))
+
+    def bound(expr) -> int | None:
+        try:
+            return None if expr is None else int(schema.evaluate(expr, scope_of))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    if isinstance(target, TypeRef):
+        return Sig(target.name + suffix, target.name + suffix, ())
+    if isinstance(target, StringType):
+        kind = "wstring" if target.wide else "string"
+        n = bound(target.bound)
+        return Sig(f"{kind}<{n}>{suffix}" if n else kind + suffix, kind + suffix, (n,))
+    if isinstance(target, SequenceType):
+        inner = signature(schema, target.element, scope_of)
+        n = bound(target.bound)
+        text = f"sequence<{inner.text},{n}>" if n else f"sequence<{inner.text}>"
+        return Sig(text + suffix, f"sequence<{inner.erased}>{suffix}", (n, *inner.bounds))
+    name = scoped_name(schema, target, scope_of)
+    return Sig(name + suffix, name + suffix, ())
+
+
+def narrowed(old: tuple, new: tuple) -> bool:
+    """True if any bound of new is tighter than the matching bound of old (None is unbounded)."""
+    return any(b is not None and (a is None or b < a) for a, b in zip(old, new))
+
+
+def label_text(expr) -> str:
+    return getattr(expr, "name", None) or repr(expr)
+
+
+class Side:
+    """The declarations of one version, flattened for comparison."""
+
+    def __init__(self, version: str, examples: bool) -> None:
+        self.version = version
+        self.schema = schema = load_version(version, examples=examples)
+        self.types = {n: d for n, d in schema.decls.items() if type(d.node) in TYPE_KINDS}
+        self.typedefs = {n: d for n, d in schema.decls.items() if isinstance(d.node, Typedef)}
+        self.consts = {n: d for n, d in schema.decls.items() if isinstance(d.node, Const)}
+        self.module_ids = {f.path.split("/", 2)[-1]: f.module_id for f in schema.files if f.module_id}
+
+    def members(self, name: str) -> list[tuple[str, Sig, bool, bool]]:
+        """(name, Sig, optional, key) for the struct's own members, in order."""
+        entry = self.types[name]
+        return [(m.name, signature(self.schema, m.type, entry.scope, m.dims), m.optional, m.key)
+                for m in entry.node.members]
+
+    def base(self, name: str) -> str | None:
+        entry = self.types[name]
+        if entry.node.base is None:
+            return None
+        return self.schema.lookup(entry.node.base, entry.scope) or entry.node.base
+
+    def cases(self, name: str) -> dict:
+        """Evaluated label (or 'default') -> (label text, member name, type text)."""
+        entry = self.types[name]
+        out = {}
+        for case in entry.node.cases:
+            m = case.member
+            sig = signature(self.schema, m.type, entry.scope, m.dims).text
+            for label in case.labels:
+                try:
+                    key = self.schema.evaluate(label, entry.scope)
+                except (KeyError, TypeError, ValueError):
+                    key = label_text(label)
+                out[key] = (label_text(label), m.name, sig)
+            if case.default:
+                out["default"] = ("default", m.name, sig)
+        return out
+
+    def value(self, name: str):
+        entry = self.consts[name]
+        try:
+            return self.schema.evaluate(entry.node.value, entry.scope)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class PairDiff:
+    """Diff of one version pair; diff() returns the JSON-ready result."""
+
+    def __init__(self, old: Side, new: Side) -> None:
+        self.old, self.new = old, new
+        self.violations: list[dict] = []
+
+    def violate(self, name: str, rule: str, detail: str) -> None:
+        self.violations.append({"type": name, "rule": rule, "detail": detail})
+
+    def diff(self) -> dict:
+        old, new = self.old, self.new
+        added = sorted(set(new.types) - set(old.types))
+        removed = sorted(set(old.types) - set(new.types))
+        moved = []
+        by_short = {}
+        for name in added:
+            by_short.setdefault(name.rsplit("::", 1)[-1], []).append(name)
+        for name in list(removed):
+            targets = by_short.get(name.rsplit("::", 1)[-1], [])
+            if len(targets) == 1 and type(new.types[targets[0]].node) is type(old.types[name].node):
+                moved.append({"from": name, "to": targets[0]})
+                removed.remove(name)
+                added.remove(targets[0])
+                self.violate(name, "type-moved", f"now {targets[0]}; the type name on the wire changes")
+        for name in removed:
+            self.violate(name, "type-removed", f"{TYPE_KINDS[type(old.types[name].node)]} removed")
+
+        changed = {}
+        for name in sorted(set(old.types) & set(new.types)):
+            entry = self.compare(name)
+            if entry:
+                changed[name] = entry
+        for m in moved:
+            entry = self.compare(m["from"], m["to"])
+            if entry:
+                changed[m["to"]] = entry
+
+        return {
+            "from": old.version,
+            "to": new.version,
+            "module_ids": self.module_ids(),
+            "types": {"added": added, "removed": removed, "moved": moved, "changed": changed},
+            "typedefs": self.named_values(
+                old.typedefs, new.typedefs,
+                lambda side, n: signature(side.schema, side.typedefs[n].node.type,
+                                          side.typedefs[n].scope, side.typedefs[n].node.dims).text),
+            "consts": self.named_values(old.consts, new.consts, lambda side, n: side.value(n)),
+            "violations": self.violations,
+        }
+
+    def module_ids(self) -> list[dict]:
+        files = sorted(set(self.old.module_ids) | set(self.new.module_ids))
+        return [{"file": f, "from": self.old.module_ids.get(f), "to": self.new.module_ids.get(f)}
+                for f in files if self.old.module_ids.get(f) != self.new.module_ids.get(f)]
+
+    def named_values(self, old: dict, new: dict, value) -> dict:
+        changed = {}
+        for name in sorted(set(old) & set(new)):
+            a, b = value(self.old, name), value(self.new, name)
+            if a != b:
+                changed[name] = {"from": a, "to": b}
+        return {"added": sorted(set(new) - set(old)), "removed": sorted(set(old) - set(new)), "changed": changed}
+
+    # -- per type --
+
+    def compare(self, name: str, new_name: str | None = None) -> dict:
+        new_name = new_name or name
+        a, b = self.old.types[name].node, self.new.types[new_name].node
+        entry: dict = {}
+        if type(a) is not type(b):
+            entry["kind"] = {"from": TYPE_KINDS[type(a)], "to": TYPE_KINDS[type(b)]}
+            self.violate(new_name, "kind-changed", f"{TYPE_KINDS[type(a)]} became {TYPE_KINDS[type(b)]}")
+            return entry
+        # Enums take the same annotations as structs; unannotated they are FINAL.
+        ext_a, ext_b = extensibility(a.annotations), extensibility(b.annotations)
+        if ext_a != ext_b:
+            entry["extensibility"] = {"from": ext_a, "to": ext_b}
+            self.violate(new_name, "extensibility-changed", f"{ext_a} became {ext_b}")
+        if isinstance(a, Struct):
+            self.struct(name, new_name, ext_b, entry)
+        elif isinstance(a, UnionDef):
+            self.union(name, new_name, ext_b, entry)
+        else:
+            self.enum(a, b, new_name, ext_b, entry)
+        return entry
+
+    def struct(self, name: str, new_name: str, ext: str, entry: dict) -> None:
+        base_a, base_b = self.old.base(name), self.new.base(new_name)
+        if base_a != base_b:
+            entry["base"] = {"from": base_a, "to": base_b}
+            self.violate(new_name, "base-changed", f"base {base_a} became {base_b}")
+        old, new = self.old.members(name), self.new.members(new_name)
+        old_at = {m[0]: i for i, m in enumerate(old)}
+        new_at = {m[0]: i for i, m in enumerate(new)}
+        fields_added = [{"name": m[0], "index": i, "type": m[1].text} for i, m in enumerate(new) if m[0] not in old_at]
+        fields_removed = [{"name": m[0], "index": i, "type": m[1].text} for i, m in enumerate(old) if m[0] not in new_at]
+
+        common_old = [m[0] for m in old if m[0] in new_at]
+        common_new = [m[0] for m in new if m[0] in old_at]
+        matcher = difflib.SequenceMatcher(a=common_old, b=common_new, autojunk=False)
+        kept = {n for block in matcher.get_matching_blocks() for n in common_old[block.a:block.a + block.size]}
+        reordered = [n for n in common_new if n not in kept]
+
+        type_changed, bounds_changed, flags_changed = [], [], []
+        for field_name in common_new:
+            (_, sa, opt_a, key_a), (_, sb, opt_b, key_b) = old[old_at[field_name]], new[new_at[field_name]]
+            if sa.erased != sb.erased:
+                type_changed.append({"field": field_name, "from": sa.text, "to": sb.text})
+            elif sa.bounds != sb.bounds:
+                bounds_changed.append({"field": field_name, "from": sa.text, "to": sb.text,
+                                       "narrowed": narrowed(sa.bounds, sb.bounds)})
+            if (opt_a, key_a) != (opt_b, key_b):
+                flags_changed.append({"field": field_name, "optional": [opt_a, opt_b], "key": [key_a, key_b]})
+
+        for key, value in (("fields_added", fields_added), ("fields_removed", fields_removed),
+                           ("reordered", reordered), ("type_changed", type_changed),
+                           ("bounds_changed", bounds_changed), ("flags_changed", flags_changed)):
+            if value:
+                entry[key] = value
+        if fields_added or fields_removed or reordered:
+            entry["field_map"] = [old_at.get(m[0]) for m in new]
+
+        for f in fields_removed:
+            self.violate(new_name, "field-removed", f"{f['name']} removed")
+        for n in reordered:
+            self.violate(new_name, "field-reordered", f"{n} moved from index {old_at[n]} to {new_at[n]}")
+        for t in type_changed:
+            self.violate(new_name, "field-type-changed", f"{t['field']}: {t['from']} became {t['to']}")
+        for t in bounds_changed:
+            if t["narrowed"]:
+                self.violate(new_name, "bound-narrowed", f"{t['field']}: {t['from']} became {t['to']}")
+        for t in flags_changed:
+            flags = [f"{flag} {'added' if t[flag][1] else 'dropped'}"
+                     for flag in ("optional", "key") if t[flag][0] != t[flag][1]]
+            self.violate(new_name, "field-flags-changed", f"{t['field']}: @{', @'.join(flags)}")
+        if fields_added:
+            if ext == "FINAL":
+                names = ", ".join(f["name"] for f in fields_added)
+                self.violate(new_name, "final-changed", f"FINAL struct gained {names}")
+            else:
+                inserted = [f for f in fields_added if f["index"] < len(common_new)]
+                for f in inserted:
+                    self.violate(new_name, "field-inserted",
+                                 f"{f['name']} added at index {f['index']}, before existing members")
+
+    def union(self, name: str, new_name: str, ext: str, entry: dict) -> None:
+        a_node, b_node = self.old.types[name], self.new.types[new_name]
+        disc_a = signature(self.old.schema, a_node.node.discriminator, a_node.scope).text
+        disc_b = signature(self.new.schema, b_node.node.discriminator, b_node.scope).text
+        if disc_a != disc_b:
+            entry["discriminator"] = {"from": disc_a, "to": disc_b}
+            self.violate(new_name, "discriminator-changed", f"{disc_a} became {disc_b}")
+        old, new = self.old.cases(name), self.new.cases(new_name)
+        added = [{"label": new[k][0], "member": new[k][1], "type": new[k][2]} for k in new if k not in old]
+        removed = [{"label": old[k][0], "member": old[k][1], "type": old[k][2]} for k in old if k not in new]
+        changed = [{"label": new[k][0], "from": list(old[k][1:]), "to": list(new[k][1:])}
+                   for k in new if k in old and old[k][1:] != new[k][1:]]
+        for key, value in (("cases_added", added), ("cases_removed", removed), ("cases_changed", changed)):
+            if value:
+                entry[key] = value
+        for c in removed:
+            self.violate(new_name, "case-removed", f"case {c['label']} ({c['member']}) removed")
+        for c in changed:
+            self.violate(new_name, "case-changed", f"case {c['label']}: {c['from']} became {c['to']}")
+        if added and ext == "FINAL":
+            self.violate(new_name, "final-changed", f"FINAL union gained {len(added)} case(s)")
+
+    def enum(self, a: Enum, b: Enum, new_name: str, ext: str, entry: dict) -> None:
+        old, new = a.values(), b.values()
+        added = [{"name": n, "value": v} for n, v in new.items() if n not in old]
+        removed = [{"name": n, "value": v} for n, v in old.items() if n not in new]
+        changed = [{"name": n, "from": old[n], "to": v} for n, v in new.items() if n in old and old[n] != v]
+        for key, value in (("enumerators_added", added), ("enumerators_removed", removed),
+                           ("values_changed", changed)):
+            if value:
+                entry[key] = value
+        for e in removed:
+            self.violate(new_name, "enumerator-removed", f"{e['name']} removed")
+        for e in changed:
+            self.violate(new_name, "enumerator-value-changed", f"{e['name']}: {e['from']} became {e['to']}")
+        if added and ext == "FINAL":
+            names = ", ".join(e["name"] for e in added)
+            self.violate(new_name, "final-changed", f"FINAL enum gained {names}")
+
+
+def diff_versions(versions: list[str], examples: bool = False) -> list[dict]:
+    """One diff per consecutive pair of versions, each tree loaded once."""
+    sides = [Side(v, examples) for v in versions]
+    return [PairDiff(a, b).diff() for a, b in zip(sides, sides[1:])]
+
+
+def summary(d: dict) -> str:
+    t = d["types"]
+    lines = [
+        f"v{d['from']} -> v{d['to']}: {len(t['added'])} type(s) added, {len(t['removed'])} removed, "
+        f"{len(t['moved'])} moved, {len(t['changed'])} changed; {len(d['module_ids'])} MODULE_ID change(s); "
+        f"{len(d['violations'])} violation(s)"
+    ]
+    for v in d["violations"]:
+        lines.append(f"  - {v['type']}: {v['rule']}: {v['detail']}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("versions", nargs="*", help="spec versions, oldest first (default: all)")
+    parser.add_argument("--json", action="store_true", help="print the full diff as JSON")
+    parser.add_argument("--examples", action="store_true", help="include idl/v<ver>/examples/")
+    parser.add_argument("--strict", action="store_true", help="exit nonzero if any pair has a violation")
+    args = parser.parse_args(argv)
+    versions = args.versions or all_versions()
+    if len(versions) < 2:
+        parser.error("need at least two versions")
+
+    started = time.perf_counter()
+    try:
+        diffs = diff_versions(versions, examples=args.examples)
+    except (FileNotFoundError, IdlError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(diffs, indent=2))
+    else:
+        print("\n\n".join(summary(d) for d in diffs))
+        print(f"\n{len(diffs)} pair(s) in {(time.perf_counter() - started) * 1000:.0f} ms")
+    violations = sum(len(d["violations"]) for d in diffs)
+    return 1 if args.strict and violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""IDL mirrors for the conformance harnesses, derived from idl/v<ver>/.
+
+The harnesses check dataset fields against flat name lists: an enum maps to
+its enumerator names ("RadTensorLayout": [...]), a struct or union to its
+member names, base members first ("Detection3D_fields": [...]), and a module
+that declares constants to their names ("GnssService_constants": [...]).
+mirror() builds those lists from an in-process parse of the profile and
+example IDL of one spec version, so the lists cannot drift from the IDL.
+
+The derived lists are cached as JSON under .build-cache/idl-mirror/, keyed by
+the sha256 of every IDL file of the version; a warm lookup only hashes the
+files, which keeps harness startup well under 100 ms.
+
+Entries are indexed by their short name. A short name declared with different
+content in two modules is ambiguous: looking it up raises MirrorError (not
+KeyError, so Mapping.get() cannot turn it into an empty default) and the
+scoped name ("spatial::sensing::rad::RadTensorMeta_fields") must be used.
+Every short name looked up but not declared is recorded in Mirror.missing so
+a harness can report checks that ran against a type the IDL no longer has.
+
+Usage: idl_mirror.py [--idl-version VER] [--no-cache] [name ...]   (default: 1.7, every entry)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+
+# idl_parser is imported only on a cache miss: importing it costs more than a
+# warm lookup, so ROOT and the file listing are repeated here.
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = ROOT / ".build-cache" / "idl-mirror"
+MIRROR_FORMAT = 1
+VERSIONS = ("1.5", "1.6", "1.7")
+DEFAULT_VERSION = "1.7"
+
+
+class MirrorError(LookupError):
+    """A short name that names different entries in different modules."""
+
+
+def idl_files(version: str, root: Path = ROOT) -> list[Path]:
+    """idl/v<ver>/*.idl then idl/v<ver>/examples/*.idl, sorted (idl_parser.version_files)."""
+    idl_dir = root / "idl" / f"v{version}"
+    if not idl_dir.is_dir():
+        raise FileNotFoundError(f"missing directory {idl_dir}")
+    return sorted(idl_dir.glob("*.idl")) + sorted((idl_dir / "examples").glob("*.idl"))
+
+
+def digest(version: str, root: Path = ROOT) -> str:
+    """sha256 over the path and bytes of every IDL file of the version, examples included."""
+    h = hashlib.sha256(b"%d\0%s\0" % (MIRROR_FORMAT, version.encode("ascii")))
+    for path in idl_files(version, root):
+        h.update(str(path.relative_to(root)).encode("utf-8") + b"\0")
+        h.update(path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def struct_fields(schema, name: str) -> list[str]:
+    """Member names of a struct, inherited members first."""
+    from idl_parser import Struct
+
+    entry = schema.decls[name]
+    fields = []
+    if entry.node.base is not None:
+        base = schema.lookup(entry.node.base, entry.scope)
+        if base is not None and isinstance(schema[base], Struct):
+            fields = struct_fields(schema, base)
+    return fields + [m.name for m in entry.node.members]
+
+
+def derive(schema) -> dict[str, list[str]]:
+    """{scoped entry name: names} for every enum, struct, union and constant-bearing module."""
+    from idl_parser import Const, Enum, Struct, UnionDef, qualify
+
+    entries: dict[str, list[str]] = {}
+    for name, entry in schema.decls.items():
+        node = entry.node
+        if isinstance(node, Enum) and entry.parent is None:
+            entries[name] = [e.name for e in node.enumerators]
+        elif isinstance(node, Struct):
+            entries[f"{name}_fields"] = struct_fields(schema, name)
+        elif isinstance(node, UnionDef):
+            entries[f"{name}_fields"] = [case.member.name for case in node.cases]
+        elif isinstance(node, Const) and entry.scope:
+            module = entry.scope.rsplit("::", 1)[-1]
+            entries.setdefault(qualify(entry.scope, f"{module}_constants"), []).append(node.name)
+    return entries
+
+
+class Mirror(Mapping):
+    """Short-name view of the derived entries of one spec version."""
+
+    def __init__(self, version: str, digest: str, entries: dict[str, list[str]]) -> None:
+        self.version = version
+        self.digest = digest
+        self.entries = entries
+        self.missing: set[str] = set()
+        by_short: dict[str, list[str]] = {}
+        for scoped in entries:
+            by_short.setdefault(scoped.rsplit("::", 1)[-1], []).append(scoped)
+        self._short = by_short
+
+    def scoped(self, name: str) -> str:
+        """Scoped entry name for a short or scoped name; KeyError if undeclared."""
+        if name in self.entries:
+            return name
+        candidates = self._short.get(name)
+        if not candidates:
+            self.missing.add(name)
+            raise KeyError(name)
+        if len(candidates) > 1 and any(self.entries[c] != self.entries[candidates[0]] for c in candidates):
+            raise MirrorError(f"{name} is ambiguous in v{self.version}: {', '.join(sorted(candidates))}")
+        return candidates[0]
+
+    def __getitem__(self, name: str) -> list[str]:
+        return list(self.entries[self.scoped(name)])
+
+    def __contains__(self, name: object) -> bool:
+        try:
+            self.scoped(name)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self._short)
+
+    def __len__(self) -> int:
+        return len(self._short)
+
+    def select(self, *names: str) -> "Mirror":
+        """The entries of names alone, sharing this mirror's missing set.
+
+        A harness groups its mirror per modality this way; the undeclared
+        names among them are recorded as missing straight away.
+        """
+        picked = {}
+        for name in names:
+            if name in self:
+                picked[self.scoped(name)] = self.entries[self.scoped(name)]
+        group = Mirror(self.version, self.digest, picked)
+        group.missing = self.missing
+        return group
+
+
+def mirror(version: str = DEFAULT_VERSION, root: Path = ROOT, *, cache_dir: Path | None = CACHE_DIR) -> Mirror:
+    """Mirror of one spec version, served from the JSON cache when the IDL is unchanged."""
+    key = digest(version, root)
+    cached = cache_dir / f"v{version}-{key}.json" if cache_dir is not None else None
+    if cached is not None:
+        try:
+            with open(cached, encoding="utf-8") as fp:
+                return Mirror(version, key, json.load(fp))
+        except (OSError, ValueError):
+            pass
+    from idl_parser import load_version
+
+    entries = derive(load_version(version, root, examples=True))
+    if cached is not None:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as fp:
+                json.dump(entries, fp, separators=(",", ":"))
+            os.replace(tmp, cached)
+        except OSError:
+            pass  # read-only checkout: derive every time
+    return Mirror(version, key, entries)
+
+
+def add_version_argument(parser: argparse.ArgumentParser) -> None:
+    """The --idl-version option every harness takes."""
+    parser.add_argument("--idl-version", choices=VERSIONS, default=DEFAULT_VERSION,
+                        help=f"spec version whose IDL the mirrors come from (default: {DEFAULT_VERSION})")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    add_version_argument(parser)
+    parser.add_argument("--no-cache", action="store_true", help="derive from the IDL, ignoring the cache")
+    parser.add_argument("names", nargs="*", help="entries to print (default: every entry)")
+    args = parser.parse_args(argv)
+    m = mirror(args.idl_version, cache_dir=None if args.no_cache else CACHE_DIR)
+    names = args.names or sorted(m.entries)
+    status = 0
+    for name in names:
+        try:
+            print(f"{name}: {', '.join(m[name])}")
+        except KeyError:
+            print(f"{name}: not declared in v{args.idl_version}", file=sys.stderr)
+            status = 1
+        except MirrorError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,917 @@
+#!/usr/bin/env python3
+"""Pure-Python front end for the OMG IDL subset used by idl/v1.x.
+
+Covers what the SpatialDDS profiles and examples use: nested and reopened
+modules, typedefs (including array typedefs), enums with @value (or the
+C-style `NAME = n` of the 1.2/1.3 profiles), structs with @key and
+@extensibility (or the older @appendable/@final/@mutable shorthands),
+bounded and unbounded sequences and strings, fixed-size arrays, discriminated
+unions, integer/float/string consts (decimal or hex, with simple constant
+expressions), and the #include / #ifndef / #define include-guard pattern.
+
+parse_file() caches each file's AST as a pickle under .build-cache/idl-ast/,
+keyed by the sha256 of the file's bytes, so a warm run only hashes the files.
+load() follows #include directives (relative to the including file, then the
+include directories, like idlc -I) and returns a Schema that indexes every
+declaration by its fully scoped name and resolves names the way IDL scoping
+does. Nothing here needs idlc or any package outside the standard library.
+
+Preprocessor conditionals are evaluated against the macros a file defines
+itself. That is exact for the include-guard idiom, the only one in the tree,
+because load() reads every file once however often it is included.
+
+Usage: idl_parser.py [--no-cache] [--examples] [--dump] (version | path) ...   (default: 1.7)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import pickle
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Union
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = ROOT / ".build-cache" / "idl-ast"
+# Bump whenever the AST classes change shape; old pickles are then ignored.
+AST_FORMAT = 1
+
+
+class IdlError(ValueError):
+    """Syntax or include error, reported as path:line: message."""
+
+    def __init__(self, path: str, line: int, message: str) -> None:
+        super().__init__(f"{path}:{line}: {message}")
+        self.path = path
+        self.line = line
+
+
+# ---------------------------------------------------------------------------
+# AST
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class ConstRef:
+    """A (possibly scoped) name used as a value: a const or an enumerator."""
+    name: str
+
+
+@dataclass(frozen=True)
+class UnaryOp:
+    op: str
+    operand: "Expr"
+
+
+@dataclass(frozen=True)
+class BinaryOp:
+    op: str
+    left: "Expr"
+    right: "Expr"
+
+
+Expr = Union[int, float, str, bool, ConstRef, UnaryOp, BinaryOp]
+
+
+@dataclass(frozen=True)
+class TypeRef:
+    """A primitive type keyword (normalized, e.g. 'int32') or a scoped name as written."""
+    name: str
+
+    @property
+    def primitive(self) -> bool:
+        return self.name in PRIMITIVES
+
+
+@dataclass(frozen=True)
+class SequenceType:
+    element: "TypeSpec"
+    bound: Expr | None = None
+
+
+@dataclass(frozen=True)
+class StringType:
+    bound: Expr | None = None
+    wide: bool = False
+
+
+TypeSpec = Union[TypeRef, SequenceType, StringType]
+
+
+def extensibility(annotations: dict[str, str | None]) -> str:
+    """FINAL, APPENDABLE or MUTABLE; XTypes defaults to FINAL when unannotated."""
+    if "extensibility" in annotations:
+        return (annotations["extensibility"] or "FINAL").upper()
+    for kind in ("appendable", "mutable", "final"):
+        if kind in annotations:
+            return kind.upper()
+    return "FINAL"
+
+
+@dataclass
+class Member:
+    name: str
+    type: TypeSpec
+    dims: tuple[Expr, ...] = ()
+    annotations: dict[str, str | None] = field(default_factory=dict)
+    line: int = 0
+
+    @property
+    def key(self) -> bool:
+        return "key" in self.annotations and (self.annotations["key"] or "TRUE").upper() != "FALSE"
+
+    @property
+    def optional(self) -> bool:
+        return "optional" in self.annotations
+
+
+@dataclass
+class Struct:
+    name: str
+    members: list[Member]
+    base: str | None = None
+    annotations: dict[str, str | None] = field(default_factory=dict)
+    line: int = 0
+
+    @property
+    def extensibility(self) -> str:
+        return extensibility(self.annotations)
+
+    @property
+    def keys(self) -> list[Member]:
+        return [m for m in self.members if m.key]
+
+
+@dataclass
+class UnionCase:
+    labels: tuple[Expr, ...]
+    default: bool
+    member: Member
+
+
+@dataclass
+class UnionDef:
+    name: str
+    discriminator: TypeSpec
+    cases: list[UnionCase]
+    annotations: dict[str, str | None] = field(default_factory=dict)
+    line: int = 0
+
+    @property
+    def extensibility(self) -> str:
+        return extensibility(self.annotations)
+
+
+@dataclass
+class Enumerator:
+    name: str
+    value: int | None
+    annotations: dict[str, str | None] = field(default_factory=dict)
+    line: int = 0
+
+
+@dataclass
+class Enum:
+    name: str
+    enumerators: list[Enumerator]
+    annotations: dict[str, str | None] = field(default_factory=dict)
+    line: int = 0
+
+    def values(self) -> dict[str, int]:
+        """Enumerator -> ordinal: explicit @value, otherwise previous + 1 (from 0)."""
+        result, nxt = {}, 0
+        for e in self.enumerators:
+            value = e.value if e.value is not None else nxt
+            result[e.name] = value
+            nxt = value + 1
+        return result
+
+
+@dataclass
+class Typedef:
+    name: str
+    type: TypeSpec
+    dims: tuple[Expr, ...] = ()
+    annotations: dict[str, str | None] = field(default_factory=dict)
+    line: int = 0
+
+
+@dataclass
+class Const:
+    name: str
+    type: TypeSpec
+    value: Expr
+    line: int = 0
+
+
+@dataclass
+class Forward:
+    """struct X; / union X; -- declares the name ahead of its definition."""
+    name: str
+    kind: str
+    line: int = 0
+
+
+@dataclass
+class Module:
+    name: str
+    definitions: list["Definition"]
+    line: int = 0
+
+
+Definition = Union[Module, Struct, UnionDef, Enum, Typedef, Const, Forward]
+
+
+@dataclass
+class IdlFile:
+    path: str
+    includes: list[str]
+    definitions: list[Definition]
+
+    @property
+    def module_id(self) -> str | None:
+        """Value of the first `const string MODULE_ID` in the file, if any."""
+        stack = list(reversed(self.definitions))
+        while stack:
+            d = stack.pop()
+            if isinstance(d, Module):
+                stack.extend(reversed(d.definitions))
+            elif isinstance(d, Const) and d.name == "MODULE_ID" and isinstance(d.value, str):
+                return d.value
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Preprocessor and lexer
+# ---------------------------------------------------------------------------
+
+DIRECTIVE_RE = re.compile(r"\s*#\s*(\w+)\s*(.*?)\s*(?://.*)?$")
+INCLUDE_ARG_RE = re.compile(r'["<]([^">]+)[">]')
+
+TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<char>'(?:[^'\\\n]|\\.)')
+  | (?P<number>0[xX][0-9a-fA-F]+|(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?[dDfFlL]?)
+  | (?P<ident>[A-Za-z_]\w*)
+  | (?P<punct>::|<<|[{}()\[\]<>;,:=@+\-*/%|&^~])
+""", re.VERBOSE | re.DOTALL)
+
+PRIMITIVES = frozenset({
+    "boolean", "char", "wchar", "octet", "float", "double", "long double",
+    "int8", "uint8", "int16", "uint16", "int32", "uint32", "int64", "uint64",
+})
+
+# Classic IDL spellings, folded onto the sized names idl/v1.x uses.
+MULTIWORD_TYPES = {
+    ("unsigned", "long", "long"): "uint64",
+    ("unsigned", "long"): "uint32",
+    ("unsigned", "short"): "uint16",
+    ("long", "long"): "int64",
+    ("long", "double"): "long double",
+    ("long",): "int32",
+    ("short",): "int16",
+}
+
+
+def preprocess(text: str, path: str) -> tuple[str, list[str]]:
+    """Strip directives, honour #ifdef/#ifndef/#else/#endif, collect #include targets.
+
+    Line structure is preserved (directive and skipped lines become blank) so
+    the lexer reports true line numbers.
+    """
+    defined: set[str] = set()
+    includes: list[str] = []
+    active = [True]  # one entry per open conditional, plus the file itself
+    out = []
+    for line_no, line in enumerate(text.split("\n"), 1):
+        m = DIRECTIVE_RE.match(line)
+        if not m:
+            out.append(line if active[-1] else "")
+            continue
+        out.append("")
+        directive, arg = m.group(1), m.group(2)
+        if directive in ("ifdef", "ifndef"):
+            taken = (arg in defined) == (directive == "ifdef")
+            active.append(active[-1] and taken)
+        elif directive == "else":
+            if len(active) == 1:
+                raise IdlError(path, line_no, "#else without #if")
+            active[-1] = active[-2] and not active[-1]
+        elif directive == "endif":
+            if len(active) == 1:
+                raise IdlError(path, line_no, "#endif without #if")
+            active.pop()
+        elif not active[-1]:
+            continue
+        elif directive == "define":
+            defined.add(arg.split()[0] if arg else "")
+        elif directive == "undef":
+            defined.discard(arg)
+        elif directive == "include":
+            target = INCLUDE_ARG_RE.match(arg)
+            if not target:
+                raise IdlError(path, line_no, f"malformed #include {arg!r}")
+            includes.append(target.group(1))
+        elif directive != "pragma":
+            raise IdlError(path, line_no, f"unsupported directive #{directive}")
+    if len(active) != 1:
+        raise IdlError(path, line_no, "unterminated #if block")
+    return "\n".join(out), includes
+
+
+def tokenize(text: str, path: str) -> list[tuple[str, str, int]]:
+    """(kind, text, line) for every significant token."""
+    tokens = []
+    line, pos = 1, 0
+    while pos < len(text):
+        m = TOKEN_RE.match(text, pos)
+        if not m:
+            raise IdlError(path, line, f"unexpected character {text[pos]!r}")
+        kind = m.lastgroup
+        value = m.group()
+        if kind not in ("space", "comment"):
+            tokens.append((kind, value, line))
+        line += value.count("\n")
+        pos = m.end()
+    tokens.append(("eof", "", line))
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+class Parser:
+    def __init__(self, text: str, path: str) -> None:
+        self.path = path
+        self.tokens = tokenize(text, path)
+        self.pos = 0
+
+    # -- token helpers --
+
+    def peek(self, offset: int = 0) -> tuple[str, str, int]:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def at(self, value: str) -> bool:
+        return self.peek()[1] == value and self.peek()[0] in ("ident", "punct")
+
+    def next(self) -> tuple[str, str, int]:
+        token = self.tokens[self.pos]
+        if token[0] != "eof":
+            self.pos += 1
+        return token
+
+    def error(self, message: str) -> IdlError:
+        kind, value, line = self.peek()
+        found = "end of file" if kind == "eof" else repr(value)
+        return IdlError(self.path, line, f"{message}, found {found}")
+
+    def expect(self, value: str) -> tuple[str, str, int]:
+        if not self.at(value):
+            raise self.error(f"expected {value!r}")
+        return self.next()
+
+    def accept(self, value: str) -> bool:
+        if self.at(value):
+            self.next()
+            return True
+        return False
+
+    def ident(self) -> str:
+        kind, value, _ = self.peek()
+        if kind != "ident":
+            raise self.error("expected identifier")
+        self.next()
+        return value
+
+    def scoped_name(self) -> str:
+        parts = []
+        if self.accept("::"):
+            parts.append("")
+        parts.append(self.ident())
+        while self.accept("::"):
+            parts.append(self.ident())
+        return "::".join(parts)
+
+    # -- grammar --
+
+    def specification(self) -> list[Definition]:
+        definitions = []
+        while self.peek()[0] != "eof":
+            definitions.append(self.definition())
+        return definitions
+
+    def annotations(self) -> dict[str, str | None]:
+        found: dict[str, str | None] = {}
+        while self.at("@"):
+            self.next()
+            name = self.scoped_name()
+            args = None
+            if self.at("("):
+                self.next()
+                depth, parts = 1, []
+                while True:
+                    kind, value, _ = self.next()
+                    if kind == "eof":
+                        raise self.error(f"unterminated @{name}(")
+                    if value == "(":
+                        depth += 1
+                    elif value == ")":
+                        depth -= 1
+                        if not depth:
+                            break
+                    parts.append(value)
+                args = " ".join(parts)
+            found[name] = args
+        return found
+
+    def definition(self) -> Definition:
+        annotations = self.annotations()
+        line = self.peek()[2]
+        if self.accept("module"):
+            name = self.ident()
+            self.expect("{")
+            body = []
+            while not self.at("}"):
+                if self.peek()[0] == "eof":
+                    raise self.error(f"unterminated module {name}")
+                body.append(self.definition())
+            self.expect("}")
+            result: Definition = Module(name, body, line)
+        elif self.accept("struct"):
+            result = self.struct(annotations, line)
+        elif self.accept("union"):
+            result = self.union(annotations, line)
+        elif self.accept("enum"):
+            result = self.enum(annotations, line)
+        elif self.accept("typedef"):
+            type_spec = self.type_spec()
+            name, dims = self.declarator()
+            result = Typedef(name, type_spec, dims, annotations, line)
+            if self.at(","):
+                raise self.error("multiple declarators in one typedef are not supported")
+        elif self.accept("const"):
+            type_spec = self.type_spec()
+            name = self.ident()
+            self.expect("=")
+            result = Const(name, type_spec, self.const_expr(), line)
+        else:
+            raise self.error("expected a definition")
+        self.expect(";")
+        return result
+
+    def struct(self, annotations: dict[str, str | None], line: int) -> Struct | Forward:
+        name = self.ident()
+        if self.at(";"):
+            return Forward(name, "struct", line)
+        base = self.scoped_name() if self.accept(":") else None
+        self.expect("{")
+        members: list[Member] = []
+        while not self.accept("}"):
+            members.extend(self.members())
+        return Struct(name, members, base, annotations, line)
+
+    def members(self) -> list[Member]:
+        annotations = self.annotations()
+        line = self.peek()[2]
+        type_spec = self.type_spec()
+        result = []
+        while True:
+            name, dims = self.declarator()
+            result.append(Member(name, type_spec, dims, dict(annotations), line))
+            if not self.accept(","):
+                break
+        self.expect(";")
+        return result
+
+    def declarator(self) -> tuple[str, tuple[Expr, ...]]:
+        name = self.ident()
+        dims = []
+        while self.accept("["):
+            dims.append(self.const_expr())
+            self.expect("]")
+        return name, tuple(dims)
+
+    def union(self, annotations: dict[str, str | None], line: int) -> UnionDef | Forward:
+        name = self.ident()
+        if self.at(";"):
+            return Forward(name, "union", line)
+        self.expect("switch")
+        self.expect("(")
+        self.annotations()
+        discriminator = self.type_spec()
+        self.expect(")")
+        self.expect("{")
+        cases = []
+        while not self.accept("}"):
+            labels, default = [], False
+            while self.at("case") or self.at("default"):
+                if self.accept("default"):
+                    default = True
+                else:
+                    self.next()
+                    labels.append(self.const_expr())
+                self.expect(":")
+            if not labels and not default:
+                raise self.error("expected 'case' or 'default'")
+            member_annotations = self.annotations()
+            member_line = self.peek()[2]
+            type_spec = self.type_spec()
+            member_name, dims = self.declarator()
+            self.expect(";")
+            member = Member(member_name, type_spec, dims, member_annotations, member_line)
+            cases.append(UnionCase(tuple(labels), default, member))
+        return UnionDef(name, discriminator, cases, annotations, line)
+
+    def enum(self, annotations: dict[str, str | None], line: int) -> Enum:
+        name = self.ident()
+        self.expect("{")
+        enumerators = []
+        while not self.at("}"):
+            e_annotations = self.annotations()
+            e_line = self.peek()[2]
+            e_name = self.ident()
+            value = None
+            raw = e_annotations.get("value")
+            if raw is not None:
+                try:
+                    value = int(raw.replace(" ", ""), 0)
+                except ValueError:
+                    raise IdlError(self.path, e_line, f"@value({raw}) on {e_name} is not an integer") from None
+            if self.accept("="):
+                # C-style `NAME = n`, used by the 1.2/1.3 profiles in place of @value.
+                value = self.const_expr()
+                if not isinstance(value, int):
+                    raise IdlError(self.path, e_line, f"value of {e_name} is not an integer literal")
+            enumerators.append(Enumerator(e_name, value, e_annotations, e_line))
+            if not self.accept(","):
+                break
+        self.expect("}")
+        return Enum(name, enumerators, annotations, line)
+
+    def type_spec(self) -> TypeSpec:
+        if self.accept("sequence"):
+            self.expect("<")
+            element = self.type_spec()
+            bound = self.const_expr() if self.accept(",") else None
+            self.expect(">")
+            return SequenceType(element, bound)
+        for keyword, wide in (("string", False), ("wstring", True)):
+            if self.accept(keyword):
+                bound = None
+                if self.accept("<"):
+                    bound = self.const_expr()
+                    self.expect(">")
+                return StringType(bound, wide)
+        if self.peek()[1] in ("unsigned", "long", "short"):
+            words = []
+            while self.peek()[1] in ("unsigned", "long", "short", "double") and len(words) < 3:
+                words.append(self.next()[1])
+                if words[-1] == "double":
+                    break
+            normalized = MULTIWORD_TYPES.get(tuple(words))
+            if normalized is None:
+                raise self.error(f"unknown type '{' '.join(words)}'")
+            return TypeRef(normalized)
+        return TypeRef(self.scoped_name())
+
+    # Constant expressions: |, ^, &, << >>, + -, * / %, unary - + ~.
+    BINARY_LEVELS = (("|",), ("^",), ("&",), ("<<", ">>"), ("+", "-"), ("*", "/", "%"))
+
+    def const_expr(self, level: int = 0) -> Expr:
+        if level == len(self.BINARY_LEVELS):
+            return self.unary()
+        left = self.const_expr(level + 1)
+        while True:
+            op = self.peek()[1]
+            if op == ">" and self.peek(1)[1] == ">" and ">>" in self.BINARY_LEVELS[level]:
+                self.next()
+                op = ">>"
+            elif op not in self.BINARY_LEVELS[level] or self.peek()[0] != "punct":
+                return left
+            self.next()
+            left = fold(BinaryOp(op, left, self.const_expr(level + 1)))
+
+    def unary(self) -> Expr:
+        if self.peek()[1] in ("-", "+", "~") and self.peek()[0] == "punct":
+            op = self.next()[1]
+            return fold(UnaryOp(op, self.unary()))
+        if self.accept("("):
+            value = self.const_expr()
+            self.expect(")")
+            return value
+        kind, value, line = self.peek()
+        if kind == "number":
+            self.next()
+            return parse_number(value)
+        if kind == "string":
+            self.next()
+            text = unescape(value)
+            # Adjacent string literals concatenate.
+            while self.peek()[0] == "string":
+                text += unescape(self.next()[1])
+            return text
+        if kind == "char":
+            self.next()
+            return value[1:-1]
+        if value in ("TRUE", "FALSE"):
+            self.next()
+            return value == "TRUE"
+        if kind == "ident" or value == "::":
+            return ConstRef(self.scoped_name())
+        raise self.error("expected a constant expression")
+
+
+def unescape(literal: str) -> str:
+    """Body of a quoted IDL string literal with backslash escapes removed."""
+    return re.sub(r"\\(.)", r"\1", literal[1:-1])
+
+
+def parse_number(text: str) -> int | float:
+    if text[:2] in ("0x", "0X"):
+        return int(text, 16)
+    stripped = text.rstrip("dDfFlL")
+    if any(c in stripped for c in ".eE"):
+        return float(stripped)
+    # IDL follows C: a leading 0 means octal.
+    return int(stripped, 8) if len(stripped) > 1 and stripped[0] == "0" else int(stripped)
+
+
+BINARY_FUNCS = {
+    "|": lambda a, b: a | b, "^": lambda a, b: a ^ b, "&": lambda a, b: a & b,
+    "<<": lambda a, b: a << b, ">>": lambda a, b: a >> b,
+    "+": lambda a, b: a + b, "-": lambda a, b: a - b, "*": lambda a, b: a * b,
+    "/": lambda a, b: a // b if isinstance(a, int) and isinstance(b, int) else a / b,
+    "%": lambda a, b: a % b,
+}
+UNARY_FUNCS = {"-": lambda a: -a, "+": lambda a: a, "~": lambda a: ~a}
+
+
+def fold(expr: Expr) -> Expr:
+    """Evaluate expr now if every operand is a numeric literal."""
+    def numeric(x: Expr) -> bool:
+        return isinstance(x, (int, float)) and not isinstance(x, bool)
+    if isinstance(expr, UnaryOp) and numeric(expr.operand):
+        return UNARY_FUNCS[expr.op](expr.operand)
+    if isinstance(expr, BinaryOp) and numeric(expr.left) and numeric(expr.right):
+        try:
+            return BINARY_FUNCS[expr.op](expr.left, expr.right)
+        except (ZeroDivisionError, TypeError):
+            return expr
+    return expr
+
+
+def parse(text: str, path: str = "<string>") -> IdlFile:
+    """Parse IDL source text (no caching, includes are recorded, not followed)."""
+    body, includes = preprocess(text, path)
+    return IdlFile(path, includes, Parser(body, path).specification())
+
+
+def parse_file(path: Path, *, cache_dir: Path | None = CACHE_DIR, label: str | None = None) -> IdlFile:
+    """Parse one file, served from the pickled-AST cache when its bytes are unchanged.
+
+    label is the path recorded in the AST and in error messages (default: path
+    relative to the repository root when inside it).
+    """
+    path = Path(path)
+    if label is None:
+        try:
+            label = str(path.resolve().relative_to(ROOT))
+        except ValueError:
+            label = str(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(b"%d\0%s\0" % (AST_FORMAT, label.encode("utf-8")) + data).hexdigest()
+    cached = cache_dir / f"{digest}.pickle" if cache_dir is not None else None
+    if cached is not None:
+        try:
+            with open(cached, "rb") as fp:
+                return pickle.load(fp)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass  # unreadable or stale (renamed class or module): parse again
+    result = parse(data.decode("utf-8"), label)
+    if cached is not None:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as fp:
+                pickle.dump(result, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cached)
+        except OSError:
+            pass  # read-only checkout: parse every time
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Schema: every declaration of a set of files, by fully scoped name
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Declared:
+    """A named declaration together with where it lives."""
+    node: Definition | Enumerator
+    scope: str      # enclosing module scope, e.g. "spatial::core" ('' at file level)
+    file: str
+    parent: Enum | None = None  # the enum that declares an enumerator
+
+
+def qualify(scope: str, name: str) -> str:
+    return f"{scope}::{name}" if scope else name
+
+
+class Schema:
+    """Declarations from a set of parsed files, keyed by scoped name ("spatial::core::PoseSE3").
+
+    Enumerators are entered in the scope enclosing their enum, as IDL scoping
+    requires (spatial::common::COV_NONE). A name defined more than once with
+    different content is recorded in `conflicts` and the first definition wins.
+    """
+
+    def __init__(self, files: list[IdlFile]) -> None:
+        self.files = files
+        self.decls: dict[str, Declared] = {}
+        self.conflicts: list[tuple[str, Declared, Declared]] = []
+        for f in files:
+            self._enter(f.definitions, "", f.path)
+
+    def _add(self, name: str, entry: Declared) -> None:
+        existing = self.decls.get(name)
+        if existing is None or isinstance(existing.node, Forward):
+            self.decls[name] = entry
+        elif isinstance(entry.node, Forward):
+            return
+        elif existing.node != entry.node:
+            self.conflicts.append((name, existing, entry))
+
+    def _enter(self, definitions: list[Definition], scope: str, path: str) -> None:
+        for d in definitions:
+            if isinstance(d, Module):
+                self._enter(d.definitions, qualify(scope, d.name), path)
+                continue
+            self._add(qualify(scope, d.name), Declared(d, scope, path))
+            if isinstance(d, Enum):
+                for e in d.enumerators:
+                    self._add(qualify(scope, e.name), Declared(e, scope, path, d))
+
+    def lookup(self, name: str, scope: str = "") -> str | None:
+        """Fully scoped name that `name`, written inside `scope`, refers to."""
+        if name.startswith("::"):
+            name = name[2:]
+            return name if name in self.decls else None
+        parts = scope.split("::") if scope else []
+        for depth in range(len(parts), -1, -1):
+            candidate = qualify("::".join(parts[:depth]), name)
+            if candidate in self.decls:
+                return candidate
+        return None
+
+    def __getitem__(self, name: str) -> Definition | Enumerator:
+        return self.decls[name].node
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.decls
+
+    def of_type(self, kind: type) -> dict[str, Declared]:
+        return {name: d for name, d in self.decls.items() if isinstance(d.node, kind)}
+
+    def evaluate(self, expr: Expr, scope: str = "", _seen: tuple[str, ...] = ()) -> int | float | str | bool:
+        """Value of a constant expression; raises KeyError for an unresolved name."""
+        if isinstance(expr, ConstRef):
+            name = self.lookup(expr.name, scope)
+            if name is None or name in _seen:
+                raise KeyError(expr.name)
+            entry = self.decls[name]
+            if isinstance(entry.node, Enumerator):
+                return entry.parent.values()[entry.node.name]
+            if not isinstance(entry.node, Const):
+                raise KeyError(expr.name)
+            return self.evaluate(entry.node.value, entry.scope, (*_seen, name))
+        if isinstance(expr, UnaryOp):
+            return UNARY_FUNCS[expr.op](self.evaluate(expr.operand, scope, _seen))
+        if isinstance(expr, BinaryOp):
+            return BINARY_FUNCS[expr.op](
+                self.evaluate(expr.left, scope, _seen), self.evaluate(expr.right, scope, _seen)
+            )
+        return expr
+
+    def resolve(self, type_spec: TypeSpec, scope: str = "") -> tuple[TypeSpec | Definition, tuple[int, ...], str]:
+        """Follow typedefs from type_spec to a primitive, string, sequence or constructed type.
+
+        Returns (target, dims, scope): array dimensions picked up from array
+        typedefs along the way, outermost first, and the scope the target's own
+        names resolve in. Raises KeyError for an unresolved name.
+        """
+        dims: list[int] = []
+        seen = set()
+        while isinstance(type_spec, TypeRef) and not type_spec.primitive:
+            name = self.lookup(type_spec.name, scope)
+            if name is None or name in seen:
+                raise KeyError(type_spec.name)
+            seen.add(name)
+            entry = self.decls[name]
+            if not isinstance(entry.node, Typedef):
+                return entry.node, tuple(dims), entry.scope
+            dims += [int(self.evaluate(d, entry.scope)) for d in entry.node.dims]
+            type_spec, scope = entry.node.type, entry.scope
+        return type_spec, tuple(dims), scope
+
+
+def find_include(target: str, including: Path, include_dirs: list[Path]) -> Path | None:
+    for directory in (including.parent, *include_dirs):
+        candidate = directory / target
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def load(paths: list[Path], include_dirs: list[Path] = (), *, cache_dir: Path | None = CACHE_DIR) -> Schema:
+    """Parse paths and everything they #include; includes come before their includers."""
+    files: list[IdlFile] = []
+    done: set[Path] = set()
+    active: list[Path] = []
+
+    def visit(path: Path) -> None:
+        path = path.resolve()
+        if path in done:
+            return
+        if path in active:
+            return  # include cycle: the guards would make the re-entry empty
+        active.append(path)
+        parsed = parse_file(path, cache_dir=cache_dir)
+        for target in parsed.includes:
+            found = find_include(target, path, list(include_dirs))
+            if found is None:
+                raise IdlError(parsed.path, 1, f"cannot find #include \"{target}\"")
+            visit(found)
+        active.pop()
+        done.add(path)
+        files.append(parsed)
+
+    for path in paths:
+        visit(Path(path))
+    return Schema(files)
+
+
+def version_files(version: str, root: Path = ROOT, *, examples: bool = False) -> list[Path]:
+    """idl/v<ver>/*.idl (and idl/v<ver>/examples/*.idl), sorted."""
+    idl_dir = root / "idl" / f"v{version}"
+    if not idl_dir.is_dir():
+        raise FileNotFoundError(f"missing directory {idl_dir}")
+    paths = sorted(idl_dir.glob("*.idl"))
+    if examples:
+        paths += sorted((idl_dir / "examples").glob("*.idl"))
+    return paths
+
+
+def load_version(version: str, root: Path = ROOT, *, examples: bool = False,
+                 cache_dir: Path | None = CACHE_DIR) -> Schema:
+    """Schema for one spec version, with idl/v<ver>/ on the include path."""
+    return load(version_files(version, root, examples=examples), [root / "idl" / f"v{version}"],
+                cache_dir=cache_dir)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("targets", nargs="*", help="spec versions (e.g. 1.7) or .idl paths (default: 1.7)")
+    parser.add_argument("--no-cache", action="store_true", help="parse every file, ignoring the AST cache")
+    parser.add_argument("--examples", action="store_true", help="also load idl/v<ver>/examples/*.idl")
+    parser.add_argument("--dump", action="store_true", help="list every declaration by scoped name")
+    args = parser.parse_args(argv)
+    cache_dir = None if args.no_cache else CACHE_DIR
+
+    status = 0
+    for target in args.targets or ["1.7"]:
+        started = time.perf_counter()
+        try:
+            if re.fullmatch(r"[0-9]+\.[0-9]+", target):
+                schema = load_version(target, examples=args.examples, cache_dir=cache_dir)
+            else:
+                schema = load([Path(target)], cache_dir=cache_dir)
+        except (IdlError, FileNotFoundError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            status = 1
+            continue
+        elapsed = (time.perf_counter() - started) * 1000
+        counts = {
+            label: len(schema.of_type(kind))
+            for label, kind in (("structs", Struct), ("unions", UnionDef), ("enums", Enum),
+                                ("typedefs", Typedef), ("consts", Const))
+        }
+        summary = ", ".join(f"{n} {label}" for label, n in counts.items())
+        print(f"{target}: {len(schema.files)} file(s) in {elapsed:.1f} ms: {summary}")
+        if args.dump:
+            for name, entry in schema.decls.items():
+                print(f"  {type(entry.node).__name__.lower():<10} {name}  ({entry.file})")
+    return status
+
+
+if __name__ == "__main__":
+    # Run through the importable module so cached ASTs pickle as idl_parser.*,
+    # not __main__.*, and load from any tool that imports this file.
+    import idl_parser
+    sys.exit(idl_parser.main())
@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+"""Stream a local nuScenes-format directory through the SpatialDDS types.
+
+The nuScenes harness checks the spec against a synthetic description of the
+dataset. This module checks it against the data itself: it reads the JSON
+tables of a local copy (dataroot/<version>/*.json), the .pcd radar sweeps and
+the .pcd.bin lidar sweeps, maps every record to the IDL type a bridge would
+publish, and encodes it with the XCDR2 codec of the chosen spec version:
+
+  radar sample_data  (.pcd, ARS 408)       -> RadDetectionSet of RadDetection
+  lidar sample_data  (.pcd.bin, x y z i r) -> LidarFrame with its FrameHeader
+  sample_annotation                        -> Detection3D, grouped per sample
+                                              into Detection3DSet
+
+For each type it counts the records, how many records populate each IDL
+member, and the conversion failures (a malformed file, a value the IDL has no
+mapping for, a sequence longer than its bound) by reason.
+
+Memory stays bounded on the full trainval split (2.6M sample_data records,
+1.4M annotations): those tables are read one record at a time with an
+incremental JSON decoder, a sweep file is held only while it is converted,
+and annotations are grouped into a set per run of consecutive records of one
+sample. Only the small lookup tables are indexed in memory: sensor,
+calibrated_sensor, category, attribute, visibility, and the token -> category
+of instance and token -> timestamp of sample (tens of thousands of entries).
+ego_pose is as large as sample_data, so FrameHeader.sensor_pose is left unset.
+
+The ARS 408 state codes x_rms, y_rms, vx_rms, vy_rms, pdh0 and ambig_state
+are not mapped: the dataset stores them as firmware codes whose meaning does
+not match the physical RadDetection members of the same name.
+
+write_fixture() writes a tiny synthetic dataset in this layout, for smoke
+runs without the real data.
+
+Usage: nuscenes_ingest.py [--nusc-version v1.0-mini] [--idl-version 1.7] [--only KIND ...] [--limit N] [--json] DATAROOT
+       nuscenes_ingest.py --write-fixture DIR
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import struct
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_NUSC_VERSION = "v1.0-mini"
+KINDS = ("radar", "lidar", "annotations")
+LIDAR_RATE_HZ = 20.0            # HDL-32E spin rate; t_end = t_start + 1/rate (§ L-05)
+LIDAR_POINT = struct.Struct("<5f")  # x, y, z, intensity, ring
+MAX_REASONS = 20                # distinct failure reasons kept per type
+SOURCE_ID = "nuscenes"
+
+# ARS 408 dynProp -> RadDynProp. 5 and 6 (crossing stationary / moving) carry
+# no direction; a moving crosser's direction comes from the sign of vy.
+ARS_DYN_PROP = {0: "MOVING", 1: "STATIONARY", 2: "ONCOMING", 3: "STATIONARY",
+                4: "UNKNOWN", 5: "STATIONARY", 7: "STOPPED"}
+
+PCD_TYPES = {("F", 4): "f", ("F", 8): "d",
+             ("I", 1): "b", ("I", 2): "h", ("I", 4): "i", ("I", 8): "q",
+             ("U", 1): "B", ("U", 2): "H", ("U", 4): "I", ("U", 8): "Q"}
+
+
+class IngestError(ValueError):
+    """A record or file that cannot be converted."""
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+def iter_json_array(path: Path, chunk_size: int = 1 << 20):
+    """Yield the elements of a file holding one JSON array, one at a time.
+
+    Only the current chunk and the element being decoded are held, so a
+    multi-gigabyte table streams in constant memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as fp:
+        buf, pos, eof = "", 0, False
+
+        def fill() -> bool:
+            nonlocal buf, pos, eof
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            return not eof
+
+        def skip(chars: str) -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf) or not fill():
+                    return
+
+        skip(" \t\r\n")
+        if buf[pos:pos + 1] != "[":
+            raise IngestError(f"{path}: not a JSON array")
+        pos += 1
+        while True:
+            skip(" \t\r\n,")
+            if pos >= len(buf):
+                raise IngestError(f"{path}: unterminated JSON array")
+            if buf[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof or not fill():
+                    raise IngestError(f"{path}: malformed JSON array element") from None
+                continue
+            if end == len(buf) and not eof:  # a number or literal may continue in the next chunk
+                fill()
+                continue
+            pos = end
+            yield value
+
+
+def read_pcd(path: Path) -> tuple[list[str], list[tuple]]:
+    """Field names and point tuples of a PCD file (DATA ascii or binary)."""
+    data = path.read_bytes()
+    fields, sizes, types, counts, points, offset = [], [], [], [], None, 0
+    while True:
+        end = data.find(b"\n", offset)
+        if end < 0:
+            raise IngestError(f"{path.name}: PCD header has no DATA line")
+        line = data[offset:end].decode("ascii", "replace").strip()
+        offset = end + 1
+        if not line or line.startswith("#"):
+            continue
+        key, *values = line.split()
+        if key == "FIELDS":
+            fields = values
+        elif key == "SIZE":
+            sizes = [int(v) for v in values]
+        elif key == "TYPE":
+            types = values
+        elif key == "COUNT":
+            counts = [int(v) for v in values]
+        elif key == "POINTS":
+            points = int(values[0])
+        elif key == "DATA":
+            encoding = values[0] if values else ""
+            break
+    if not (len(fields) == len(sizes) == len(types)) or not fields:
+        raise IngestError(f"{path.name}: PCD FIELDS/SIZE/TYPE disagree")
+    if any(c != 1 for c in counts):
+        raise IngestError(f"{path.name}: PCD fields with COUNT > 1 are not supported")
+    try:
+        codes = "".join(PCD_TYPES[(t, s)] for t, s in zip(types, sizes))
+    except KeyError as exc:
+        raise IngestError(f"{path.name}: unsupported PCD TYPE/SIZE {exc.args[0]}") from None
+    if encoding == "binary":
+        record = struct.Struct("<" + codes)
+        body = memoryview(data)[offset:]
+        n = points if points is not None else len(body) // record.size
+        if n * record.size > len(body):
+            raise IngestError(f"{path.name}: {n} points declared, {len(body) // record.size} present")
+        return fields, list(record.iter_unpack(body[:n * record.size]))
+    if encoding == "ascii":
+        convert = [float if c in "fd" else int for c in codes]
+        rows = []
+        for line in data[offset:].decode("ascii").splitlines():
+            if line.strip():
+                rows.append(tuple(f(v) for f, v in zip(convert, line.split())))
+        return fields, rows[:points] if points is not None else rows
+    raise IngestError(f"{path.name}: PCD DATA {encoding or '?'} not supported")
+
+
+def lidar_stats(data: bytes) -> tuple[int, float, float]:
+    """Point count, mean range (m) and percent of finite, non-zero points of a .pcd.bin sweep."""
+    try:
+        import numpy as np  # imported here so importing this module stays cheap
+    except ImportError:     # NumPy is optional; the ranges are then summed in Python
+        np = None
+    n = len(data) // LIDAR_POINT.size
+    if not n:
+        return 0, 0.0, 0.0
+    if np is not None:
+        xyz = np.frombuffer(data, "<f4", n * 5).reshape(n, 5)[:, :3].astype(np.float64)
+        r = np.sqrt((xyz * xyz).sum(axis=1))
+        valid = np.isfinite(r) & (r > 0)
+        count = int(valid.sum())
+        return n, float(r[valid].mean()) if count else 0.0, 100.0 * count / n
+    values = array("f")
+    values.frombytes(data[:n * LIDAR_POINT.size])
+    if sys.byteorder == "big":
+        values.byteswap()
+    total = count = 0
+    for x, y, z in zip(values[0::5], values[1::5], values[2::5]):
+        r = math.sqrt(x * x + y * y + z * z)
+        if r > 0 and math.isfinite(r):
+            total += r
+            count += 1
+    return n, total / count if count else 0.0, 100.0 * count / n
+
+
+# ---------------------------------------------------------------------------
+# Dataset
+# ---------------------------------------------------------------------------
+
+class NuScenes:
+    """A local nuScenes-format directory: dataroot/<version>/*.json plus the sweep files."""
+
+    def __init__(self, dataroot: Path, version: str = DEFAULT_NUSC_VERSION) -> None:
+        self.root = Path(dataroot)
+        self.version = version
+        self.tables = self.root / version
+        if not self.tables.is_dir():
+            raise FileNotFoundError(f"missing directory {self.tables}")
+        self._sensors: dict[str, tuple[str, str]] | None = None
+
+    def table(self, name: str):
+        """Records of one table, streamed."""
+        path = self.tables / f"{name}.json"
+        if not path.is_file():
+            raise FileNotFoundError(f"missing table {path}")
+        return iter_json_array(path)
+
+    def index(self, name: str, field: str) -> dict:
+        """token -> record[field] of a small table."""
+        return {r["token"]: r.get(field) for r in self.table(name)}
+
+    def sensors(self) -> dict[str, tuple[str, str]]:
+        """calibrated_sensor token -> (channel, modality)."""
+        if self._sensors is None:
+            sensor = {r["token"]: (r["channel"], r["modality"]) for r in self.table("sensor")}
+            self._sensors = {r["token"]: sensor[r["sensor_token"]] for r in self.table("calibrated_sensor")}
+        return self._sensors
+
+    def sweeps(self, modality: str):
+        """(sample_data record, channel, file path) of every sweep of one modality, in table order."""
+        sensors = self.sensors()
+        for sd in self.table("sample_data"):
+            channel, kind = sensors.get(sd.get("calibrated_sensor_token"), (None, None))
+            if kind == modality:
+                yield sd, channel, self.root / sd["filename"]
+
+
+# ---------------------------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------------------------
+
+class Coverage:
+    """Records converted to one IDL type: member population and failures."""
+
+    def __init__(self, type_name: str, members: list[str]) -> None:
+        self.type_name = type_name
+        self.members = members
+        self._known = set(members)
+        self.records = 0
+        self.populated: Counter[str] = Counter()
+        self.unknown: Counter[str] = Counter()   # mapped members this IDL version lacks
+        self.failures: Counter[str] = Counter()
+
+    def add(self, mapped: dict) -> None:
+        self.records += 1
+        for name in mapped:
+            (self.populated if name in self._known else self.unknown)[name] += 1
+
+    def fail(self, reason: str) -> None:
+        if reason not in self.failures and len(self.failures) >= MAX_REASONS:
+            reason = "(other reasons)"
+        self.failures[reason] += 1
+
+    @property
+    def failed(self) -> int:
+        return sum(self.failures.values())
+
+    def summary(self) -> str:
+        """One line: counts, then members populated always / sometimes / never."""
+        always = [m for m in self.members if self.records and self.populated[m] == self.records]
+        some = [f"{m} {100 * self.populated[m] / self.records:.0f}%"
+                for m in self.members if 0 < self.populated[m] < self.records]
+        never = [m for m in self.members if not self.populated[m]]
+        parts = [f"{self.records} converted, {self.failed} conversion failures"]
+        if self.failures:
+            parts.append("failures: " + "; ".join(f"{r} ×{n}" for r, n in self.failures.most_common(3)))
+        parts.append("always: " + (", ".join(always) or "—"))
+        if some:
+            parts.append("sometimes: " + ", ".join(some))
+        parts.append("never: " + (", ".join(never) or "—"))
+        if self.unknown:
+            parts.append("not in this IDL: " + ", ".join(sorted(self.unknown)))
+        return ". ".join(parts) + "."
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.type_name,
+            "records": self.records,
+            "failures": dict(self.failures),
+            "populated": {m: self.populated[m] for m in self.members},
+            "not_in_idl": dict(self.unknown),
+        }
+
+
+class Converter:
+    """Templates, enum values and codecs of the target types in one spec version."""
+
+    def __init__(self, idl_version: str) -> None:
+        from type_registry import TypeRegistry
+
+        self.registry = TypeRegistry(idl_version, examples=False)
+
+    def codec(self, module: str, type_name: str):
+        return self.registry.codec(module, type_name)
+
+    def coverage(self, module: str, type_name: str) -> Coverage:
+        return Coverage(type_name, list(self.codec(module, type_name).default()))
+
+    def enum(self, module: str, enum_name: str) -> dict[str, int]:
+        from idl_parser import Enum
+
+        schema = self.registry.profile(module).schema
+        for name, d in schema.decls.items():
+            if name.rsplit("::", 1)[-1] == enum_name and isinstance(d.node, Enum):
+                return d.node.values()
+        raise IngestError(f"{enum_name} is not declared in v{self.registry.version}")
+
+
+def stamp(us: int) -> dict:
+    """nuScenes microsecond timestamp -> builtin::Time."""
+    sec, rem = divmod(int(us), 1_000_000)
+    return {"sec": sec, "nanosec": rem * 1000}
+
+
+def sensor_frame(calibrated_sensor_token: str, channel: str, template: dict) -> dict:
+    """FrameRef of a sensor, per Appendix G: the flat token as uuid, ego/<channel> as fqn."""
+    return {**template, "uuid": calibrated_sensor_token, "fqn": f"ego/{channel.lower()}"}
+
+
+def encode(codec, value, coverage: Coverage) -> bool:
+    from xcdr2 import XcdrError
+
+    try:
+        codec.encode(value)
+    except (XcdrError, TypeError, OverflowError) as exc:
+        coverage.fail(f"{type(exc).__name__}: {exc}")
+        return False
+    return True
+
+
+def rad_detection(point: dict, dyn_prop: dict[str, int]) -> dict:
+    """ARS 408 point (nuScenes radar .pcd fields) -> RadDetection members."""
+    code = int(point["dyn_prop"])
+    if code == 6:
+        name = "CROSSING_LEFT" if point["vy"] >= 0 else "CROSSING_RIGHT"
+    elif code in ARS_DYN_PROP:
+        name = ARS_DYN_PROP[code]
+    else:
+        raise IngestError(f"dyn_prop {code} has no RadDynProp mapping")
+    return {
+        "xyz_m": [point["x"], point["y"], point["z"]],
+        "has_velocity_xyz": True,
+        "velocity_xyz": [point["vx"], point["vy"], 0.0],
+        "has_velocity_comp_xyz": True,
+        "velocity_comp_xyz": [point["vx_comp"], point["vy_comp"], 0.0],
+        "has_rcs_dbm2": True,
+        "rcs_dbm2": point["rcs"],
+        "quality": 1.0 if point["is_quality_valid"] else 0.0,
+        "has_dyn_prop": True,
+        "dyn_prop": dyn_prop[name],
+        "has_sensor_track_id": True,
+        "sensor_track_id": int(point["id"]),
+    }
+
+
+def validate_radar(nusc: NuScenes, conv: Converter, limit: int | None = None) -> list[Coverage]:
+    """Every radar sweep -> RadDetectionSet, each point -> RadDetection."""
+    module = "spatial.sensing.rad"
+    sets, dets = conv.coverage(module, "RadDetectionSet"), conv.coverage(module, "RadDetection")
+    codec = conv.codec(module, "RadDetectionSet")
+    set_template, det_template = codec.default(), conv.codec(module, "RadDetection").default()
+    dyn_prop = conv.enum(module, "RadDynProp")
+    seq: Counter[str] = Counter()
+    for n, (sd, channel, path) in enumerate(nusc.sweeps("radar")):
+        if limit is not None and n >= limit:
+            break
+        try:
+            fields, rows = read_pcd(path)
+        except OSError:
+            sets.fail("sweep file unreadable")
+            continue
+        except IngestError as exc:
+            sets.fail(str(exc))
+            continue
+        out, valid = [], 0
+        for row in rows:
+            point = dict(zip(fields, row))
+            try:
+                mapped = rad_detection(point, dyn_prop)
+            except (KeyError, IngestError) as exc:
+                dets.fail(f"missing field {exc.args[0]}" if isinstance(exc, KeyError) else str(exc))
+                continue
+            dets.add(mapped)
+            out.append({**det_template, **mapped})
+            valid += point.get("invalid_state", 0) == 0
+        mapped = {
+            "stream_id": channel,
+            "frame_seq": seq[channel],
+            "frame_ref": sensor_frame(sd["calibrated_sensor_token"], channel, set_template["frame_ref"]),
+            "dets": out,
+            "stamp": stamp(sd["timestamp"]),
+            "source_id": SOURCE_ID,
+            "seq": seq[channel],
+            "proc_chain": "ARS408",
+            "has_quality": bool(rows),
+            "quality": {**set_template["quality"], "percent_valid": 100.0 * valid / len(rows) if rows else 0.0},
+        }
+        seq[channel] += 1
+        if encode(codec, {**set_template, **mapped}, sets):
+            sets.add(mapped)
+    return [sets, dets]
+
+
+def validate_lidar(nusc: NuScenes, conv: Converter, limit: int | None = None) -> list[Coverage]:
+    """Every lidar sweep -> LidarFrame; the blob is the .pcd.bin file itself."""
+    module = "spatial.sensing.lidar"
+    frames, headers = conv.coverage(module, "LidarFrame"), conv.coverage(module, "FrameHeader")
+    codec = conv.codec(module, "LidarFrame")
+    template = codec.default()
+    encoding = conv.enum(module, "CloudEncoding")["BIN_INTERLEAVED"]
+    layout = conv.enum(module, "PointLayout")["XYZ_I_R"]
+    seq: Counter[str] = Counter()
+    for n, (sd, channel, path) in enumerate(nusc.sweeps("lidar")):
+        if limit is not None and n >= limit:
+            break
+        try:
+            data = path.read_bytes()
+        except OSError:
+            frames.fail("sweep file unreadable")
+            continue
+        if len(data) % LIDAR_POINT.size:
+            frames.fail(f"sweep size not a multiple of the {LIDAR_POINT.size}-byte x,y,z,i,r record")
+            continue
+        _, average, percent = lidar_stats(data)
+        t_start = int(sd["timestamp"])
+        header = {
+            "stream_id": channel,
+            "frame_seq": seq[channel],
+            "t_start": stamp(t_start),
+            "t_end": stamp(t_start + round(1e6 / LIDAR_RATE_HZ)),
+            "blobs": [{"blob_id": sd["token"], "role": "cloud", "checksum": hashlib.sha256(data).hexdigest()}],
+        }
+        mapped = {
+            "stream_id": channel,
+            "frame_seq": seq[channel],
+            "hdr": {**template["hdr"], **header},
+            "encoding": encoding,
+            "layout": layout,
+            "has_per_point_timestamps": False,
+            "has_average_range_m": True,
+            "average_range_m": average,
+            "has_percent_valid": True,
+            "percent_valid": percent,
+        }
+        seq[channel] += 1
+        if encode(codec, {**template, **mapped}, frames):
+            frames.add(mapped)
+            headers.add(header)
+    return [frames, headers]
+
+
+def validate_annotations(nusc: NuScenes, conv: Converter, limit: int | None = None) -> list[Coverage]:
+    """Every sample_annotation -> Detection3D, grouped per sample into Detection3DSet.
+
+    A set is closed when the sample token changes, so a table that is not
+    ordered by sample yields more, smaller sets; only the set count differs.
+    """
+    module = "spatial.semantics"
+    sets, dets = conv.coverage(module, "Detection3DSet"), conv.coverage(module, "Detection3D")
+    codec = conv.codec(module, "Detection3DSet")
+    set_template, det_template = codec.default(), conv.codec(module, "Detection3D").default()
+    # nuScenes "global" is a map-aligned, right-handed, z-up frame; FrameRef
+    # carries the convention from v1.6 on.
+    world = {**set_template["frame_ref"], "uuid": "global", "fqn": "map"}
+    if "has_coord_convention" in world:
+        world.update(has_coord_convention=True, coord_convention=conv.enum(module, "CoordConvention")["ENU"])
+
+    category = nusc.index("category", "name")
+    instance = {token: category.get(c) for token, c in nusc.index("instance", "category_token").items()}
+    attribute = nusc.index("attribute", "name")
+    visibility = {}
+    for token, level in nusc.index("visibility", "level").items():
+        lo, _, hi = str(level).lstrip("v").partition("-")
+        visibility[token] = (float(lo) + float(hi)) / 200.0   # bin midpoint, e.g. v40-60 -> 0.5
+    sample_time = nusc.index("sample", "timestamp")
+
+    def detection(ann: dict) -> dict:
+        w, l, h = ann["size"]                      # nuScenes (w, l, h) -> SpatialDDS (w, h, l)
+        qw, qx, qy, qz = ann["rotation"]           # nuScenes (w, x, y, z) -> (x, y, z, w)
+        class_id = instance.get(ann["instance_token"])
+        if class_id is None:
+            raise IngestError("instance has no category")
+        mapped = {
+            "det_id": ann["token"],
+            "frame_ref": world,
+            "class_id": class_id,
+            "score": 1.0,
+            "center": list(ann["translation"]),
+            "size": [w, h, l],
+            "q": [qx, qy, qz, qw],
+            "has_track_id": True,
+            "track_id": ann["instance_token"],
+            "stamp": stamp(sample_time[ann["sample_token"]]),
+            "source_id": SOURCE_ID,
+        }
+        names = [attribute[t] for t in ann.get("attribute_tokens", ())]
+        if names:
+            mapped["has_attributes"] = True
+            mapped["attributes"] = [{"namespace": "nuscenes.attribute", "json": json.dumps({"name": a})}
+                                    for a in names]
+        if ann.get("visibility_token") in visibility:
+            mapped["has_visibility"] = True
+            mapped["visibility"] = visibility[ann["visibility_token"]]
+        if "num_lidar_pts" in ann and "num_radar_pts" in ann:
+            mapped["has_num_pts"] = True
+            mapped["num_lidar_pts"] = ann["num_lidar_pts"]
+            mapped["num_radar_pts"] = ann["num_radar_pts"]
+        return mapped
+
+    def close(sample: str, batch: list[dict]) -> None:
+        mapped = {"set_id": sample, "frame_ref": world, "dets": batch,
+                  "stamp": stamp(sample_time[sample]), "source_id": SOURCE_ID}
+        if encode(codec, {**set_template, **mapped}, sets):
+            sets.add(mapped)
+
+    current, batch = None, []
+    for n, ann in enumerate(nusc.table("sample_annotation")):
+        if limit is not None and n >= limit:
+            break
+        try:
+            mapped = detection(ann)
+        except (KeyError, ValueError, TypeError) as exc:
+            dets.fail(f"missing {exc.args[0]}" if isinstance(exc, KeyError) else str(exc))
+            continue
+        if ann["sample_token"] != current:
+            if batch:
+                close(current, batch)
+            current, batch = ann["sample_token"], []
+        dets.add(mapped)
+        batch.append({**det_template, **mapped})
+    if batch:
+        close(current, batch)
+    return [sets, dets]
+
+
+VALIDATORS = {"radar": validate_radar, "lidar": validate_lidar, "annotations": validate_annotations}
+
+
+def validate(dataroot: Path, nusc_version: str = DEFAULT_NUSC_VERSION, idl_version: str = "1.7",
+             kinds=KINDS, limit: int | None = None) -> list[Coverage]:
+    """Coverage of every target type of the given kinds, in KINDS order."""
+    nusc, conv = NuScenes(dataroot, nusc_version), Converter(idl_version)
+    return [c for kind in KINDS if kind in kinds for c in VALIDATORS[kind](nusc, conv, limit)]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic fixture
+# ---------------------------------------------------------------------------
+
+RADAR_PCD_FIELDS = ("x y z dyn_prop id rcs vx vy vx_comp vy_comp is_quality_valid ambig_state "
+                    "x_rms y_rms invalid_state pdh0 vx_rms vy_rms").split()
+RADAR_PCD_SIZE = [4, 4, 4, 1, 2, 4, 4, 4, 4, 4, 1, 1, 1, 1, 1, 1, 1, 1]
+RADAR_PCD_TYPE = list("FFFIIFFFFFIIIIIIII")
+
+
+def write_fixture(root: Path, version: str = DEFAULT_NUSC_VERSION) -> Path:
+    """A two-sample nuScenes-format tree under root: one radar and one lidar sweep per sample."""
+    root = Path(root)
+    tables = root / version
+    for sub in (tables, root / "samples" / "RADAR_FRONT", root / "samples" / "LIDAR_TOP"):
+        sub.mkdir(parents=True, exist_ok=True)
+
+    def dump(name: str, rows: list[dict]) -> None:
+        (tables / f"{name}.json").write_text(json.dumps(rows, indent=0), encoding="utf-8")
+
+    dump("sensor", [{"token": "s-radar", "channel": "RADAR_FRONT", "modality": "radar"},
+                    {"token": "s-lidar", "channel": "LIDAR_TOP", "modality": "lidar"}])
+    dump("calibrated_sensor", [{"token": "cs-radar", "sensor_token": "s-radar"},
+                               {"token": "cs-lidar", "sensor_token": "s-lidar"}])
+    dump("category", [{"token": "c-car", "name": "vehicle.car"}])
+    dump("instance", [{"token": "i-1", "category_token": "c-car"}])
+    dump("attribute", [{"token": "a-moving", "name": "vehicle.moving"}])
+    dump("visibility", [{"token": "4", "level": "v80-100"}])
+    samples = [{"token": f"sample-{i}", "timestamp": 1532402927647951 + i * 500000} for i in range(2)]
+    dump("sample", samples)
+
+    record = struct.Struct("<" + "".join(PCD_TYPES[(t, s)] for t, s in zip(RADAR_PCD_TYPE, RADAR_PCD_SIZE)))
+    header = "\n".join([
+        "# .PCD v0.7 - Point Cloud Data file format", "VERSION 0.7",
+        "FIELDS " + " ".join(RADAR_PCD_FIELDS),
+        "SIZE " + " ".join(map(str, RADAR_PCD_SIZE)),
+        "TYPE " + " ".join(RADAR_PCD_TYPE),
+        "COUNT " + " ".join("1" * len(RADAR_PCD_FIELDS)),
+        "WIDTH 3", "HEIGHT 1", "VIEWPOINT 0 0 0 1 0 0 0", "POINTS 3", "DATA binary", "",
+    ]).encode("ascii")
+    sample_data, annotations = [], []
+    for i, s in enumerate(samples):
+        radar = f"samples/RADAR_FRONT/radar-{i}.pcd"
+        points = [record.pack(10.0 + k, 0.5 * k, 0.0, dyn, k, 5.0, -1.0, 0.2 * (k - 1), 0.1, 0.0, 1, 3,
+                              3, 3, 0, 1, 0, 0)
+                  for k, dyn in enumerate((0, 1, 6))]
+        (root / radar).write_bytes(header + b"".join(points))
+        lidar = f"samples/LIDAR_TOP/lidar-{i}.pcd.bin"
+        (root / lidar).write_bytes(b"".join(LIDAR_POINT.pack(1.0 + k, 2.0, -1.5, 30.0, k % 32)
+                                            for k in range(64)))
+        for modality, filename in (("radar", radar), ("lidar", lidar)):
+            sample_data.append({"token": f"sd-{modality}-{i}", "sample_token": s["token"],
+                                "calibrated_sensor_token": f"cs-{modality}", "timestamp": s["timestamp"],
+                                "fileformat": "pcd", "is_key_frame": True, "filename": filename})
+        annotations.append({"token": f"ann-{i}", "sample_token": s["token"], "instance_token": "i-1",
+                            "visibility_token": "4", "attribute_tokens": ["a-moving"],
+                            "translation": [373.2, 1130.4, 0.8], "size": [1.7, 4.6, 1.4],
+                            "rotation": [0.7071, 0.0, 0.0, 0.7071], "num_lidar_pts": 1234, "num_radar_pts": 5})
+    dump("sample_data", sample_data)
+    dump("sample_annotation", annotations)
+    return root
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("dataroot", type=Path, nargs="?", help="nuScenes dataroot (holds <version>/ and samples/)")
+    parser.add_argument("--nusc-version", default=DEFAULT_NUSC_VERSION, help="table directory (default: v1.0-mini)")
+    parser.add_argument("--idl-version", default="1.7", help="idl/v<ver> tree (default: 1.7)")
+    parser.add_argument("--only", nargs="+", choices=KINDS, default=KINDS, help="record kinds to convert")
+    parser.add_argument("--limit", type=int, default=None, help="records of each kind to convert")
+    parser.add_argument("--json", action="store_true", help="print the coverage as JSON")
+    parser.add_argument("--write-fixture", type=Path, metavar="DIR", help="write a tiny synthetic dataset and exit")
+    args = parser.parse_args(argv)
+
+    if args.write_fixture:
+        print(write_fixture(args.write_fixture, args.nusc_version))
+        return 0
+    if args.dataroot is None:
+        parser.error("DATAROOT is required")
+    try:
+        coverage = validate(args.dataroot, args.nusc_version, args.idl_version, args.only, args.limit)
+    except (FileNotFoundError, KeyError) as exc:
+        print(f"error: {exc.args[0]}", file=sys.stderr)
+        return 2
+    except ValueError as exc:  # IngestError, IdlError, XcdrError
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps([c.to_dict() for c in coverage], indent=2))
+    else:
+        for c in coverage:
+            print(f"{c.type_name}: {c.summary()}")
+    return 1 if any(c.failed for c in coverage) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,45 +1,110 @@
 #!/usr/bin/env python3
-"""Generate MkDocs-friendly copies of the spec with includes expanded."""
+"""Generate MkDocs-friendly copies of the spec with includes expanded.
+
+mkdocs_docs/ is synchronised rather than rebuilt: an output is only written
+when its bytes differ from what is already there, static assets are hard-linked
+(or reflinked, or copied as a last resort) when they are not already identical,
+and outputs whose source disappeared are removed afterwards. Unchanged files
+keep their mtimes, so `mkdocs serve`/`build --dirty` only re-render what
+changed. --clean wipes the tree first.
+
+With --watch the tree is built once (without wiping it) and then kept current:
+sections/, idl/, manifests/, docs_static/ and the top-level SpatialDDS-*.md
+files are watched (inotify, or polling where unavailable), and each change
+regenerates only the outputs whose source or included files changed, found
+through a reverse map from included file to dependent sources. Section edits
+also re-assemble the affected SpatialDDS-<ver>-full.md via spec_build.py.
+"""
 
 from __future__ import annotations
 
+import argparse
+import os
 import re
 import shutil
+import sys
+import time
 from pathlib import Path
 
+import spec_build
+from fs_watch import make_watcher
+from spec_includes import resolve_includes
+
 ROOT = Path(__file__).resolve().parents[1]
 SECTIONS_SRC = ROOT / "sections"
 DOCS_DST = ROOT / "mkdocs_docs"
 STATIC_SRC = ROOT / "docs_static"
 
-INCLUDE_RE = re.compile(r"{{include:([^}]+)}}")
-
-
-def resolve_includes(text: str) -> str:
-    """Inline {{include:path}} blocks with file contents."""
-
-    def replacer(match: re.Match[str]) -> str:
-        rel_path = match.group(1).strip()
-        target = ROOT / rel_path
-        if not target.exists():
-            raise SystemExit(f"Included file not found: {rel_path}")
-        return target.read_text(encoding="utf-8")
-
-    return INCLUDE_RE.sub(replacer, text)
+FULL_DOC_RE = re.compile(r"SpatialDDS-([0-9]+\.[0-9]+)-full\.md")
+MAIN_DOC_RE = re.compile(r"SpatialDDS-([0-9]+\.[0-9]+)\.md")
 
 
-def write_processed(src: Path, dest: Path, *, rewrite_version: str | None = None) -> None:
+def write_processed(src: Path, dest: Path, *, rewrite_version: str | None = None) -> list[str]:
+    """Write src to dest with includes expanded; return the included paths."""
+    deps: list[str] = []
     text = src.read_text(encoding="utf-8")
-    text = resolve_includes(text)
+    text = resolve_includes(text, root=ROOT, source=str(src.relative_to(ROOT)), deps=deps)
 
     if rewrite_version:
         token = f"sections/v{rewrite_version}/"
         text = text.replace(token, f"v{rewrite_version}/")
 
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_text(text, encoding="utf-8")
-    rel = dest.relative_to(ROOT)
-    print(f"Wrote {rel}")
+    if write_if_changed(dest, text.encode("utf-8")):
+        print(f"Wrote {dest.relative_to(ROOT)}")
+    return deps
+
+
+def write_if_changed(dest: Path, data: bytes) -> bool:
+    """Write data to dest unless it already holds exactly those bytes."""
+    try:
+        if dest.stat().st_size == len(data) and dest.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_bytes(data)
+    return True
+
+
+def _reflink(src: Path, dest: Path) -> None:
+    import fcntl
+
+    FICLONE = 0x40049409
+    with open(src, "rb") as fin, open(dest, "wb") as fout:
+        fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+    shutil.copystat(src, dest)
+
+
+def link_asset(src: Path, dest: Path) -> str | None:
+    """Make dest a hard link (else reflink, else copy) of src.
+
+    Returns how dest was produced, or None when it already matched src.
+    """
+    try:
+        st = dest.stat()
+    except FileNotFoundError:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        if os.path.samefile(src, dest):
+            return None
+        if st.st_size == src.stat().st_size and dest.read_bytes() == src.read_bytes():
+            return None
+
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+        how = "Linked"
+    except OSError:
+        try:
+            if not sys.platform.startswith("linux"):
+                raise OSError("reflink unsupported")
+            _reflink(src, tmp)
+            how = "Reflinked"
+        except OSError:
+            shutil.copy2(src, tmp)
+            how = "Copied"
+    os.replace(tmp, dest)
+    return how
 
 
 def clean_destination() -> None:
@@ -48,57 +113,222 @@ def clean_destination() -> None:
     DOCS_DST.mkdir(parents=True)
 
 
-def copy_static_assets() -> None:
+def remove_stale(expected: set[Path]) -> int:
+    """Delete files under mkdocs_docs/ that no source produced, then empty directories."""
+    removed = 0
+    if not DOCS_DST.exists():
+        return removed
+    for path in sorted(DOCS_DST.rglob("*"), reverse=True):
+        if path.is_dir():
+            if not any(path.iterdir()):
+                path.rmdir()
+        elif path not in expected:
+            path.unlink()
+            print(f"Removed {path.relative_to(ROOT)}")
+            removed += 1
+    return removed
+
+
+def copy_static_assets() -> list[Path]:
     if not STATIC_SRC.exists():
-        return
+        return []
 
+    outputs = []
     for path in STATIC_SRC.rglob("*"):
         if path.is_dir():
             continue
 
         relative = path.relative_to(STATIC_SRC)
         dest = DOCS_DST / relative
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(path, dest)
-        rel = dest.relative_to(ROOT)
-        print(f"Copied {rel}")
+        how = link_asset(path, dest)
+        if how:
+            print(f"{how} {dest.relative_to(ROOT)}")
+        outputs.append(dest)
+    return outputs
 
 
-def main() -> None:
-    if not SECTIONS_SRC.exists():
-        raise SystemExit("sections/ directory not found")
+def discover_versions() -> list[str]:
+    return [
+        entry.name.removeprefix("v")
+        for entry in sorted(SECTIONS_SRC.iterdir())
+        if entry.is_dir() and entry.name.startswith("v")
+    ]
+
 
-    clean_destination()
+def prepare_shared() -> list[Path]:
+    """Write the outputs not owned by any single version (index, static assets).
 
+    Returns every output path, written or already current.
+    """
+    outputs = []
     index_src = SECTIONS_SRC / "index.md"
     if index_src.exists():
         write_processed(index_src, DOCS_DST / "index.md")
+        outputs.append(DOCS_DST / "index.md")
 
-    versions: list[str] = []
+    return outputs + copy_static_assets()
 
-    for entry in sorted(SECTIONS_SRC.iterdir()):
-        if not entry.is_dir() or not entry.name.startswith("v"):
-            continue
-        version = entry.name.removeprefix("v")
-        versions.append(version)
 
-        for md_path in sorted(entry.glob("*.md")):
-            relative = entry.name + "/" + md_path.name
-            dest = DOCS_DST / relative
-            write_processed(md_path, dest)
+def prepare_version(version: str) -> list[Path]:
+    """Write mkdocs_docs/v<ver>/ and the processed SpatialDDS-<ver>-full.md.
+
+    Returns every output path, written or already current.
+    """
+    outputs = []
+    entry = SECTIONS_SRC / f"v{version}"
+    for md_path in sorted(entry.glob("*.md")):
+        relative = entry.name + "/" + md_path.name
+        dest = DOCS_DST / relative
+        write_processed(md_path, dest)
+        outputs.append(dest)
+
+    src = ROOT / f"SpatialDDS-{version}-full.md"
+    if not src.exists():
+        print(f"Skipping SpatialDDS-{version}-full.md (source missing)")
+        return outputs
+    dest = DOCS_DST / f"SpatialDDS-{version}-full.md"
+    write_processed(src, dest, rewrite_version=version)
+    outputs.append(dest)
+    return outputs
+
+
+def output_for(src: Path) -> tuple[Path, str | None] | None:
+    """The mkdocs_docs/ path generated from src and its rewrite version, if any."""
+    try:
+        rel = src.relative_to(ROOT)
+    except ValueError:
+        return None
+    parts = rel.parts
+    if parts[0] == "sections" and src.suffix == ".md":
+        if parts[1:] == ("index.md",):
+            return DOCS_DST / "index.md", None
+        if len(parts) == 3 and parts[1].startswith("v"):
+            return DOCS_DST / parts[1] / parts[2], None
+    elif parts[0] == STATIC_SRC.name:
+        return DOCS_DST / src.relative_to(STATIC_SRC), None
+    elif len(parts) == 1 and (m := FULL_DOC_RE.fullmatch(rel.name)):
+        return DOCS_DST / rel.name, m.group(1)
+    return None
+
+
+class Watcher:
+    """Keeps mkdocs_docs/ current by regenerating only affected outputs."""
+
+    def __init__(self) -> None:
+        self.includes: dict[Path, set[Path]] = {}    # source -> files it includes
+        self.dependents: dict[Path, set[Path]] = {}  # included file -> sources
+
+    def record(self, src: Path, deps: list[str]) -> None:
+        for dep in self.includes.pop(src, ()):
+            self.dependents[dep].discard(src)
+        self.includes[src] = {ROOT / d for d in deps}
+        for dep in self.includes[src]:
+            self.dependents.setdefault(dep, set()).add(src)
+
+    def sources(self) -> list[Path]:
+        found = [p for p in sorted(SECTIONS_SRC.rglob("*.md")) if output_for(p)]
+        found += sorted(ROOT.glob("SpatialDDS-*-full.md"))
+        if STATIC_SRC.exists():
+            found += sorted(p for p in STATIC_SRC.rglob("*") if p.is_file())
+        return found
+
+    def regenerate(self, src: Path) -> bool:
+        target = output_for(src)
+        if target is None:
+            return False
+        dest, version = target
+        if not src.exists():
+            self.record(src, [])
+            del self.includes[src]
+            if dest.exists():
+                dest.unlink()
+                print(f"Removed {dest.relative_to(ROOT)}")
+            return True
+        if src.is_relative_to(STATIC_SRC):
+            how = link_asset(src, dest)
+            if how:
+                print(f"{how} {dest.relative_to(ROOT)}")
+        else:
+            self.record(src, write_processed(src, dest, rewrite_version=version))
+        return True
+
+    def build(self) -> None:
+        DOCS_DST.mkdir(parents=True, exist_ok=True)
+        expected = set()
+        for src in self.sources():
+            self.regenerate(src)
+            expected.add(output_for(src)[0])
+        remove_stale(expected)
+
+    def assemble_versions(self, changed: set[Path]) -> None:
+        """Re-assemble SpatialDDS-<ver>-full.md for versions whose inputs changed."""
+        versions = set()
+        for path in changed:
+            rel = path.relative_to(ROOT)
+            if (m := MAIN_DOC_RE.fullmatch(rel.name)) and len(rel.parts) == 1:
+                versions.add(m.group(1))
+            for src in {path} | self.dependents.get(path, set()):
+                parts = src.relative_to(ROOT).parts
+                if parts[0] == "sections" and len(parts) == 3 and parts[1].startswith("v"):
+                    versions.add(parts[1].removeprefix("v"))
+        for version in sorted(versions):
+            if (ROOT / f"SpatialDDS-{version}.md").is_file():
+                print(spec_build.describe(version, *spec_build.assemble(version)))
+
+    def run(self) -> None:
+        started = time.perf_counter()
+        self.build()
+        print(f"Built {DOCS_DST.relative_to(ROOT)}/ in {(time.perf_counter() - started) * 1000:.0f} ms")
+        watcher = make_watcher(
+            [SECTIONS_SRC, ROOT / "idl", ROOT / "manifests", STATIC_SRC],
+            [(ROOT, "SpatialDDS-*.md")],
+        )
+        print(f"Watching for changes ({type(watcher).__name__}); Ctrl-C to stop.")
+        try:
+            while True:
+                changed = watcher.changes()
+                if not changed:
+                    continue
+                started = time.perf_counter()
+                affected = set(changed)
+                for path in changed:
+                    affected |= self.dependents.get(path, set())
+                count = 0
+                try:
+                    for src in sorted(affected):
+                        count += self.regenerate(src)
+                    self.assemble_versions(changed)
+                except SystemExit as exc:  # e.g. a missing include; keep watching
+                    print(f"Error: {exc}")
+                print(f"Regenerated {count} output(s) in {(time.perf_counter() - started) * 1000:.0f} ms")
+        except KeyboardInterrupt:
+            pass
+
 
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate MkDocs-friendly copies of the spec.")
+    parser.add_argument("--watch", action="store_true", help="keep mkdocs_docs/ current as sources change")
+    parser.add_argument("--clean", action="store_true", help="wipe mkdocs_docs/ before generating")
+    args = parser.parse_args(argv)
+
+    if not SECTIONS_SRC.exists():
+        raise SystemExit("sections/ directory not found")
+
+    versions = discover_versions()
     if not versions:
         raise SystemExit("No versioned section directories found under sections/.")
 
-    for version in versions:
-        src = ROOT / f"SpatialDDS-{version}-full.md"
-        if not src.exists():
-            print(f"Skipping SpatialDDS-{version}-full.md (source missing)")
-            continue
-        dest = DOCS_DST / f"SpatialDDS-{version}-full.md"
-        write_processed(src, dest, rewrite_version=version)
+    if args.clean:
+        clean_destination()
+    if args.watch:
+        Watcher().run()
+        return
 
-    copy_static_assets()
+    DOCS_DST.mkdir(parents=True, exist_ok=True)
+    expected = set(prepare_shared())
+    for version in versions:
+        expected.update(prepare_version(version))
+    remove_stale(expected)
 
 
 if __name__ == "__main__":
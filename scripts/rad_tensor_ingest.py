@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""Ingest raw radar cubes as RadTensorMeta, RadTensorFrame and BlobChunk samples.
+
+The DeepSense 6G radar records one raw FMCW I/Q cube per frame
+([Rx, fast_time, slow_time], complex float32). RadTensorIngest turns local
+.npy or .mat cubes into the samples a recorder publishes for them
+(spatial.sensing.rad, payload_kind DENSE_TILES):
+
+  RadTensorMeta     once per stream: layout, axes, voxel_type, antenna and
+                    waveform parameters, codec and tile_size[4]
+  BlobChunk ...     each tile's compressed bytes, split into <= 256 KiB chunks
+                    with a CRC32 over each chunk's data
+  RadTensorFrame    per frame, after its chunks: FrameHeader.blobs[] holds
+                    one BlobRef per tile
+
+A cube is cut into tiles of tile_size[4] samples (unused dimensions are 1;
+tiles at the far edge of an axis are smaller). Tile (i, j, k, l) of the tile
+grid is one blob with role "tile/i,j,k,l", holding the tile's samples in C
+order, compressed with the selected Codec, and its BlobRef.checksum is the
+SHA-256 of the compressed bytes. A frame may have at most SZ_SMALL (256)
+tiles. An array with one more dimension than the layout has axes is a stack
+of frames along its first axis.
+
+Tiling and compression run on a process pool. .npy input is memory-mapped:
+workers map the file themselves and read only their tile's pages, so the
+parent never reads or copies the cube. .mat input (scipy.io.loadmat, MATLAB
+v5) is loaded whole; MATLAB keeps real and imaginary parts in separate
+planes, so a complex cube cannot be mapped as CF32. The parent cuts its
+tiles and each worker receives only its own tile.
+
+Codecs: CODEC_NONE, GZIP (RFC 1952 gzip members, mtime 0 so the bytes and
+checksums are reproducible), LZ4 (lz4 frames, the lz4 package) and ZSTD
+(zstd frames, the zstandard package). LZ4 and ZSTD are optional; selecting
+one that is not installed raises IngestError.
+
+Usage: rad_tensor_ingest.py [--codec LZ4|ZSTD|GZIP|CODEC_NONE] [--level N] [--tile-size 4 64 32 1]
+                            [--layout CH_FAST_SLOW] [-j N] [--verify] [--idl-version 1.7] CUBE.npy|CUBE.mat ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # LZ4 is optional
+    lz4_frame = None
+try:
+    import zstandard
+except ImportError:  # ZSTD is optional
+    zstandard = None
+
+CODECS = ("CODEC_NONE", "LZ4", "ZSTD", "GZIP")
+CHUNK_BYTES = 262144          # BlobChunk.data bound
+MAX_TILES = 256               # FrameHeader.blobs bound (SZ_SMALL)
+# First bytes of a payload written with each compressing codec.
+CODEC_MAGIC = {"GZIP": b"\x1f\x8b", "LZ4": b"\x04\x22\x4d\x18", "ZSTD": b"\x28\xb5\x2f\xfd"}
+
+# Axis names per RadTensorLayout (CUSTOM is not produced here).
+LAYOUT_AXES = {
+    "RA_D": ("range", "azimuth", "doppler"),
+    "R_AZ_EL_D": ("range", "azimuth", "elevation", "doppler"),
+    "CH_FAST_SLOW": ("channel", "fast_time", "slow_time"),
+    "CH_R_D": ("channel", "range", "doppler"),
+}
+AXIS_UNITS = {"channel": "index", "fast_time": "sample", "slow_time": "chirp",
+              "range": "bin", "azimuth": "bin", "elevation": "bin", "doppler": "bin"}
+
+# numpy dtype -> (SampleType, dtype the tile is written as). complex128 is
+# narrowed tile by tile, so the cube itself is never converted.
+SAMPLE_TYPES = {
+    np.dtype(np.complex64): ("CF32", np.dtype("<c8")),
+    np.dtype(np.complex128): ("CF32", np.dtype("<c8")),
+    np.dtype(np.float16): ("F16_MAG", np.dtype("<f2")),
+    np.dtype(np.uint8): ("U8_MAG", np.dtype("u1")),
+}
+
+
+class IngestError(ValueError):
+    """A cube, tiling or codec that cannot be ingested."""
+
+
+@dataclass
+class RadarConfig:
+    """Static description of the radar, for RadTensorMeta. Defaults: DeepSense 6G testbed radar."""
+    sensor_type: str = "MEDIUM_RANGE"
+    num_tx: int = 3
+    num_rx: int = 4
+    bandwidth_hz: float = 4.0e9
+    center_freq_hz: float = 78.5e9
+    chirp_duration_s: float = 0.0        # not published for the DeepSense testbeds
+    samples_per_chirp: int = 256
+    chirps_per_frame: int = 128
+    nominal_rate_hz: float = 10.0
+    physical_meaning: str = "raw FMCW I/Q"
+    frame_fqn: str = "ego/radar"
+
+
+@dataclass
+class IngestStats:
+    frames: int = 0
+    tiles: int = 0
+    chunks: int = 0
+    raw_bytes: int = 0
+    payload_bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        return self.raw_bytes / self.payload_bytes if self.payload_bytes else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Codecs
+# ---------------------------------------------------------------------------
+
+def compress(codec: str, data, level: int | None = None) -> bytes:
+    """data compressed with one of CODECS."""
+    if codec == "CODEC_NONE":
+        return bytes(data)
+    if codec == "GZIP":
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    if codec == "LZ4":
+        return lz4_frame.compress(data, compression_level=0 if level is None else level)
+    if codec == "ZSTD":
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    raise IngestError(f"unknown codec {codec} (known: {', '.join(CODECS)})")
+
+
+def decompress(codec: str, data) -> bytes:
+    if codec == "CODEC_NONE":
+        return bytes(data)
+    if codec == "GZIP":
+        return gzip.decompress(data)
+    if codec == "LZ4":
+        return lz4_frame.decompress(data)
+    if codec == "ZSTD":
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise IngestError(f"unknown codec {codec} (known: {', '.join(CODECS)})")
+
+
+def available_codecs() -> list[str]:
+    missing = {"LZ4": lz4_frame is None, "ZSTD": zstandard is None}
+    return [c for c in CODECS if not missing.get(c)]
+
+
+def check_codec(codec: str) -> None:
+    if codec not in CODECS:
+        raise IngestError(f"unknown codec {codec} (known: {', '.join(CODECS)})")
+    if codec not in available_codecs():
+        package = {"LZ4": "lz4", "ZSTD": "zstandard"}[codec]
+        raise IngestError(f"codec {codec} needs the {package} package (pip install {package})")
+
+
+# ---------------------------------------------------------------------------
+# Sources and tiles
+# ---------------------------------------------------------------------------
+
+def open_cube(path: Path, variable: str | None = None) -> np.ndarray:
+    """The cube(s) in a .npy (memory-mapped) or .mat (loaded) file."""
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    if path.suffix == ".mat":
+        try:
+            from scipy.io import loadmat
+        except ImportError:
+            raise IngestError(f"{path.name}: reading .mat files needs scipy (pip install scipy)") from None
+        try:
+            contents = loadmat(path)
+        except NotImplementedError:  # MATLAB v7.3 is HDF5
+            raise IngestError(f"{path.name}: MATLAB v7.3 (HDF5) files are not supported; save with -v7") from None
+        names = [k for k in contents if not k.startswith("__")]
+        if variable is None:
+            if len(names) != 1:
+                raise IngestError(f"{path.name}: holds {', '.join(names) or 'no variables'}; name one")
+            variable = names[0]
+        if variable not in contents:
+            raise IngestError(f"{path.name}: no variable {variable}")
+        return np.asarray(contents[variable])
+    raise IngestError(f"{path.name}: expected a .npy or .mat file")
+
+
+def tile_grid(shape: tuple[int, ...], tile_size: tuple[int, int, int, int]) -> list[tuple[tuple, tuple]]:
+    """(grid index, slices) of every tile of a cube of up to 4 dimensions, in C order."""
+    if len(tile_size) != 4 or any(int(t) < 1 for t in tile_size):
+        raise IngestError(f"tile_size must be 4 positive integers, got {list(tile_size)}")
+    if any(int(t) != 1 for t in tile_size[len(shape):]):
+        raise IngestError(f"tile_size {list(tile_size)}: dimensions beyond the cube's {len(shape)} must be 1")
+    counts = [-(-n // t) for n, t in zip(shape, tile_size)]
+    return [(index + (0,) * (4 - len(shape)),
+             tuple(slice(i * t, min((i + 1) * t, n)) for i, t, n in zip(index, tile_size, shape)))
+            for index in product(*(range(c) for c in counts))]
+
+
+_mapped: dict[str, np.ndarray] = {}   # per worker process: path -> memory map
+
+
+def encode_tile(job: tuple) -> tuple[int, int, int, bytes, str]:
+    """Worker: slice, narrow and compress one tile.
+
+    job is (source, frame, slices, dtype, codec, level), where source is a
+    .npy path (mapped once per process) or the tile itself, already cut out
+    by the parent (frame None, slices Ellipsis). Returns the raw size, the
+    count of finite samples, the sample count, the payload and its SHA-256.
+    """
+    source, frame, slices, dtype, codec, level = job
+    if isinstance(source, str):
+        cube = _mapped.get(source)
+        if cube is None:
+            cube = _mapped[source] = np.load(source, mmap_mode="r")
+    else:
+        cube = source
+    if frame is not None:
+        cube = cube[frame]
+    tile = np.ascontiguousarray(cube[slices], dtype=dtype)   # copies only a strided or narrowed tile
+    finite = int(np.isfinite(tile).sum()) if tile.dtype.kind in "fc" else tile.size
+    payload = compress(codec, memoryview(tile).cast("B"), level)
+    return tile.nbytes, finite, tile.size, payload, hashlib.sha256(payload).hexdigest()
+
+
+def blob_chunks(blob_id: str, payload: bytes, template: dict | None = None) -> list[dict]:
+    """BlobChunk samples carrying payload.
+
+    template is the version's BlobChunk default(); v1.5 and earlier also
+    flag the final chunk with `last`.
+    """
+    n = max(1, -(-len(payload) // CHUNK_BYTES))
+    chunks = []
+    for index in range(n):
+        data = payload[index * CHUNK_BYTES:(index + 1) * CHUNK_BYTES]
+        chunk = {**(template or {}), "blob_id": blob_id, "index": index, "total_chunks": n,
+                 "crc32": zlib.crc32(data), "data": data}
+        if "last" in chunk:
+            chunk["last"] = index == n - 1
+        chunks.append(chunk)
+    return chunks
+
+
+def reassemble(chunks: list[dict]) -> dict[str, bytes]:
+    """blob_id -> payload from a complete set of BlobChunks; IngestError on a gap or bad CRC."""
+    blobs: dict[str, dict[int, bytes]] = {}
+    totals: dict[str, int] = {}
+    for c in chunks:
+        if zlib.crc32(c["data"]) != c["crc32"]:
+            raise IngestError(f"{c['blob_id']}#{c['index']}: CRC32 mismatch")
+        blobs.setdefault(c["blob_id"], {})[c["index"]] = bytes(c["data"])
+        totals[c["blob_id"]] = c["total_chunks"]
+    out = {}
+    for blob_id, parts in blobs.items():
+        if sorted(parts) != list(range(totals[blob_id])):
+            raise IngestError(f"{blob_id}: {len(parts)} of {totals[blob_id]} chunks")
+        out[blob_id] = b"".join(parts[i] for i in range(totals[blob_id]))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Ingest
+# ---------------------------------------------------------------------------
+
+def stamp(seconds: float) -> dict:
+    sec = int(seconds // 1)
+    return {"sec": sec, "nanosec": min(int(round((seconds - sec) * 1e9)), 999_999_999)}
+
+
+class RadTensorIngest:
+    """Samples for one radar tensor stream, built from cube files."""
+
+    def __init__(self, stream_id: str, config: RadarConfig | None = None, *, layout: str = "CH_FAST_SLOW",
+                 tile_size=(4, 64, 32, 1), codec: str = "LZ4", level: int | None = None,
+                 idl_version: str = "1.7", workers: int | None = None) -> None:
+        from type_registry import TypeRegistry
+
+        if layout not in LAYOUT_AXES:
+            raise IngestError(f"layout {layout} not supported (known: {', '.join(LAYOUT_AXES)})")
+        check_codec(codec)
+        self.stream_id = stream_id
+        self.config = config or RadarConfig()
+        self.layout = layout
+        self.tile_size = tuple(int(t) for t in tile_size)
+        self.codec = codec
+        self.level = level
+        self.workers = workers
+        self.registry = TypeRegistry(idl_version, examples=False)
+        self.stats = IngestStats()
+        self.shape = self.dtype = None       # set by the first frame
+        self._meta = None
+        self._seq = 0
+
+    def codec_of(self, type_name: str):
+        """xcdr2 codec of one of the emitted types."""
+        module = "spatial.core" if type_name == "BlobChunk" else "spatial.sensing.rad"
+        return self.registry.codec(module, type_name)
+
+    def _enum(self, name: str) -> dict[str, int]:
+        from idl_parser import Enum
+
+        schema = self.registry.profile("spatial.sensing.rad").schema
+        for scoped, d in schema.decls.items():
+            if scoped.rsplit("::", 1)[-1] == name and isinstance(d.node, Enum):
+                return d.node.values()
+        raise IngestError(f"{name} is not declared in v{self.registry.version}")
+
+    def meta(self, shape: tuple[int, ...], dtype) -> dict:
+        """RadTensorMeta for cubes of this shape and dtype."""
+        try:
+            sample_type = SAMPLE_TYPES[np.dtype(dtype)][0]
+        except KeyError:
+            raise IngestError(f"dtype {np.dtype(dtype)} has no SampleType "
+                              f"(supported: {', '.join(map(str, SAMPLE_TYPES))})") from None
+        axes = LAYOUT_AXES[self.layout]
+        linspace = self._enum("AxisEncoding")["AXIS_LINSPACE"]
+        c = self.config
+        template = self.codec_of("RadTensorMeta").default()
+        module_id = self.registry.module_id("spatial.sensing.rad")
+        return {
+            **template,
+            "stream_id": self.stream_id,
+            "base": {**template["base"], "stream_id": self.stream_id,
+                     "frame_ref": {**template["base"]["frame_ref"], "uuid": self.stream_id, "fqn": c.frame_fqn},
+                     "T_bus_sensor": {"t": [0.0, 0.0, 0.0], "q": [0.0, 0.0, 0.0, 1.0]},
+                     "nominal_rate_hz": c.nominal_rate_hz,
+                     "schema_version": self.registry.module_id("spatial.sensing.common")},
+            "sensor_type": self._enum("RadSensorType")[c.sensor_type],
+            "layout": self._enum("RadTensorLayout")[self.layout],
+            "axes": [{"name": name, "unit": AXIS_UNITS[name],
+                      "spec": (linspace, {"start": 0.0, "step": 1.0, "count": n})}
+                     for name, n in zip(axes, shape)],
+            "voxel_type": self._enum("SampleType")[sample_type],
+            "physical_meaning": c.physical_meaning,
+            "has_antenna_config": True,
+            "num_tx": c.num_tx,
+            "num_rx": c.num_rx,
+            "num_virtual_channels": c.num_tx * c.num_rx,
+            "has_waveform_params": True,
+            "bandwidth_hz": c.bandwidth_hz,
+            "center_freq_hz": c.center_freq_hz,
+            "chirp_duration_s": c.chirp_duration_s,
+            "samples_per_chirp": c.samples_per_chirp,
+            "chirps_per_frame": c.chirps_per_frame,
+            "payload_kind": self._enum("PayloadKind")["DENSE_TILES"],
+            "codec": self._enum("Codec")[self.codec],
+            "tile_size": list(self.tile_size),
+            "schema_version": module_id,
+        }
+
+    def _frames(self, paths, variable):
+        """(source for encode_tile, frame index or None, shape, dtype) of every frame, in order."""
+        ndim = len(LAYOUT_AXES[self.layout])
+        for path in paths:
+            cube = open_cube(path, variable)
+            # A mapped .npy goes to the workers by path; a loaded .mat as the array.
+            source = str(Path(path).resolve()) if isinstance(cube, np.memmap) else cube
+            if cube.ndim == ndim:
+                yield source, None, cube.shape, cube.dtype
+            elif cube.ndim == ndim + 1:
+                for i in range(cube.shape[0]):
+                    yield source, i, cube.shape[1:], cube.dtype
+            else:
+                raise IngestError(f"{Path(path).name}: {cube.ndim}-D array; {self.layout} frames are {ndim}-D")
+
+    def samples(self, paths, *, stamps=None, variable: str | None = None):
+        """(type name, sample) in publish order: RadTensorMeta, then per frame its BlobChunks and RadTensorFrame.
+
+        stamps gives each frame's acquisition time in seconds; by default
+        frames are stamped frame_seq / nominal_rate_hz.
+        """
+        started = time.perf_counter()
+        stamps = iter(stamps) if stamps is not None else None
+        frames = self._frames(paths, variable)
+        pool = ProcessPoolExecutor(self.workers) if self.workers != 1 else None
+        try:
+            for source, index, shape, dtype in frames:
+                if self._meta is None:
+                    self._meta = self.meta(shape, dtype)
+                    self.shape, self.dtype = shape, SAMPLE_TYPES[np.dtype(dtype)][1]
+                    yield "RadTensorMeta", self._meta
+                elif shape != self.shape or SAMPLE_TYPES.get(np.dtype(dtype), (None, None))[1] != self.dtype:
+                    raise IngestError(f"frame {self._seq}: {'×'.join(map(str, shape))} {dtype} does not match "
+                                      f"the stream's {'×'.join(map(str, self.shape))} {self.dtype}")
+                yield from self._frame(pool, source, index, shape,
+                                       next(stamps) if stamps is not None else self._seq / self.config.nominal_rate_hz)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            self.stats.seconds += time.perf_counter() - started
+
+    def _frame(self, pool, source, index, shape, t_start: float):
+        grid = tile_grid(shape, self.tile_size)
+        if len(grid) > MAX_TILES:
+            raise IngestError(f"tile_size {list(self.tile_size)} cuts a {'×'.join(map(str, shape))} cube into "
+                              f"{len(grid)} tiles; FrameHeader.blobs holds at most {MAX_TILES}")
+        if isinstance(source, str):
+            jobs = [(source, index, slices, self.dtype, self.codec, self.level) for _, slices in grid]
+        else:
+            # An in-memory cube would be pickled whole into every job; send each worker its tile only.
+            cube = source if index is None else source[index]
+            jobs = [(np.ascontiguousarray(cube[slices], dtype=self.dtype), None, Ellipsis,
+                     self.dtype, self.codec, self.level) for _, slices in grid]
+        results = pool.map(encode_tile, jobs) if pool is not None else map(encode_tile, jobs)
+        seq = self._seq
+        blobs, finite = [], 0
+        for (grid_index, _), (raw, n_finite, n, payload, digest) in zip(grid, results):
+            blob_id = f"{self.stream_id}/{seq}/{'.'.join(map(str, grid_index))}"
+            chunks = blob_chunks(blob_id, payload, self.codec_of("BlobChunk").default())
+            for chunk in chunks:
+                yield "BlobChunk", chunk
+            blobs.append({"blob_id": blob_id, "role": "tile/" + ",".join(map(str, grid_index)), "checksum": digest})
+            finite += n_finite
+            self.stats.tiles += 1
+            self.stats.chunks += len(chunks)
+            self.stats.raw_bytes += raw
+            self.stats.payload_bytes += len(payload)
+        total = int(np.prod(shape))
+        template = self.codec_of("RadTensorFrame").default()
+        yield "RadTensorFrame", {
+            **template,
+            "stream_id": self.stream_id,
+            "frame_seq": seq,
+            "hdr": {**template["hdr"], "stream_id": self.stream_id, "frame_seq": seq,
+                    "t_start": stamp(t_start), "t_end": stamp(t_start + 1.0 / self.config.nominal_rate_hz),
+                    "blobs": blobs},
+            "payload_kind": self._meta["payload_kind"],
+            "codec": self._meta["codec"],
+            "voxel_type_after_decode": self._meta["voxel_type"],
+            "quality": {**template["quality"], "percent_valid": 100.0 * finite / total if total else 0.0},
+            "proc_chain": "raw",
+        }
+        self._seq += 1
+        self.stats.frames += 1
+
+
+def decode_frame(meta: dict, frame: dict, payloads: dict[str, bytes], codec: str, dtype) -> np.ndarray:
+    """Rebuild a frame's cube from its tiles, as a subscriber would."""
+    shape = tuple(a["spec"][1]["count"] for a in meta["axes"])
+    tile_size = tuple(meta["tile_size"])
+    cube = np.empty(shape, dtype=dtype)
+    by_role = {b["role"]: b for b in frame["hdr"]["blobs"]}
+    for grid_index, slices in tile_grid(shape, tile_size):
+        ref = by_role[f"tile/{','.join(map(str, grid_index))}"]
+        payload = payloads[ref["blob_id"]]
+        if hashlib.sha256(payload).hexdigest() != ref["checksum"]:
+            raise IngestError(f"{ref['blob_id']}: checksum mismatch")
+        region = cube[slices]
+        region[...] = np.frombuffer(decompress(codec, payload), dtype=dtype).reshape(region.shape)
+    return cube
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("cubes", nargs="+", type=Path, help=".npy or .mat radar cubes, one frame or a stack each")
+    parser.add_argument("--stream-id", default="radar/unit1")
+    parser.add_argument("--layout", choices=sorted(LAYOUT_AXES), default="CH_FAST_SLOW")
+    parser.add_argument("--tile-size", type=int, nargs=4, default=[4, 64, 32, 1], metavar="N")
+    parser.add_argument("--codec", choices=CODECS, default=None,
+                        help="payload codec (default: LZ4, else ZSTD, else GZIP, whichever is installed)")
+    parser.add_argument("--level", type=int, default=None, help="compression level (codec default if omitted)")
+    parser.add_argument("--mat-var", default=None, help="variable holding the cube in .mat files")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count; 1 = none)")
+    parser.add_argument("--verify", action="store_true", help="encode every sample and rebuild every frame")
+    parser.add_argument("--idl-version", default="1.7", help="idl/v<ver> tree (default: 1.7)")
+    args = parser.parse_args(argv)
+    if args.codec is None:
+        args.codec = next(c for c in ("LZ4", "ZSTD", "GZIP") if c in available_codecs())
+
+    try:
+        ingest = RadTensorIngest(args.stream_id, layout=args.layout, tile_size=args.tile_size, codec=args.codec,
+                                 level=args.level, idl_version=args.idl_version, workers=args.jobs)
+        codecs = {name: ingest.codec_of(name) for name in ("RadTensorMeta", "RadTensorFrame", "BlobChunk")}
+        sources = ((p, open_cube(p, args.mat_var)) for p in args.cubes) if args.verify else None
+        meta, chunks, wire = None, [], 0
+        current, frame_index = None, 0
+        for type_name, sample in ingest.samples(args.cubes, variable=args.mat_var):
+            if not args.verify:
+                continue
+            wire += len(codecs[type_name].encode(sample))
+            if type_name == "RadTensorMeta":
+                meta = sample
+            elif type_name == "BlobChunk":
+                chunks.append(sample)
+            else:
+                if current is None or frame_index >= (len(current) if current.ndim > len(meta["axes"]) else 1):
+                    current, frame_index = next(sources)[1], 0
+                expected = current[frame_index] if current.ndim > len(meta["axes"]) else current
+                frame_index += 1
+                rebuilt = decode_frame(meta, sample, reassemble(chunks), args.codec, ingest.dtype)
+                if not np.array_equal(rebuilt, expected.astype(ingest.dtype), equal_nan=True):
+                    raise IngestError(f"frame {sample['frame_seq']}: rebuilt cube differs from the input")
+                chunks = []
+    except FileNotFoundError as exc:
+        print(f"error: {exc.filename}: no such file" if exc.filename else f"error: {exc}", file=sys.stderr)
+        return 2
+    except KeyError as exc:  # unknown IDL version
+        print(f"error: {exc.args[0]}", file=sys.stderr)
+        return 2
+    except ValueError as exc:  # IngestError, IdlError, XcdrError
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    s = ingest.stats
+    print(f"{s.frames} frames, {s.tiles} tiles, {s.chunks} chunks; {s.raw_bytes:,} -> {s.payload_bytes:,} bytes "
+          f"({args.codec} {s.ratio:.2f}:1) in {s.seconds:.2f} s ({s.raw_bytes / 1e6 / s.seconds:.0f} MB/s)"
+          if s.seconds else "no frames")
+    if args.verify:
+        print(f"verified: every sample encodes ({wire:,} bytes XCDR2) and every frame rebuilds exactly")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
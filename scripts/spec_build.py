@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Assemble SpatialDDS-<ver>-full.md incrementally from the sections tree.
+
+The full document is the main spec file followed by every section referenced
+from its table of contents, each with `{{include:path}}` placeholders expanded.
+A content-hash manifest under .build-cache/ records the inputs of every chunk
+(source file plus the files it includes) and where that chunk sits in the last
+output, so unchanged chunks are sliced out of the previous output instead of
+being re-read and re-expanded, and the output is only rewritten when its bytes
+would change.
+
+Usage: spec_build.py [--force] [version ...]   (default: every version)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from spec_includes import read_cached, resolve_includes
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = ROOT / ".build-cache"
+MANIFEST_FORMAT = 1
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class FileHashes:
+    """sha256 of repository files, trusting the previous manifest on stat match.
+
+    A file whose (mtime_ns, size) is unchanged since the last build keeps its
+    recorded hash without being read again.
+    """
+
+    def __init__(self, root: Path, previous: dict[str, dict]) -> None:
+        self.root = root
+        self.previous = previous
+        self.current: dict[str, dict] = {}
+
+    def digest(self, rel: str, text: str | None = None) -> str:
+        entry = self.current.get(rel)
+        if entry is not None:
+            return entry["sha256"]
+        path = self.root / rel
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            raise SystemExit(f"Included file not found: {rel}") from None
+        old = self.previous.get(rel)
+        if text is None and old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+            digest = old["sha256"]
+        else:
+            if text is None:
+                text = read_cached(path)
+            digest = sha256_text(text)
+        self.current[rel] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+        return digest
+
+
+def section_order(main_text: str, version: str) -> list[str]:
+    """Section paths (relative to sections/v<ver>/) in table-of-contents order."""
+    pattern = re.compile(rf"\(sections/v{re.escape(version)}/([^\)]+\.md)\)")
+    seen: list[str] = []
+    for match in pattern.finditer(main_text):
+        if match.group(1) not in seen:
+            seen.append(match.group(1))
+    return seen
+
+
+def manifest_path(version: str, cache_dir: Path = CACHE_DIR) -> Path:
+    return cache_dir / f"spec-build-v{version}.json"
+
+
+def load_manifest(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    if data.get("format") != MANIFEST_FORMAT:
+        return {}
+    return data
+
+
+def available_versions(root: Path = ROOT) -> list[str]:
+    """Versions with both a SpatialDDS-<ver>.md entry point and a sections/v<ver>/ tree."""
+    versions = []
+    for entry in (root / "sections").iterdir():
+        if entry.is_dir() and entry.name.startswith("v") and (root / f"SpatialDDS-{entry.name[1:]}.md").is_file():
+            versions.append(entry.name[1:])
+    return sorted(versions, key=lambda v: tuple(int(x) for x in v.split(".")))
+
+
+def assemble(version: str, root: Path = ROOT, *, cache_dir: Path = CACHE_DIR, force: bool = False) -> tuple[str, int, int]:
+    """Bring SpatialDDS-<ver>-full.md up to date.
+
+    Returns (status, expanded, reused) where status is "wrote" or "unchanged"
+    and expanded/reused count the chunks that were re-expanded vs. sliced from
+    the previous output.
+    """
+    main_rel = f"SpatialDDS-{version}.md"
+    out_rel = f"SpatialDDS-{version}-full.md"
+    sections_rel = f"sections/v{version}"
+    if not (root / main_rel).is_file():
+        raise SystemExit(f"Main specification file '{root / main_rel}' not found")
+    if not (root / sections_rel).is_dir():
+        raise SystemExit(f"Sections directory '{root / sections_rel}' not found")
+
+    mpath = manifest_path(version, cache_dir)
+    manifest = {} if force else load_manifest(mpath)
+    hashes = FileHashes(root, manifest.get("files", {}))
+
+    # The previous output is only a valid slice source if it is exactly what
+    # the manifest says was written.
+    out_path = root / out_rel
+    previous_out = None
+    old_output = manifest.get("output")
+    if old_output and out_path.is_file():
+        text = out_path.read_text(encoding="utf-8")
+        if sha256_text(text) == old_output["sha256"]:
+            previous_out = text
+    old_chunks = {c["source"]: c for c in manifest.get("chunks", [])} if previous_out is not None else {}
+
+    main_text = (root / main_rel).read_text(encoding="utf-8")
+    sources = [main_rel]
+    for rel in section_order(main_text, version):
+        path = root / sections_rel / rel
+        if not path.is_file():
+            raise SystemExit(f"Referenced section '{path}' not found")
+        sources.append(f"{sections_rel}/{rel}")
+    if len(sources) == 1:
+        raise SystemExit(f"No sections referenced in the table of contents for version {version}")
+
+    parts: list[str] = []
+    chunks: list[dict] = []
+    offset = 0
+    expanded = reused = 0
+    for index, source in enumerate(sources):
+        if index:
+            parts.append("\n")
+            offset += 1
+        src_hash = hashes.digest(source, main_text if source == main_rel else None)
+        old = old_chunks.get(source)
+        body = None
+        if old and old["sha256"] == src_hash and all(hashes.digest(d) == h for d, h in old["deps"].items()):
+            body = previous_out[old["offset"]:old["offset"] + old["length"]]
+            deps = old["deps"]
+            reused += 1
+        if body is None:
+            text = main_text if source == main_rel else read_cached(root / source)
+            dep_list: list[str] = []
+            body = resolve_includes(text, root=root, source=source, deps=dep_list)
+            deps = {d: hashes.digest(d) for d in dep_list}
+            expanded += 1
+        chunks.append({"source": source, "sha256": src_hash, "deps": deps, "offset": offset, "length": len(body)})
+        parts.append(body)
+        offset += len(body)
+
+    output = "".join(parts)
+    out_hash = sha256_text(output)
+    if previous_out is not None and out_hash == old_output["sha256"]:
+        status = "unchanged"
+    else:
+        out_path.write_text(output, encoding="utf-8")
+        status = "wrote"
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    new_manifest = {
+        "format": MANIFEST_FORMAT,
+        "version": version,
+        "files": hashes.current,
+        "chunks": chunks,
+        "output": {"path": out_rel, "sha256": out_hash},
+    }
+    tmp = mpath.with_suffix(".tmp")
+    tmp.write_text(json.dumps(new_manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, mpath)
+    return status, expanded, reused
+
+
+def describe(version: str, status: str, expanded: int, reused: int) -> str:
+    out_rel = f"SpatialDDS-{version}-full.md"
+    counts = f"({expanded} chunk(s) expanded, {reused} reused)"
+    if status == "wrote":
+        return f"Wrote {out_rel} {counts}"
+    return f"{out_rel} up to date {counts}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("versions", nargs="*", help="spec versions to build (default: all)")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and rebuild from scratch")
+    args = parser.parse_args(argv)
+
+    for version in args.versions or available_versions():
+        print(describe(version, *assemble(version, force=args.force)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
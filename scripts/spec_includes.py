@@ -0,0 +1,66 @@
+"""Shared `{{include:path}}` resolution for the spec build scripts.
+
+spec_build.py (behind build-spec.sh) and prepare_mkdocs.py both expand
+includes through resolve_includes(), so the two outputs cannot disagree on how
+a placeholder is resolved. Included files are read through a small LRU cache
+keyed on (path, mtime_ns, size): the same idl/v<ver>/*.idl file inlined into a
+section and into the full document is read from disk once per process, and an
+edit on disk is picked up because it changes the key. Included files may
+themselves contain placeholders; those are expanded recursively and a cycle
+is reported instead of recursing forever.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+INCLUDE_RE = re.compile(r"{{include:([^}]+)}}")
+
+
+@lru_cache(maxsize=512)
+def _read(path: str, mtime_ns: int, size: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
+def read_cached(path: Path) -> str:
+    """Return the text of path, served from the cache while its stat is unchanged."""
+    st = path.stat()
+    return _read(str(path), st.st_mtime_ns, st.st_size)
+
+
+def resolve_includes(
+    text: str,
+    *,
+    root: Path = ROOT,
+    source: str | None = None,
+    deps: list[str] | None = None,
+    _stack: tuple[str, ...] = (),
+) -> str:
+    """Inline {{include:path}} blocks (paths relative to root), recursively.
+
+    When deps is given, every included path (transitively) is appended to it.
+    source names the file text came from and is only used in error messages.
+    """
+    stack = _stack or ((source,) if source else ())
+
+    def replacer(match: re.Match[str]) -> str:
+        rel_path = match.group(1).strip()
+        if rel_path in stack:
+            chain = " -> ".join((*stack, rel_path))
+            raise SystemExit(f"Include cycle: {chain}")
+        target = root / rel_path
+        if not target.is_file():
+            where = f"{source}: " if source else ""
+            raise SystemExit(f"{where}Included file not found: {rel_path}")
+        if deps is not None:
+            deps.append(rel_path)
+        included = read_cached(target)
+        if "{{include:" not in included:
+            return included
+        return resolve_includes(included, root=root, source=rel_path, deps=deps, _stack=(*stack, rel_path))
+
+    return INCLUDE_RE.sub(replacer, text)
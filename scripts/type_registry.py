@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Lazy registry of SpatialDDS type support, keyed by profile MODULE_ID.
+
+A service that only speaks discovery and core should not pay for parsing and
+compiling rad, lidar, vision or mapping. TypeRegistry maps every MODULE_ID of
+a spec version ("spatial.sensing.rad/1.7") to the IDL file that declares it
+by a text search for the constant, so nothing is parsed up front. A profile
+(its file plus the files it #includes, through the idl_parser AST cache) is
+loaded the first time one of its types is asked for, and each type's XCDR2
+codec (xcdr2.Compiler) is compiled on its first use and kept.
+
+prewarm() loads a chosen set of profiles at service start, optionally
+compiling every struct and union they declare, and stats() reports how long
+each profile took to load and compile. Load times include the profile's
+includes, so core.idl is counted in every profile that includes it.
+
+Importing this module imports neither idl_parser nor xcdr2 (nor NumPy);
+they are imported by the first profile load, so a tool that only lists or
+checks MODULE_IDs stays cheap.
+
+Usage: type_registry.py [--idl-version 1.7] [--no-examples] [--compile] [--json]
+                        [MODULE_ID ...]   (default: every profile)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_VERSION = "1.7"
+MODULE_ID_RE = re.compile(rb'const\s+string\s+MODULE_ID\s*=\s*"([^"]+)"')
+
+
+@dataclass
+class ProfileStats:
+    """Where a profile came from and what loading it has cost so far."""
+    module_id: str
+    path: str
+    load_ms: float = 0.0     # parse (or AST cache read) of the file and its includes
+    compile_ms: float = 0.0  # all codec compilation so far
+    types: int = 0           # codecs compiled so far
+
+
+class Profile:
+    """One loaded profile: its Schema and the codecs compiled from it on demand."""
+
+    def __init__(self, module_id: str, path: Path, include_dir: Path, use_numpy: bool | None) -> None:
+        from idl_parser import Struct, UnionDef, load
+        from xcdr2 import Compiler
+
+        started = time.perf_counter()
+        self.module_id = module_id
+        self.schema = load([path], [include_dir])
+        self.file = self.schema.files[-1].path  # load() lists a file after its includes
+        self.compiler = Compiler(self.schema, use_numpy)
+        self.codecs: dict[str, object] = {}
+        self._constructed = (Struct, UnionDef)
+        self.stats = ProfileStats(module_id, self.file)
+        self.stats.load_ms = (time.perf_counter() - started) * 1000
+
+    def declared(self) -> list[str]:
+        """Scoped names of the structs and unions this profile's own file declares."""
+        return [name for name, d in self.schema.decls.items()
+                if d.file == self.file and isinstance(d.node, self._constructed)]
+
+    def codec(self, name: str):
+        """xcdr2.TypeCodec for a struct or union (scoped, or unambiguous unscoped).
+
+        Types reached through the profile's includes resolve too; codecs for
+        nested types are shared by every type compiled from this profile.
+        """
+        codec = self.codecs.get(name)
+        if codec is None:
+            started = time.perf_counter()
+            codec = self.compiler.compile(name)
+            self.stats.compile_ms += (time.perf_counter() - started) * 1000
+            self.stats.types += codec.name not in self.codecs
+            self.codecs[name] = self.codecs[codec.name] = codec
+        return codec
+
+
+class TypeRegistry:
+    """MODULE_ID -> Profile for one spec version, loading each profile on first use."""
+
+    def __init__(self, version: str = DEFAULT_VERSION, root: Path = ROOT, *, examples: bool = True,
+                 use_numpy: bool | None = None) -> None:
+        self.version = version
+        self.idl_dir = root / "idl" / f"v{version}"
+        self.examples = examples
+        self.use_numpy = use_numpy
+        self._paths: dict[str, Path] | None = None
+        self._profiles: dict[str, Profile] = {}
+
+    def modules(self) -> dict[str, Path]:
+        """MODULE_ID -> IDL file, found by scanning the files' text (nothing is parsed)."""
+        if self._paths is None:
+            if not self.idl_dir.is_dir():
+                raise FileNotFoundError(f"missing directory {self.idl_dir}")
+            paths = sorted(self.idl_dir.glob("*.idl"))
+            if self.examples:
+                paths += sorted((self.idl_dir / "examples").glob("*.idl"))
+            found = {}
+            for path in paths:
+                match = MODULE_ID_RE.search(path.read_bytes())
+                if match:
+                    found.setdefault(match.group(1).decode("utf-8"), path)
+            self._paths = found
+        return self._paths
+
+    def module_id(self, name: str) -> str:
+        """Full MODULE_ID for name.
+
+        A bare "spatial.core" gets the registry's version, or else the version
+        of the tree's one profile of that name (v1.6 still ships
+        spatial.sensing.rad/1.5, say).
+        """
+        module_id = name if "/" in name else f"{name}/{self.version}"
+        if module_id not in self.modules() and "/" not in name:
+            same = [m for m in self.modules() if m.split("/", 1)[0] == name]
+            if len(same) == 1:
+                module_id = same[0]
+        if module_id not in self.modules():
+            raise KeyError(f"{name}: no profile with that MODULE_ID in {self.idl_dir.name} "
+                           f"(known: {', '.join(sorted(self.modules()))})")
+        return module_id
+
+    def __contains__(self, name: str) -> bool:
+        try:
+            self.module_id(name)
+        except KeyError:
+            return False
+        return True
+
+    def profile(self, name: str) -> Profile:
+        """The loaded profile for a MODULE_ID, loading it now if necessary."""
+        module_id = self.module_id(name)
+        profile = self._profiles.get(module_id)
+        if profile is None:
+            profile = self._profiles[module_id] = Profile(
+                module_id, self.modules()[module_id], self.idl_dir, self.use_numpy)
+        return profile
+
+    def codec(self, module_id: str, type_name: str):
+        """xcdr2.TypeCodec for type_name as seen from the profile module_id."""
+        return self.profile(module_id).codec(type_name)
+
+    def prewarm(self, module_ids=None, *, compile: bool = False) -> list[ProfileStats]:
+        """Load the given profiles (default: all), compiling their declared types if asked."""
+        stats = []
+        for name in self.modules() if module_ids is None else module_ids:
+            profile = self.profile(name)
+            if compile:
+                for type_name in profile.declared():
+                    profile.codec(type_name)
+            stats.append(profile.stats)
+        return stats
+
+    def loaded(self) -> list[str]:
+        """MODULE_IDs loaded so far, in load order."""
+        return list(self._profiles)
+
+    def stats(self) -> list[ProfileStats]:
+        """Load and compile cost of every loaded profile, in load order."""
+        return [p.stats for p in self._profiles.values()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("modules", nargs="*", help="MODULE_IDs to load, e.g. spatial.core/1.7 (default: all)")
+    parser.add_argument("--idl-version", default=DEFAULT_VERSION, help="idl/v<ver> tree (default: 1.7)")
+    parser.add_argument("--no-examples", action="store_true", help="skip idl/v<ver>/examples/")
+    parser.add_argument("--compile", action="store_true", help="also compile every declared struct and union")
+    parser.add_argument("--json", action="store_true", help="print the per-profile stats as JSON")
+    args = parser.parse_args(argv)
+
+    registry = TypeRegistry(args.idl_version, examples=not args.no_examples)
+    try:
+        stats = registry.prewarm(args.modules or None, compile=args.compile)
+    except (FileNotFoundError, KeyError) as exc:
+        print(f"error: {exc.args[0]}", file=sys.stderr)
+        return 2
+    except ValueError as exc:  # IdlError, XcdrError
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps([asdict(s) for s in stats], indent=2))
+        return 0
+    width = max(len(s.module_id) for s in stats) if stats else 9
+    print(f"{'MODULE_ID':<{width}}  {'load ms':>8}  {'compile ms':>10}  {'types':>5}  file")
+    for s in stats:
+        print(f"{s.module_id:<{width}}  {s.load_ms:>8.1f}  {s.compile_ms:>10.1f}  {s.types:>5}  {s.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Validate idl/v<ver>/*.idl (and idl/v<ver>/examples/*.idl) without idlc.
+
+Each file is validated as its own compilation unit, as idlc sees it: the file
+plus whatever it #includes (searched next to the file, then in idl/v<ver>/).
+Every name the file uses must therefore resolve through its own includes.
+Checks, on the declarations the file itself makes:
+
+  - the file parses (idl_parser subset) and its includes exist;
+  - every type name, sequence/string bound, array dimension, const value and
+    union case label resolves, and names used as types are types;
+  - no name is defined twice with different content;
+  - enums assign no @value twice and declare no enumerator twice;
+  - union discriminators are integral, char, boolean or enum types, and case
+    labels are unique;
+  - @key members are key-capable: not unions, sequences or @optional.
+
+Files are fanned out over a process pool; parsed ASTs come from the
+idl_parser cache, so a warm run of every version takes well under a second.
+
+examples/ is validated only with --examples: the v1.2 and v1.3 examples are
+sample instances, not IDL. The published v1.2 and v1.3 profiles use
+spatial::core names without #including core.idl, so they fail as separate
+compilation units; they are validated only when named or with --all.
+
+Usage: validate_idl.py [--examples] [--all] [-j N] [version ...]   (default: every version after 1.3)
+Exit status is nonzero if any file fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from idl_parser import (
+    ROOT, Const, ConstRef, Enum, Enumerator, Forward, IdlError, Module, SequenceType,
+    StringType, Struct, Typedef, TypeRef, UnionDef, load, qualify, version_files,
+)
+
+# Published without #include "core.idl" in their profiles (see above).
+LEGACY_VERSIONS = ("1.2", "1.3")
+TYPE_NODES = (Struct, UnionDef, Enum, Typedef, Forward)
+DISCRIMINATOR_PRIMITIVES = frozenset({
+    "boolean", "char", "wchar", "octet",
+    "int8", "uint8", "int16", "uint16", "int32", "uint32", "int64", "uint64",
+})
+
+
+class FileValidator:
+    """Collects problems in the declarations one file makes, given its schema."""
+
+    def __init__(self, schema, label: str) -> None:
+        self.schema = schema
+        self.label = label
+        self.problems: list[tuple[int, str]] = []
+
+    def fail(self, line: int, message: str) -> None:
+        self.problems.append((line, message))
+
+    # -- names and values --
+
+    def value(self, expr, scope: str, line: int, what: str):
+        try:
+            return self.schema.evaluate(expr, scope)
+        except KeyError as exc:
+            self.fail(line, f"{what}: unresolved name '{exc.args[0]}'")
+        except (TypeError, ZeroDivisionError) as exc:
+            self.fail(line, f"{what}: cannot evaluate ({exc})")
+        return None
+
+    def bound(self, expr, scope: str, line: int, what: str) -> None:
+        value = self.value(expr, scope, line, what)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value <= 0):
+            self.fail(line, f"{what} must be a positive integer, got {value!r}")
+
+    def type_spec(self, spec, scope: str, line: int, where: str) -> None:
+        if isinstance(spec, SequenceType):
+            self.type_spec(spec.element, scope, line, where)
+            if spec.bound is not None:
+                self.bound(spec.bound, scope, line, f"{where}: sequence bound")
+        elif isinstance(spec, StringType):
+            if spec.bound is not None:
+                self.bound(spec.bound, scope, line, f"{where}: string bound")
+        elif isinstance(spec, TypeRef) and not spec.primitive:
+            name = self.schema.lookup(spec.name, scope)
+            if name is None:
+                self.fail(line, f"{where}: unresolved type '{spec.name}'")
+            elif not isinstance(self.schema[name], TYPE_NODES):
+                kind = type(self.schema[name]).__name__.lower()
+                self.fail(line, f"{where}: '{spec.name}' names a {kind}, not a type")
+
+    def resolved(self, spec, scope: str):
+        """Underlying type of spec with typedefs followed, or None if unresolvable."""
+        try:
+            return self.schema.resolve(spec, scope)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    # -- declarations --
+
+    def definitions(self, definitions, scope: str) -> None:
+        for d in definitions:
+            if isinstance(d, Module):
+                self.definitions(d.definitions, qualify(scope, d.name))
+            elif isinstance(d, Struct):
+                self.struct(d, scope)
+            elif isinstance(d, UnionDef):
+                self.union(d, scope)
+            elif isinstance(d, Enum):
+                self.enum(d)
+            elif isinstance(d, Typedef):
+                self.type_spec(d.type, scope, d.line, f"typedef {d.name}")
+                for dim in d.dims:
+                    self.bound(dim, scope, d.line, f"typedef {d.name}: array dimension")
+            elif isinstance(d, Const):
+                self.type_spec(d.type, scope, d.line, f"const {d.name}")
+                self.value(d.value, scope, d.line, f"const {d.name}")
+
+    def member(self, owner: str, m, scope: str) -> None:
+        where = f"{owner}.{m.name}"
+        self.type_spec(m.type, scope, m.line, where)
+        for dim in m.dims:
+            self.bound(dim, scope, m.line, f"{where}: array dimension")
+
+    def struct(self, s: Struct, scope: str) -> None:
+        if s.base is not None:
+            name = self.schema.lookup(s.base, scope)
+            if name is None or not isinstance(self.schema[name], Struct):
+                self.fail(s.line, f"struct {s.name}: base '{s.base}' is not a struct")
+        seen = set()
+        for m in s.members:
+            if m.name in seen:
+                self.fail(m.line, f"struct {s.name} declares member {m.name} twice")
+            seen.add(m.name)
+            self.member(s.name, m, scope)
+            if m.key:
+                self.key_member(s.name, m, scope)
+
+    def key_member(self, owner: str, m, scope: str) -> None:
+        where = f"{owner}.{m.name}"
+        if m.optional:
+            self.fail(m.line, f"{where}: @key member cannot be @optional")
+        found = self.resolved(m.type, scope)
+        if found is None:
+            return  # already reported as unresolved
+        target = found[0]
+        if isinstance(target, SequenceType):
+            self.fail(m.line, f"{where}: @key on a sequence type is not key-capable")
+        elif isinstance(target, UnionDef):
+            self.fail(m.line, f"{where}: @key on union {target.name} is not key-capable")
+
+    def union(self, u: UnionDef, scope: str) -> None:
+        self.type_spec(u.discriminator, scope, u.line, f"union {u.name} discriminator")
+        found = self.resolved(u.discriminator, scope)
+        discriminator_enum = None
+        if found is not None:
+            target, dims, _ = found
+            if isinstance(target, Enum) and not dims:
+                discriminator_enum = target
+            elif not (isinstance(target, TypeRef) and target.name in DISCRIMINATOR_PRIMITIVES and not dims):
+                self.fail(u.line, f"union {u.name}: discriminator must be an integral, char, boolean or enum type")
+
+        labels: dict[object, str] = {}
+        defaults = 0
+        for case in u.cases:
+            m = case.member
+            self.member(u.name, m, scope)
+            defaults += case.default
+            for label in case.labels:
+                value = self.value(label, scope, m.line, f"union {u.name} case label")
+                if value is None:
+                    continue
+                if discriminator_enum is not None and isinstance(label, ConstRef):
+                    name = self.schema.lookup(label.name, scope)
+                    entry = self.schema.decls.get(name)
+                    if not (isinstance(entry.node, Enumerator) and entry.parent is discriminator_enum):
+                        self.fail(m.line, f"union {u.name}: case {label.name} is not an enumerator of {discriminator_enum.name}")
+                if value in labels:
+                    self.fail(m.line, f"union {u.name}: case label {value!r} used by both {labels[value]} and {m.name}")
+                labels.setdefault(value, m.name)
+        if defaults > 1:
+            self.fail(u.line, f"union {u.name} has more than one default case")
+
+    def enum(self, e: Enum) -> None:
+        names, values = set(), {}
+        nxt = 0
+        for en in e.enumerators:
+            value = en.value if en.value is not None else nxt
+            nxt = value + 1
+            if en.name in names:
+                self.fail(en.line, f"enum {e.name} declares {en.name} twice")
+            if value in values:
+                self.fail(en.line, f"enum {e.name} assigns @value({value}) to both {values[value]} and {en.name}")
+            names.add(en.name)
+            values.setdefault(value, en.name)
+
+    def conflicts(self) -> None:
+        for name, first, second in self.schema.conflicts:
+            if first.parent is not None and first.parent is second.parent:
+                continue  # repeated enumerator, reported by enum()
+            if second.file == self.label:
+                mine, other = second, first
+            elif first.file == self.label:
+                mine, other = first, second
+            else:
+                continue
+            where = f"line {other.node.line}" if other.file == self.label else other.file
+            self.fail(mine.node.line, f"'{name}' redefined with different content (first defined at {where})")
+
+
+def validate_file(job: tuple[str, str]) -> list[str]:
+    """Worker: validate one file as its own compilation unit; return messages."""
+    version, path = job
+    idl_dir = ROOT / "idl" / f"v{version}"
+    try:
+        schema = load([Path(path)], [idl_dir])
+    except IdlError as exc:
+        return [str(exc)]
+    except (OSError, UnicodeDecodeError) as exc:
+        return [f"{os.path.relpath(path, ROOT)}: {exc}"]
+    unit = schema.files[-1]  # load() lists a file after everything it includes
+    label = unit.path
+    validator = FileValidator(schema, label)
+    validator.definitions(unit.definitions, "")
+    validator.conflicts()
+    return [f"{label}:{line}: {message}" for line, message in sorted(validator.problems)]
+
+
+def all_versions() -> list[str]:
+    versions = [p.name[1:] for p in (ROOT / "idl").iterdir() if p.is_dir() and p.name.startswith("v")]
+    return sorted(versions, key=lambda v: tuple(int(x) for x in v.split(".")))
+
+
+def validate_versions(versions: list[str], examples: bool = False, jobs: int | None = None) -> dict[str, dict[str, list[str]]]:
+    """{version: {file: [problem, ...]}} for every file of every version, in file order."""
+    work = [(v, str(p)) for v in versions for p in version_files(v, examples=examples)]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(work) <= 1:
+        results = [validate_file(job) for job in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(validate_file, work, chunksize=max(1, len(work) // (jobs * 4))))
+    report: dict[str, dict[str, list[str]]] = {v: {} for v in versions}
+    for (version, path), problems in zip(work, results):
+        report[version][os.path.relpath(path, ROOT)] = problems
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("versions", nargs="*", help="spec versions to validate (default: all but 1.2 and 1.3)")
+    parser.add_argument("--examples", action="store_true", help="also validate idl/v<ver>/examples/")
+    parser.add_argument("--all", action="store_true", help="include the legacy v1.2 and v1.3 trees")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    versions = args.versions or [v for v in all_versions() if args.all or v not in LEGACY_VERSIONS]
+
+    started = time.perf_counter()
+    try:
+        report = validate_versions(versions, examples=args.examples, jobs=args.jobs)
+    except FileNotFoundError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    failed = []
+    for version in versions:
+        files = report[version]
+        problems = [p for per_file in files.values() for p in per_file]
+        if problems:
+            print(f"IDL validation FAILED for v{version} ({len(problems)} issue(s)):\n")
+            for p in problems:
+                print(f"  - {p}")
+            failed.append(version)
+        else:
+            print(f"IDL validation OK for v{version} ({len(files)} file(s)).")
+    elapsed = (time.perf_counter() - started) * 1000
+    if len(versions) > 1:
+        print(f"\n{len(versions) - len(failed)}/{len(versions)} version(s) clean in {elapsed:.0f} ms"
+              + (f"; FAILED: {', '.join('v' + v for v in failed)}" if failed else "."))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
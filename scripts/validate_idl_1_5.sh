@@ -6,8 +6,8 @@ IDL_DIR="$ROOT_DIR/idl/v1.5"
 OUT_DIR="${TMPDIR:-/tmp}/spatialdds_idlc_out/v1.5"
 
 if ! command -v idlc >/dev/null 2>&1; then
-  echo "idlc not found in PATH. Install Cyclone DDS idlc and retry." >&2
-  exit 127
+  echo "idlc not found in PATH; using the built-in validator (scripts/validate_idl.py)." >&2
+  exec python3 "$ROOT_DIR/scripts/validate_idl.py" "1.5"
 fi
 
 mkdir -p "$OUT_DIR"
@@ -0,0 +1,1234 @@
+#!/usr/bin/env python3
+"""XCDR2 encoder/decoder for SpatialDDS types, compiled from the IDL.
+
+compile_type(schema, name) turns a type from an idl_parser Schema into a
+TypeCodec whose encode()/decode() produce and consume a complete serialized
+sample: the 4-byte encapsulation header followed by the XCDR2 body, as
+Cyclone DDS writes it for the same type.
+
+Wire rules implemented (DDS-XTypes 1.3, 7.4.3, encoding version 2):
+
+  - Encapsulation: D_CDR2 (0x0009 LE / 0x0008 BE) for an APPENDABLE top-level
+    type, PLAIN_CDR2 (0x0007 / 0x0006) for a FINAL one. The low two bits of the
+    options word give the padding appended to reach a multiple of 4 bytes.
+  - Alignment is min(size, 4), measured from the end of the header, so int64,
+    uint64 and double align to 4.
+  - boolean is 1 byte, enums are int32, and strings are a uint32 length that
+    counts the NUL, then the bytes and the NUL.
+  - APPENDABLE structs and unions start with a DHEADER: a uint32 byte count of
+    the rest of the object. A decoder stops at that count. Members the
+    writer's older type lacked get defaults, and trailing members from a
+    newer writer are skipped.
+  - Sequences and arrays of non-primitive elements (structs, unions, strings,
+    sequences) also get a DHEADER. Enums count as primitive here.
+  - @optional members of FINAL/APPENDABLE types carry a 1-byte presence flag.
+
+MUTABLE types (EMHEADER/PL_CDR2), char/wchar and long double are not used by
+idl/v1.x and are rejected when the codec is compiled.
+
+Values: a struct is a dict keyed by member name, and a union is a
+(discriminator, value) tuple. Enums are ints and sequence<uint8>/<octet> is
+bytes. Consecutive fixed-size primitive members are packed and unpacked with
+one precompiled struct.Struct per alignment phase. When NumPy is installed,
+sequences of numeric primitives, and arrays of at least NUMPY_MIN_ELEMENTS
+(Mat6x6, Mat12x12, ...), decode as read-only ndarrays viewing the input
+buffer. Otherwise they decode as lists.
+
+TypeCodec.view() decodes lazily instead: it returns a StructView that reads
+a member from the buffer only when it is accessed, so a relay can read the
+key and a few header fields of a large sample and forward it without
+decoding the rest. Octet sequences (BlobChunk.data, descriptor blobs) come
+back as read-only memoryviews, numeric sequences as ndarrays, and sequences
+of structs as SequenceViews that locate elements by stride or by DHEADER
+skipping.
+
+Sequences of structs also convert to and from NumPy structured arrays:
+StructCodec.dtype() maps a struct to a dtype, SequenceView.records() returns
+the elements as an array (a view in place for fixed-layout elements such as
+RadDetection), and encode() accepts such an array wherever a sequence of
+that struct is expected, so rows can be filtered and re-sent without
+Python-level loops.
+
+Usage: xcdr2.py [--idl-version 1.7] [--examples] TYPE (--encode JSON | --decode BIN | --template) [-o OUT]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import keyword
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from math import prod
+
+from idl_parser import (
+    Enum, IdlError, SequenceType, StringType, Struct, TypeRef, UnionDef, load_version,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; lists are used instead
+    np = None
+
+NUMPY_MIN_ELEMENTS = 16
+
+# Encapsulation identifiers (RTPS 2.5 10.5, XTypes 7.6.3.1.2): little-endian ids.
+PLAIN_CDR2_LE, PLAIN_CDR2_BE = 0x0007, 0x0006
+D_CDR2_LE, D_CDR2_BE = 0x0009, 0x0008
+
+PRIMITIVE_CODES = {
+    "boolean": "?", "octet": "B", "int8": "b", "uint8": "B",
+    "int16": "h", "uint16": "H", "int32": "i", "uint32": "I",
+    "int64": "q", "uint64": "Q", "float": "f", "double": "d",
+}
+UNSUPPORTED_PRIMITIVES = ("char", "wchar", "long double")
+# Primitives a NumPy dtype can view directly.
+NUMPY_CODES = frozenset("bBhHiIqQfd?")
+
+U32 = {"<": struct.Struct("<I"), ">": struct.Struct(">I")}
+NATIVE = "<" if sys.byteorder == "little" else ">"
+
+
+class XcdrError(ValueError):
+    """Value does not fit the type, or the buffer is not a valid sample of it."""
+
+
+# ---------------------------------------------------------------------------
+# Stream state. Offsets are relative to the end of the encapsulation header:
+# the Writer's buffer starts there and the Reader is given a view that does too.
+# ---------------------------------------------------------------------------
+
+class Writer:
+    __slots__ = ("buf", "endian")
+
+    def __init__(self, endian: str) -> None:
+        self.buf = bytearray()
+        self.endian = endian
+
+    def align(self, n: int) -> None:
+        pad = -len(self.buf) % n
+        if pad:
+            self.buf += b"\0" * pad
+
+    def u32(self, value: int) -> None:
+        self.align(4)
+        self.buf += U32[self.endian].pack(value)
+
+    def begin_dheader(self) -> int:
+        self.u32(0)
+        return len(self.buf)
+
+    def end_dheader(self, start: int) -> None:
+        U32[self.endian].pack_into(self.buf, start - 4, len(self.buf) - start)
+
+
+class Reader:
+    __slots__ = ("buf", "pos", "endian")
+
+    def __init__(self, buf, pos: int, endian: str) -> None:
+        self.buf = buf
+        self.pos = pos
+        self.endian = endian
+
+    def align(self, n: int) -> None:
+        self.pos += -self.pos % n
+
+    def u32(self) -> int:
+        self.align(4)
+        if self.pos + 4 > len(self.buf):
+            raise XcdrError(f"buffer ends inside a uint32 at offset {self.pos}")
+        (value,) = U32[self.endian].unpack_from(self.buf, self.pos)
+        self.pos += 4
+        return value
+
+
+def is_mapping(value) -> bool:
+    return type(value) is dict or isinstance(value, Mapping)
+
+
+def field_of(value, name: str):
+    return value[name] if is_mapping(value) else getattr(value, name)
+
+# ---------------------------------------------------------------------------
+# Type codecs
+# ---------------------------------------------------------------------------
+
+class PrimitiveCodec:
+    primitive = True
+
+    def __init__(self, type_name: str) -> None:
+        self.type_name = type_name
+        self.code = PRIMITIVE_CODES[type_name]
+        self.size = struct.calcsize("<" + self.code)
+        self.align = min(self.size, 4)
+        self.structs = {e: struct.Struct(e + self.code) for e in "<>"}
+
+    def encode(self, w: Writer, value) -> None:
+        w.align(self.align)
+        try:
+            w.buf += self.structs[w.endian].pack(value)
+        except struct.error as exc:
+            raise XcdrError(f"{self.type_name}: {exc}") from None
+
+    def decode(self, r: Reader):
+        r.align(self.align)
+        (value,) = self.structs[r.endian].unpack_from(r.buf, r.pos)
+        r.pos += self.size
+        return value
+
+    view = decode
+
+    def skip(self, r: Reader) -> None:
+        r.align(self.align)
+        r.pos += self.size
+
+    def default(self):
+        return False if self.code == "?" else 0.0 if self.code in "fd" else 0
+
+
+class EnumCodec(PrimitiveCodec):
+    """Enums are 32-bit on the wire; values are plain ints (IntEnum works too)."""
+
+    def __init__(self, enum: Enum) -> None:
+        super().__init__("int32")
+        self.type_name = enum.name
+        self.values = enum.values()
+        self.first = next(iter(self.values.values()), 0)
+
+    def default(self):
+        return self.first
+
+
+class StringCodec:
+    primitive = False
+    align = 4
+
+    def __init__(self, bound: int | None) -> None:
+        self.bound = bound
+
+    def encode(self, w: Writer, value: str) -> None:
+        data = value.encode("utf-8")
+        if self.bound is not None and len(data) > self.bound:
+            raise XcdrError(f"string of {len(data)} bytes exceeds bound {self.bound}")
+        w.u32(len(data) + 1)
+        w.buf += data
+        w.buf += b"\0"
+
+    def decode(self, r: Reader) -> str:
+        n = r.u32()
+        if n == 0 or r.pos + n > len(r.buf):
+            raise XcdrError(f"bad string length {n} at offset {r.pos - 4}")
+        value = bytes(r.buf[r.pos:r.pos + n - 1]).decode("utf-8")
+        r.pos += n
+        return value
+
+    view = decode
+
+    def skip(self, r: Reader) -> None:
+        n = r.u32()
+        r.pos += n
+
+    def default(self) -> str:
+        return ""
+
+
+class SequenceCodec:
+    primitive = False
+    align = 4
+
+    def __init__(self, element, bound: int | None, use_numpy: bool) -> None:
+        self.element = element
+        self.bound = bound
+        self.dheader = not element.primitive
+        self.octets = isinstance(element, PrimitiveCodec) and element.code == "B" and element.type_name in ("uint8", "octet")
+        self.numpy = (use_numpy and isinstance(element, PrimitiveCodec) and not self.octets
+                      and element.code in NUMPY_CODES)
+
+    def _check(self, n: int) -> None:
+        if self.bound is not None and n > self.bound:
+            raise XcdrError(f"sequence of {n} elements exceeds bound {self.bound}")
+
+    def encode(self, w: Writer, value) -> None:
+        n = len(value)
+        self._check(n)
+        start = w.begin_dheader() if self.dheader else None
+        w.u32(n)
+        element = self.element
+        rec = element.record(w.endian) if isinstance(element, StructCodec) and n else None
+        if np is not None and isinstance(value, np.ndarray) and value.dtype.names and isinstance(element, StructCodec):
+            if rec is not None:
+                w.buf += element.pack_records(value, w.endian)
+                w.end_dheader(start)
+                return
+            value = element.from_records(value)
+        if start is None and n:
+            w.align(element.align)
+            w.buf += pack_primitives(element, w.endian, value)
+        elif rec is not None:
+            packer, stride, body = rec
+            run = element.steps[0]
+            try:
+                records = [packer.pack(body, *run.args(item)) for item in value]
+            except (struct.error, KeyError, AttributeError, TypeError) as exc:
+                raise XcdrError(f"{element.name}: {exc}") from None
+            w.buf += (b"\0" * (stride - packer.size)).join(records)
+        else:
+            for item in value:
+                element.encode(w, item)
+        if start is not None:
+            w.end_dheader(start)
+
+    def decode(self, r: Reader):
+        if self.dheader:
+            size = r.u32()
+            end = r.pos + size
+        n = r.u32()
+        self._check(n)
+        element = self.element
+        if not self.dheader:
+            if n:
+                r.align(element.align)
+            if r.pos + n * element.size > len(r.buf):
+                raise XcdrError(f"sequence of {n} elements overruns the buffer at offset {r.pos}")
+            if self.octets:
+                value = bytes(r.buf[r.pos:r.pos + n])
+            elif self.numpy:
+                value = np.frombuffer(r.buf, np.dtype(r.endian + element.code), n, r.pos)
+            else:
+                value = list(struct.unpack_from(f"{r.endian}{n}{element.code}", r.buf, r.pos))
+            r.pos += n * element.size
+            return value
+        rec = element.record(r.endian) if isinstance(element, StructCodec) and n else None
+        if rec is not None:
+            packer, stride, body = rec
+            pos = r.pos
+            if pos + stride * (n - 1) + packer.size <= end <= len(r.buf):
+                rows = [packer.unpack_from(r.buf, pos + i * stride) for i in range(n)]
+                # A writer with another version of the type has another DHEADER.
+                if all(row[0] == body for row in rows):
+                    run = element.steps[0]
+                    r.pos = end
+                    return [run.assign(row, 1) for row in rows]
+        value = [element.decode(r) for _ in range(n)]
+        r.pos = end
+        return value
+
+    def view(self, r: Reader):
+        """Like decode(), but without copying: octets come back as a read-only
+        memoryview, primitives as an ndarray (or, without NumPy, a memoryview
+        when the byte order is native), other elements as a lazy SequenceView.
+        """
+        if self.dheader:
+            header = r.pos
+            size = r.u32()
+            end = r.pos + size
+            if end > len(r.buf):
+                raise XcdrError(f"sequence DHEADER of {size} bytes overruns the buffer at offset {header}")
+            n = r.u32()
+            self._check(n)
+            value = SequenceView(self, r.buf, header, r.pos, n, end, r.endian)
+            r.pos = end
+            return value
+        start = r.pos
+        n = r.u32()
+        self._check(n)
+        element = self.element
+        if n:
+            r.align(element.align)
+        nbytes = n * element.size
+        if r.pos + nbytes > len(r.buf):
+            raise XcdrError(f"sequence of {n} elements overruns the buffer at offset {r.pos}")
+        if self.octets:
+            value = r.buf[r.pos:r.pos + nbytes].toreadonly()
+        elif self.numpy:
+            value = np.frombuffer(r.buf, np.dtype(r.endian + element.code), n, r.pos)
+        elif r.endian == NATIVE:
+            value = r.buf[r.pos:r.pos + nbytes].toreadonly().cast(element.code)
+        else:
+            r.pos = start
+            return self.decode(r)
+        r.pos += nbytes
+        return value
+
+    def skip(self, r: Reader) -> None:
+        if self.dheader:
+            size = r.u32()
+            r.pos += size
+            return
+        n = r.u32()
+        if n:
+            r.align(self.element.align)
+            r.pos += n * self.element.size
+
+    def default(self):
+        return b"" if self.octets else []
+
+
+def pack_primitives(element: PrimitiveCodec, endian: str, value) -> bytes:
+    """Contiguous primitives, from an ndarray, bytes or any sequence."""
+    if np is not None and isinstance(value, np.ndarray):
+        return np.ascontiguousarray(value, np.dtype(endian + element.code)).tobytes()
+    if isinstance(value, (bytes, bytearray, memoryview)) and element.code == "B":
+        return bytes(value)
+    try:
+        return struct.pack(f"{endian}{len(value)}{element.code}", *value)
+    except struct.error as exc:
+        raise XcdrError(f"{element.type_name}[]: {exc}") from None
+
+
+class ArrayCodec:
+    """Fixed-size (possibly multi-dimensional) array; values nest per dimension."""
+
+    primitive = False
+
+    def __init__(self, element, dims: tuple[int, ...], use_numpy: bool) -> None:
+        self.element = element
+        self.dims = dims
+        self.count = prod(dims)
+        self.dheader = not element.primitive
+        self.align = 4 if self.dheader else element.align
+        self.numpy = (use_numpy and isinstance(element, PrimitiveCodec)
+                      and element.code in NUMPY_CODES and self.count >= NUMPY_MIN_ELEMENTS)
+
+    def _flat(self, value) -> list:
+        if np is not None and isinstance(value, np.ndarray):
+            return value.reshape(-1)
+        flat = value
+        for _ in self.dims[1:]:
+            flat = [x for row in flat for x in row]
+        return flat
+
+    def encode(self, w: Writer, value) -> None:
+        flat = self._flat(value)
+        if len(flat) != self.count:
+            raise XcdrError(f"array of {len(flat)} elements, expected {self.count}")
+        if self.dheader:
+            start = w.begin_dheader()
+            for item in flat:
+                self.element.encode(w, item)
+            w.end_dheader(start)
+        else:
+            w.align(self.element.align)
+            w.buf += pack_primitives(self.element, w.endian, flat)
+
+    def _nest(self, flat: list):
+        for d in reversed(self.dims[1:]):
+            flat = [flat[i:i + d] for i in range(0, len(flat), d)]
+        return flat
+
+    def decode(self, r: Reader):
+        element = self.element
+        if self.dheader:
+            size = r.u32()
+            end = r.pos + size
+            value = self._nest([element.decode(r) for _ in range(self.count)])
+            r.pos = end
+            return value
+        r.align(element.align)
+        if r.pos + self.count * element.size > len(r.buf):
+            raise XcdrError(f"array overruns the buffer at offset {r.pos}")
+        if self.numpy:
+            value = np.frombuffer(r.buf, np.dtype(r.endian + element.code), self.count, r.pos).reshape(self.dims)
+        else:
+            value = self._nest(list(struct.unpack_from(f"{r.endian}{self.count}{element.code}", r.buf, r.pos)))
+        r.pos += self.count * element.size
+        return value
+
+    view = decode
+
+    def skip(self, r: Reader) -> None:
+        if self.dheader:
+            size = r.u32()
+            r.pos += size
+        else:
+            r.align(self.element.align)
+            r.pos += self.count * self.element.size
+
+    def default(self):
+        if self.numpy:
+            return np.zeros(self.dims, np.dtype("<" + self.element.code))
+        return self._nest([self.element.default() for _ in range(self.count)])
+
+
+class Run:
+    """Consecutive fixed-size primitive members, packed with one struct.Struct.
+
+    XCDR2 alignment depends on where the run starts modulo 4, so one Struct is
+    compiled per (start phase, byte order) on first use.
+    """
+
+    def __init__(self) -> None:
+        self.items: list[tuple[str, PrimitiveCodec, int]] = []  # (member, element, count; 0 = scalar)
+        self.plans: dict[tuple[int, str], struct.Struct] = {}
+        # Flattening and rebuilding are generated once per run: per-member
+        # loops dominate decoding of large fixed-record sequences.
+        self.getters: dict[type, object] = {}
+        self.builders: dict[int, object] = {}
+
+    def add(self, name: str, element: PrimitiveCodec, count: int) -> None:
+        self.items.append((name, element, count))
+
+    def plan(self, phase: int, endian: str) -> struct.Struct:
+        """Struct for the run, including alignment padding, starting at this phase."""
+        key = (phase, endian)
+        plan = self.plans.get(key)
+        if plan is None:
+            fmt, offset = [endian], phase
+            for _, element, count in self.items:
+                pad = -offset % element.align
+                if pad:
+                    fmt.append(f"{pad}x")
+                fmt.append(f"{max(count, 1)}{element.code}")
+                offset += pad + element.size * max(count, 1)
+            plan = self.plans[key] = struct.Struct("".join(fmt))
+        return plan
+
+    def args(self, value) -> tuple:
+        """The run's members of value, flattened in Struct argument order."""
+        kind = dict if is_mapping(value) else object
+        getter = self.getters.get(kind)
+        if getter is None:
+            fields = [("*" if count else "")
+                      + (f"v[{name!r}]" if kind is dict
+                         else f"v.{name}" if not keyword.iskeyword(name) else f"getattr(v, {name!r})")
+                      for name, _, count in self.items]
+            getter = self.getters[kind] = eval(f"lambda v: ({', '.join(fields)},)")
+        return getter(value)
+
+    def assign(self, values: tuple, start: int) -> dict:
+        """Members unpacked into values, starting at values[start], as a dict."""
+        builder = self.builders.get(start)
+        if builder is None:
+            fields, i = [], start
+            for name, _, count in self.items:
+                if count:
+                    fields.append(f"{name!r}: list(v[{i}:{i + count}])")
+                    i += count
+                else:
+                    fields.append(f"{name!r}: v[{i}]")
+                    i += 1
+            builder = self.builders[start] = eval(f"lambda v: {{{', '.join(fields)}}}")
+        return builder(values)
+
+    def encode(self, w: Writer, value) -> None:
+        packer = self.plan(len(w.buf) % 4, w.endian)
+        try:
+            w.buf += packer.pack(*self.args(value))
+        except (struct.error, KeyError, AttributeError, TypeError) as exc:
+            raise XcdrError(f"{', '.join(n for n, _, _ in self.items)}: {exc}") from None
+
+    def decode(self, r: Reader, out: dict) -> None:
+        unpacker = self.plan(r.pos % 4, r.endian)
+        if r.pos + unpacker.size > len(r.buf):
+            raise XcdrError(f"buffer ends inside a struct at offset {r.pos}")
+        values = unpacker.unpack_from(r.buf, r.pos)
+        r.pos += unpacker.size
+        out.update(self.assign(values, 0))
+
+    def skip(self, r: Reader) -> None:
+        r.pos += self.plan(r.pos % 4, r.endian).size
+
+    def defaults(self) -> dict:
+        return {name: [element.default()] * count if count else element.default()
+                for name, element, count in self.items}
+
+
+class StructCodec:
+    primitive = False
+    align = 4
+
+    def __init__(self, name: str, appendable: bool) -> None:
+        self.name = name
+        self.appendable = appendable
+        self.members: list[tuple[str, object, bool]] = []  # (name, codec, optional)
+        self.steps: list = []  # Run or (name, codec, optional)
+        self.step_of: dict[str, int] = {}  # member name -> index in steps
+        self.keys: list[str] = []  # @key members, in declaration order
+        self.records: dict[str, tuple[struct.Struct, int, int] | None] = {}
+        self.dtypes: dict[str, object] = {}
+
+    def finish(self) -> None:
+        """Group consecutive fixed-size primitive members into Runs."""
+        run = None
+        for name, codec, optional in self.members:
+            if not optional and isinstance(codec, PrimitiveCodec):
+                count = 0
+            elif (not optional and isinstance(codec, ArrayCodec) and not codec.numpy
+                  and len(codec.dims) == 1 and isinstance(codec.element, PrimitiveCodec)):
+                count = codec.count
+            else:
+                run = None
+                self.steps.append((name, codec, optional))
+                continue
+            if run is None:
+                run = Run()
+                self.steps.append(run)
+            run.add(name, codec if count == 0 else codec.element, count)
+        for i, step in enumerate(self.steps):
+            for name in [n for n, _, _ in step.items] if isinstance(step, Run) else [step[0]]:
+                self.step_of[name] = i
+
+    def record(self, endian: str) -> tuple[struct.Struct, int, int] | None:
+        """Fixed layout of an APPENDABLE struct made of one Run, as a sequence element.
+
+        Such an element always starts 4-aligned with the same DHEADER, so the
+        DHEADER and body pack as one Struct. Returns (that Struct, stride
+        between consecutive elements, body size), or None for any other struct.
+        """
+        if endian not in self.records:
+            rec = None
+            if self.appendable and len(self.steps) == 1 and isinstance(self.steps[0], Run):
+                body = self.steps[0].plan(0, endian)
+                packer = struct.Struct(endian + "I" + body.format[1:])
+                rec = (packer, -(-packer.size // 4) * 4, body.size)
+            self.records[endian] = rec
+        return self.records[endian]
+
+    # -- NumPy structured arrays, one row per sequence element --
+
+    def dtype(self, endian: str = "<"):
+        """Structured dtype with one field per member, for bulk processing.
+
+        For a fixed-layout struct (see record()) the fields sit at their wire
+        offsets within the element, DHEADER included, so a sequence of them
+        is viewed in place. Otherwise numeric members and arrays of them get
+        native fields and all other members (strings, sequences, nested
+        structs, @optional) are object fields, filled row by row.
+        """
+        if np is None:
+            raise XcdrError("NumPy is not installed")
+        dt = self.dtypes.get(endian)
+        if dt is None:
+            rec = self.record(endian)
+            if rec is not None:
+                names, formats, offsets, offset = [], [], [], 4
+                for name, element, count in self.steps[0].items:
+                    offset += -offset % element.align
+                    names.append(name)
+                    formats.append((endian + element.code, (count,)) if count else endian + element.code)
+                    offsets.append(offset)
+                    offset += element.size * max(count, 1)
+                dt = np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": rec[0].size})
+            else:
+                fields = []
+                for name, codec, optional in self.members:
+                    if optional:
+                        fields.append((name, "O"))
+                    elif isinstance(codec, PrimitiveCodec):
+                        fields.append((name, endian + codec.code))
+                    elif isinstance(codec, ArrayCodec) and isinstance(codec.element, PrimitiveCodec):
+                        fields.append((name, endian + codec.element.code, codec.dims))
+                    else:
+                        fields.append((name, "O"))
+                dt = np.dtype(fields)
+            self.dtypes[endian] = dt
+        return dt
+
+    def to_records(self, rows, endian: str = "<"):
+        """Structured array from decoded rows (dicts, or any Mapping)."""
+        dt = self.dtype(endian)
+        out = np.empty(len(rows), dt)
+        names = dt.names
+        for i, row in enumerate(rows):
+            out[i] = tuple(row[name] for name in names)
+        return out
+
+    def from_records(self, records) -> list[dict]:
+        """Rows of a structured array as dicts the codec can encode."""
+        names = records.dtype.names
+        return [dict(zip(names, row)) for row in records.tolist()]
+
+    def pack_records(self, records, endian: str) -> bytes:
+        """Consecutive wire elements of a fixed-layout struct, from a structured
+        array with (at least) the members as fields, one vector copy per field.
+        """
+        packer, stride, body = self.record(endian)
+        dt = self.dtype(endian)
+        n = len(records)
+        out = np.zeros(n, np.dtype({"names": dt.names, "formats": [dt.fields[f][0] for f in dt.names],
+                                    "offsets": [dt.fields[f][1] for f in dt.names], "itemsize": stride}))
+        try:
+            for name in dt.names:
+                out[name] = records[name]
+        except (KeyError, ValueError) as exc:
+            raise XcdrError(f"{self.name}: {exc}") from None
+        np.ndarray((n,), endian + "u4", out, 0, (stride,))[:] = body
+        return out.tobytes()[:stride * n - (stride - packer.size)] if n else b""
+
+    def encode(self, w: Writer, value) -> None:
+        start = w.begin_dheader() if self.appendable else None
+        for step in self.steps:
+            if isinstance(step, Run):
+                step.encode(w, value)
+                continue
+            name, codec, optional = step
+            v = field_of(value, name)
+            if optional:
+                w.buf += b"\1" if v is not None else b"\0"
+                if v is None:
+                    continue
+            codec.encode(w, v)
+        if start is not None:
+            w.end_dheader(start)
+
+    def decode(self, r: Reader) -> dict:
+        end = None
+        if self.appendable:
+            size = r.u32()
+            end = r.pos + size
+            if end > len(r.buf):
+                raise XcdrError(f"{self.name}: DHEADER of {size} bytes overruns the buffer")
+        out: dict = {}
+        for step in self.steps:
+            if end is not None and r.pos >= end:
+                self._fill_defaults(out)  # written by an older, shorter type
+                break
+            if isinstance(step, Run):
+                step.decode(r, out)
+                continue
+            name, codec, optional = step
+            if optional:
+                present = r.buf[r.pos]
+                r.pos += 1
+                if not present:
+                    out[name] = None
+                    continue
+            out[name] = codec.decode(r)
+        if end is not None:
+            r.pos = end  # skip members a newer writer appended
+        return out
+
+    def view(self, r: Reader) -> StructView:
+        header = r.pos
+        if self.appendable:
+            size = r.u32()
+            end = r.pos + size
+            if end > len(r.buf):
+                raise XcdrError(f"{self.name}: DHEADER of {size} bytes overruns the buffer")
+            value = StructView(self, r.buf, header, r.pos, end, r.endian)
+        else:
+            start = r.pos
+            self.skip(r)
+            if r.pos > len(r.buf):
+                raise XcdrError(f"{self.name}: buffer ends inside the struct at offset {start}")
+            value = StructView(self, r.buf, header, start, r.pos, r.endian)
+        r.pos = value._end
+        return value
+
+    def skip(self, r: Reader) -> None:
+        if self.appendable:
+            size = r.u32()
+            r.pos += size
+            return
+        for step in self.steps:
+            self.skip_step(step, r)
+
+    @staticmethod
+    def skip_step(step, r: Reader) -> None:
+        if isinstance(step, Run):
+            step.skip(r)
+            return
+        _, codec, optional = step
+        if optional:
+            present = r.buf[r.pos]
+            r.pos += 1
+            if not present:
+                return
+        codec.skip(r)
+
+    def _fill_defaults(self, out: dict) -> None:
+        for name, codec, optional in self.members:
+            if name not in out:
+                out[name] = None if optional else codec.default()
+
+    def default(self) -> dict:
+        out: dict = {}
+        self._fill_defaults(out)
+        return out
+
+
+class UnionCodec:
+    primitive = False
+    align = 4
+
+    def __init__(self, name: str, appendable: bool, discriminator) -> None:
+        self.name = name
+        self.appendable = appendable
+        self.discriminator = discriminator
+        self.cases: dict[object, tuple[str, object]] = {}
+        self.default_case: tuple[str, object] | None = None
+
+    def branch(self, disc) -> tuple[str, object] | None:
+        return self.cases.get(disc, self.default_case)
+
+    def encode(self, w: Writer, value) -> None:
+        disc, v = value
+        start = w.begin_dheader() if self.appendable else None
+        self.discriminator.encode(w, disc)
+        branch = self.branch(disc)
+        if branch is not None:
+            branch[1].encode(w, v)
+        if start is not None:
+            w.end_dheader(start)
+
+    def decode(self, r: Reader):
+        end = None
+        if self.appendable:
+            size = r.u32()
+            end = r.pos + size
+        disc = self.discriminator.decode(r)
+        branch = self.branch(disc)
+        value = branch[1].decode(r) if branch is not None else None
+        if end is not None:
+            r.pos = end
+        return disc, value
+
+    def view(self, r: Reader):
+        end = None
+        if self.appendable:
+            size = r.u32()
+            end = r.pos + size
+        disc = self.discriminator.decode(r)
+        branch = self.branch(disc)
+        value = branch[1].view(r) if branch is not None else None
+        if end is not None:
+            r.pos = end
+        return disc, value
+
+    def skip(self, r: Reader) -> None:
+        if self.appendable:
+            size = r.u32()
+            r.pos += size
+            return
+        branch = self.branch(self.discriminator.decode(r))
+        if branch is not None:
+            branch[1].skip(r)
+
+    def default(self):
+        disc = self.discriminator.default()
+        branch = self.branch(disc)
+        return disc, branch[1].default() if branch is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Lazy views: decode members on first access, straight from the sample buffer
+# ---------------------------------------------------------------------------
+
+class StructView(Mapping):
+    """Read-only struct over a serialized sample; members decode on first access.
+
+    Reading a member only walks the members before it, and skipping an
+    appendable struct or a non-primitive sequence costs one DHEADER read, so
+    a key or a header is found without decoding the rest of the sample.
+    Large sequences come back as views (see SequenceCodec.view); decode()
+    materializes the whole struct as decode() on the TypeCodec would.
+    Members also read as attributes unless they clash with a method name.
+    """
+
+    __slots__ = ("_codec", "_buf", "_header", "_start", "_end", "_endian", "_offsets", "_values")
+
+    def __init__(self, codec: StructCodec, buf, header: int, start: int, end: int, endian: str) -> None:
+        self._codec = codec
+        self._buf = buf
+        self._header = header  # DHEADER (appendable) or first member (final)
+        self._start = start
+        self._end = end
+        self._endian = endian
+        self._offsets = [start]  # offsets[k]: where steps[k] starts, filled on demand
+        self._values: dict = {}
+
+    def _offset(self, k: int) -> int:
+        offsets, steps = self._offsets, self._codec.steps
+        while len(offsets) <= k:
+            pos = offsets[-1]
+            if pos >= self._end:
+                offsets.append(pos)
+                continue
+            r = Reader(self._buf, pos, self._endian)
+            StructCodec.skip_step(steps[len(offsets) - 1], r)
+            offsets.append(r.pos)
+        return offsets[k]
+
+    def __getitem__(self, name: str):
+        values = self._values
+        if name in values:
+            return values[name]
+        k = self._codec.step_of[name]
+        step = self._codec.steps[k]
+        pos = self._offset(k)
+        if pos >= self._end:
+            # Written by an older, shorter type: the member takes its default.
+            if isinstance(step, Run):
+                values.update(step.defaults())
+            else:
+                values[name] = None if step[2] else step[1].default()
+            return values[name]
+        r = Reader(self._buf, pos, self._endian)
+        if isinstance(step, Run):
+            if pos + step.plan(pos % 4, self._endian).size > self._end:
+                raise XcdrError(f"{self._codec.name}: buffer ends inside a struct at offset {pos}")
+            step.decode(r, values)
+        else:
+            _, codec, optional = step
+            if optional:
+                present = r.buf[r.pos]
+                r.pos += 1
+                if not present:
+                    values[name] = None
+                    return None
+            values[name] = codec.view(r)
+        return values[name]
+
+    def __getattr__(self, name: str):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(f"{self._codec.name} has no member {name!r}") from None
+
+    def __iter__(self):
+        return iter(self._codec.step_of)
+
+    def __len__(self) -> int:
+        return len(self._codec.step_of)
+
+    def key(self) -> tuple:
+        """Values of the @key members, in declaration order."""
+        return tuple(self[name] for name in self._codec.keys)
+
+    @property
+    def raw(self) -> memoryview:
+        """The struct's encoded bytes, DHEADER included."""
+        return self._buf[self._header:self._end].toreadonly()
+
+    def decode(self) -> dict:
+        return self._codec.decode(Reader(self._buf, self._header, self._endian))
+
+    def __repr__(self) -> str:
+        return f"<{self._codec.name} view, {self._end - self._header} bytes>"
+
+
+class SequenceView(Sequence):
+    """Read-only sequence of non-primitive elements; elements decode on access.
+
+    Fixed-layout struct elements are located by stride; any other element
+    type is found by skipping its predecessors, one DHEADER or length read
+    each, with the offsets remembered for later accesses.
+    """
+
+    __slots__ = ("_codec", "_buf", "_header", "_count", "_end", "_endian", "_stride", "_offsets", "_items")
+
+    def __init__(self, codec: SequenceCodec, buf, header: int, start: int, count: int, end: int, endian: str) -> None:
+        self._codec = codec
+        self._buf = buf
+        self._header = header
+        self._count = count
+        self._end = end
+        self._endian = endian
+        self._stride = None
+        self._offsets = [start]
+        self._items: dict[int, object] = {}
+        element = codec.element
+        rec = element.record(endian) if isinstance(element, StructCodec) and count else None
+        if rec is not None:
+            packer, stride, body = rec
+            # Every element came from the same writer; one matching DHEADER and
+            # a matching total size mean the layout is ours.
+            if (end - start == stride * (count - 1) + packer.size
+                    and U32[endian].unpack_from(buf, start)[0] == body):
+                self._stride = stride
+
+    def _offset(self, i: int) -> int:
+        if self._stride is not None:
+            return self._offsets[0] + i * self._stride
+        offsets, element = self._offsets, self._codec.element
+        while len(offsets) <= i:
+            r = Reader(self._buf, offsets[-1], self._endian)
+            element.skip(r)
+            if r.pos > self._end:
+                raise XcdrError(f"sequence element {len(offsets) - 1} overruns the sequence")
+            offsets.append(r.pos)
+        return offsets[i]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("sequence index out of range")
+        item = self._items.get(i)
+        if item is None:
+            item = self._items[i] = self._codec.element.view(Reader(self._buf, self._offset(i), self._endian))
+        return item
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def raw(self) -> memoryview:
+        """The sequence's encoded bytes, DHEADER and length included."""
+        return self._buf[self._header:self._end].toreadonly()
+
+    def decode(self) -> list:
+        return self._codec.decode(Reader(self._buf, self._header, self._endian))
+
+    def records(self):
+        """The elements as a NumPy structured array (see StructCodec.dtype).
+
+        Fixed-layout elements whose DHEADERs all match are viewed in place,
+        read-only and in the writer's byte order; anything else is decoded
+        row by row into a new array.
+        """
+        element = self._codec.element
+        if not isinstance(element, StructCodec):
+            raise XcdrError("records() needs a sequence of structs")
+        dt = element.dtype(self._endian)
+        n, start, stride = self._count, self._offsets[0], self._stride
+        if stride is not None:
+            headers = np.ndarray((n,), self._endian + "u4", self._buf, start, (stride,))
+            if (headers == element.record(self._endian)[2]).all():
+                return np.ndarray((n,), dt, self._buf, start, (stride,))
+        r = Reader(self._buf, start, self._endian)
+        return element.to_records([element.decode(r) for _ in range(n)], self._endian)
+
+    def __repr__(self) -> str:
+        return f"<sequence view, {self._count} element(s)>"
+
+
+# ---------------------------------------------------------------------------
+# Compiler
+# ---------------------------------------------------------------------------
+
+class Compiler:
+    """Builds codecs from a Schema, sharing one codec per named type."""
+
+    def __init__(self, schema, use_numpy: bool | None = None) -> None:
+        self.schema = schema
+        self.use_numpy = np is not None if use_numpy is None else use_numpy and np is not None
+        self.named: dict[str, object] = {}
+
+    def scoped(self, name: str) -> str:
+        """Scoped name for `name`, which may also be an unambiguous unscoped name."""
+        if name in self.schema:
+            return name
+        matches = [n for n in self.schema.decls if n == name or n.endswith("::" + name)]
+        matches = [n for n in matches if isinstance(self.schema[n], (Struct, UnionDef, Enum))]
+        if len(matches) != 1:
+            raise KeyError(f"{name}: {'ambiguous: ' + ', '.join(matches) if matches else 'no such type'}")
+        return matches[0]
+
+    def type_spec(self, spec, scope: str):
+        target, dims, scope = self.schema.resolve(spec, scope)
+        codec = self.target(target, scope)
+        return ArrayCodec(codec, dims, self.use_numpy) if dims else codec
+
+    def bound(self, expr, scope: str) -> int | None:
+        return None if expr is None else int(self.schema.evaluate(expr, scope))
+
+    def target(self, target, scope: str):
+        if isinstance(target, TypeRef):
+            if target.name in UNSUPPORTED_PRIMITIVES:
+                raise XcdrError(f"type {target.name} is not supported")
+            return PrimitiveCodec(target.name)
+        if isinstance(target, StringType):
+            if target.wide:
+                raise XcdrError("wstring is not supported")
+            return StringCodec(self.bound(target.bound, scope))
+        if isinstance(target, SequenceType):
+            return SequenceCodec(self.type_spec(target.element, scope),
+                                 self.bound(target.bound, scope), self.use_numpy)
+        name = qualify_target(self.schema, target, scope)
+        codec = self.named.get(name)
+        if codec is None:
+            codec = self.named[name] = self.constructed(target, scope)
+        return codec
+
+    def constructed(self, node, scope: str):
+        if isinstance(node, Enum):
+            return EnumCodec(node)
+        extensibility = node.extensibility
+        if extensibility == "MUTABLE":
+            raise XcdrError(f"{node.name}: MUTABLE types (PL_CDR2) are not supported")
+        appendable = extensibility == "APPENDABLE"
+        if isinstance(node, Struct):
+            codec = StructCodec(node.name, appendable)
+            if node.base is not None:
+                base = self.target(self.schema[self.schema.lookup(node.base, scope)], scope)
+                codec.members.extend(base.members)
+                codec.keys.extend(base.keys)
+            for m in node.members:
+                member = self.type_spec(m.type, scope)
+                if m.dims:
+                    dims = tuple(int(self.schema.evaluate(d, scope)) for d in m.dims)
+                    if isinstance(member, ArrayCodec):
+                        member = ArrayCodec(member.element, dims + member.dims, self.use_numpy)
+                    else:
+                        member = ArrayCodec(member, dims, self.use_numpy)
+                codec.members.append((m.name, member, m.optional))
+            codec.keys.extend(m.name for m in node.members if m.key)
+            codec.finish()
+            return codec
+        if isinstance(node, UnionDef):
+            codec = UnionCodec(node.name, appendable, self.type_spec(node.discriminator, scope))
+            for case in node.cases:
+                member = self.type_spec(case.member.type, scope)
+                if case.member.dims:
+                    dims = tuple(int(self.schema.evaluate(d, scope)) for d in case.member.dims)
+                    member = ArrayCodec(member, dims, self.use_numpy)
+                branch = (case.member.name, member)
+                for label in case.labels:
+                    codec.cases[self.schema.evaluate(label, scope)] = branch
+                if case.default:
+                    codec.default_case = branch
+            return codec
+        raise XcdrError(f"cannot serialize {type(node).__name__} {getattr(node, 'name', '')}")
+
+    def compile(self, name: str) -> "TypeCodec":
+        """TypeCodec for a struct or union, reusing the codecs compiled so far.
+
+        A typedef name is followed to the struct or union it names.
+        """
+        target, dims, scope = self.schema.resolve(TypeRef(self.scoped(name)))
+        if dims or not isinstance(target, (Struct, UnionDef, Enum)):
+            raise XcdrError(f"{name}: not a struct or union")
+        return TypeCodec(qualify_target(self.schema, target, scope), self.target(target, scope))
+
+
+def qualify_target(schema, node, scope: str) -> str:
+    name = schema.lookup(node.name, scope)
+    if name is None or schema[name] is not node:
+        # Reached through a typedef in another scope: find the node itself.
+        name = next(n for n, d in schema.decls.items() if d.node is node)
+    return name
+
+
+class TypeCodec:
+    """Serializes complete samples (encapsulation header + body) of one type."""
+
+    def __init__(self, name: str, codec) -> None:
+        self.name = name
+        self.codec = codec
+        final = not getattr(codec, "appendable", False)
+        self.ids = {"<": PLAIN_CDR2_LE if final else D_CDR2_LE, ">": PLAIN_CDR2_BE if final else D_CDR2_BE}
+
+    def encode(self, value, *, big_endian: bool = False) -> bytes:
+        endian = ">" if big_endian else "<"
+        w = Writer(endian)
+        self.codec.encode(w, value)
+        pad = -len(w.buf) % 4
+        return struct.pack(">HH", self.ids[endian], pad) + bytes(w.buf) + b"\0" * pad
+
+    def decode(self, data):
+        """Decode a sample; accepts bytes, bytearray or memoryview."""
+        r = self._reader(data)
+        value = self.codec.decode(r)
+        if r.pos > len(r.buf):
+            raise XcdrError(f"{self.name}: sample truncated")
+        return value
+
+    def view(self, data):
+        """Lazy decode: a StructView (or, for a union, a (discriminator, value)
+        tuple) that reads members from data only when they are accessed.
+
+        Nothing is copied, so data must stay unchanged while the view is used.
+        """
+        return self.codec.view(self._reader(data))
+
+    def _reader(self, data) -> Reader:
+        """Reader over the body of a sample, after checking its header."""
+        view = memoryview(data).cast("B")
+        if len(view) < 4:
+            raise XcdrError("sample shorter than the encapsulation header")
+        encapsulation, options = struct.unpack_from(">HH", view, 0)
+        if encapsulation in self.ids.values():
+            endian = "<" if encapsulation & 1 else ">"
+        else:
+            raise XcdrError(f"{self.name}: unexpected encapsulation 0x{encapsulation:04x}")
+        return Reader(view[4:len(view) - (options & 3)], 0, endian)
+
+    def default(self):
+        """A zero/empty value of the type, useful as a template."""
+        return self.codec.default()
+
+    def dtype(self, *, big_endian: bool = False):
+        """NumPy structured dtype of a struct type (see StructCodec.dtype)."""
+        if not isinstance(self.codec, StructCodec):
+            raise XcdrError(f"{self.name} is not a struct")
+        return self.codec.dtype(">" if big_endian else "<")
+
+
+def compile_type(schema, name: str, *, use_numpy: bool | None = None) -> TypeCodec:
+    """TypeCodec for the struct or union `name` (scoped, or unambiguous unscoped)."""
+    return Compiler(schema, use_numpy).compile(name)
+
+
+# ---------------------------------------------------------------------------
+# Command line: JSON <-> XCDR2
+# ---------------------------------------------------------------------------
+
+def to_json(value):
+    if np is not None and isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, bytes):
+        return {"base64": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        return {k: to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    return value
+
+
+def from_json(value):
+    if isinstance(value, dict):
+        if set(value) == {"base64"}:
+            return base64.b64decode(value["base64"])
+        return {k: from_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [from_json(v) for v in value]
+    return value
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("type", help="struct or union name, e.g. BlobChunk or spatial::core::BlobChunk")
+    parser.add_argument("--idl-version", default="1.7", help="idl/v<ver> tree to load (default: 1.7)")
+    parser.add_argument("--examples", action="store_true", help="also load idl/v<ver>/examples/")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--encode", metavar="JSON", help="JSON value to serialize ('-' for stdin)")
+    mode.add_argument("--decode", metavar="BIN", help="serialized sample to decode ('-' for stdin)")
+    mode.add_argument("--template", action="store_true", help="print a default value as JSON")
+    parser.add_argument("--big-endian", action="store_true", help="encode big-endian")
+    parser.add_argument("-o", "--output", help="write here instead of stdout")
+    args = parser.parse_args(argv)
+
+    try:
+        codec = compile_type(load_version(args.idl_version, examples=args.examples), args.type)
+    except (KeyError, IdlError, XcdrError) as exc:
+        print(f"error: {exc.args[0]}", file=sys.stderr)
+        return 2
+
+    try:
+        if args.decode:
+            data = sys.stdin.buffer.read() if args.decode == "-" else open(args.decode, "rb").read()
+            out = (json.dumps(to_json(codec.decode(data)), indent=2) + "\n").encode("utf-8")
+        elif args.encode:
+            text = sys.stdin.read() if args.encode == "-" else open(args.encode, encoding="utf-8").read()
+            out = codec.encode(from_json(json.loads(text)), big_endian=args.big_endian)
+        else:
+            out = (json.dumps(to_json(codec.default()), indent=2) + "\n").encode("utf-8")
+    except (XcdrError, KeyError, TypeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, "wb") as fp:
+            fp.write(out)
+    else:
+        sys.stdout.buffer.write(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
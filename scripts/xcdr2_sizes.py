@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""Min / typical / worst-case XCDR2 sample sizes per type and per QoS profile.
+
+Sizes are computed on the codecs xcdr2 compiles from the IDL, so they follow
+the same wire rules (encapsulation header, DHEADERs, 4-byte maximum
+alignment, trailing padding) and count every padding byte exactly:
+
+  - min:     every sequence and string empty, @optional members absent,
+             unions on their smallest branch;
+  - max:     every sequence and string at its bound, optionals present,
+             unions on their largest branch. Unbounded strings (ids, names)
+             count as "max_string" bytes and unbounded sequences as
+             "max_sequence" elements, or make the size "unbounded" when
+             that setting is null; the IDL-only figure is kept as idl_max;
+  - typical: bounded sequences and strings filled to a ratio of their bound,
+             unbounded ones at a fixed length, optionals present, unions on
+             their largest branch.
+
+Fill ratios come from a JSON file (--fill), all keys optional:
+
+    {"default": 0.25,            ratio of the bound for bounded members
+     "string": 16,               length of unbounded strings
+     "sequence": 8,              element count of unbounded sequences
+     "max_string": 256,          worst-case length of unbounded strings
+     "max_sequence": null,       worst-case count of unbounded sequences
+     "members": {"RadDetectionSet.dets": 0.1, "BlobChunk.data": 1.0,
+                 "TopicMeta.name": 40}}
+
+A member entry is a ratio of the bound for a bounded member and a length or
+count for an unbounded one. The report groups types by the QoS profiles of
+sections/v<ver>/02-idl-profiles.md (section 3.3.3) using PROFILE_TYPES, and
+flags types whose worst case exceeds --mtu (one UDP datagram; larger
+samples are fragmented) or --shm (one shared-memory chunk). Results are
+written as Markdown, and as JSON with --json.
+
+idl/v<ver>/examples/ is loaded only with --examples. A profile type the
+loaded tree does not declare (the 1.6+ RF beam and radio types live in
+examples/) is listed as not declared instead of sized; a type named on the
+command line must exist.
+
+Usage: xcdr2_sizes.py [--idl-version 1.7] [--examples] [--fill FILE] [--mtu N] [--shm N]
+                      [-o REPORT.md] [--json PATH] [type ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+from idl_parser import ROOT, IdlError, load_version
+from xcdr2 import (
+    ArrayCodec, PrimitiveCodec, Run, SequenceCodec, StringCodec, StructCodec, UnionCodec,
+    XcdrError, compile_type,
+)
+
+# 1500-byte Ethernet MTU less the IPv4 (20) and UDP (8) headers.
+DEFAULT_MTU = 1472
+DEFAULT_SHM = 4 * 1024 * 1024
+
+DEFAULT_FILL = {
+    "default": 0.25, "string": 16, "sequence": 8, "max_string": 256, "max_sequence": None, "members": {},
+}
+
+# Registered topic types (section 3.3.2) by the QoS profile they are sent
+# with (section 3.3.3), as the IDL types carrying them. The spec names the
+# pairing in prose and manifests only, so it is kept here; profiles without
+# an IDL payload type of their own are listed empty.
+PROFILE_TYPES = {
+    "GEOM_TILE": ["TileMeta", "TilePatch", "BlobChunk"],
+    "VIDEO_LIVE": ["VisionFrame"],
+    "VIDEO_ARCHIVE": ["VisionFrame", "BlobChunk"],
+    "RADAR_RT": ["RadDetectionSet", "RadTensorFrame"],
+    "RF_BEAM_RT": ["RfBeamFrame", "RfBeamArraySet"],
+    "RADIO_SCAN_RT": ["RadioScan"],
+    "SEG_MASK_RT": [],
+    "DESC_BATCH": ["KeyframeFeatures", "MatchSet", "Landmark"],
+    "MAP_META": ["MapMeta", "MapAlignment", "MapEvent"],
+    "ZONE_META": ["SpatialZone", "ZoneState"],
+    "EVENT_RT": ["SpatialEvent", "PlannedTrajectory"],
+    "POSE_RT": ["GeoPose", "FramedPose", "NavSatStatus"],
+    "VPS_REQ": [],
+    "VPS_RESP": ["GeoPose"],
+}
+
+MODES = ("min", "typical", "max", "idl_max")
+INF = math.inf
+
+
+class SizeModel:
+    """Bytes a codec occupies from a given offset, for each mode.
+
+    XCDR2 padding depends on the offset modulo 4, so extents are memoized
+    per (codec, start phase, mode, member) and a long sequence of
+    structs costs one dictionary lookup per element.
+    """
+
+    def __init__(self, fill: dict) -> None:
+        self.fill = {**DEFAULT_FILL, **fill}
+        self.fill["members"] = dict(fill.get("members", {}))
+        self.memo: dict[tuple, float] = {}
+
+    def length(self, bound: int | None, mode: str, member: str | None, kind: str) -> float:
+        """Element count (or string length) a sequence (or string) takes in mode."""
+        if mode == "min":
+            return 0
+        if mode == "idl_max" or (mode == "max" and bound is not None):
+            return INF if bound is None else bound
+        if mode == "max":
+            cap = self.fill[f"max_{kind}"]
+            return INF if cap is None else int(cap)
+        setting = self.fill["members"].get(member)
+        if bound is None:
+            return int(setting if setting is not None else self.fill[kind])
+        ratio = setting if setting is not None else self.fill["default"]
+        return min(bound, math.ceil(bound * ratio))
+
+    def extent(self, codec, offset: int, mode: str, member: str | None = None) -> float:
+        key = (codec, offset % 4, mode, member)  # holds the codec, so ids are never reused
+        size = self.memo.get(key)
+        if size is None:
+            size = self.memo[key] = self._extent(codec, offset % 4, mode, member)
+        return size
+
+    def _repeat(self, codec, offset: int, count: float, mode: str) -> float:
+        """Bytes taken by `count` consecutive elements starting at offset."""
+        if count == 0:
+            return 0
+        if count == INF:
+            return INF if self.extent(codec, offset, mode) > 0 else 0
+        total = 0
+        for _ in range(int(count)):
+            step = self.extent(codec, offset + total, mode)
+            if step == INF:
+                return INF
+            total += step
+        return total
+
+    def _extent(self, codec, offset: int, mode: str, member: str | None) -> float:
+        if isinstance(codec, PrimitiveCodec):
+            return -offset % codec.align + codec.size
+        pad4 = -offset % 4
+        if isinstance(codec, StringCodec):
+            n = self.length(codec.bound, mode, member, "string")
+            return pad4 + 4 + n + 1
+        if isinstance(codec, SequenceCodec):
+            n = self.length(codec.bound, mode, member, "sequence")
+            head = pad4 + (8 if codec.dheader else 4)
+            if not codec.dheader:
+                return head + n * codec.element.size  # 4-aligned after the length
+            return head + self._repeat(codec.element, 0, n, mode)
+        if isinstance(codec, ArrayCodec):
+            if codec.dheader:
+                return pad4 + 4 + self._repeat(codec.element, 0, codec.count, mode)
+            return -offset % codec.element.align + codec.count * codec.element.size
+        if isinstance(codec, StructCodec):
+            start = offset + pad4 + 4 if codec.appendable else offset
+            pos = start
+            for step in codec.steps:
+                if isinstance(step, Run):
+                    pos += step.plan(pos % 4, "<").size
+                    continue
+                name, member_codec, optional = step
+                if optional:
+                    pos += 1
+                    if mode == "min":
+                        continue
+                size = self.extent(member_codec, pos, mode, f"{codec.name}.{name}")
+                if size == INF:
+                    return INF
+                pos += size
+            return pos - offset
+        if isinstance(codec, UnionCodec):
+            start = offset + pad4 + 4 if codec.appendable else offset
+            pos = start + self.extent(codec.discriminator, start, mode)
+            branches = {id(b): b for b in [*codec.cases.values(), codec.default_case] if b is not None}
+            sizes = [self.extent(c, pos, mode, f"{codec.name}.{name}") for name, c in branches.values()]
+            if codec.default_case is None:
+                sizes.append(0)  # a label outside the cases selects no branch
+            return pos - offset + (min(sizes) if mode == "min" else max(sizes))
+        raise XcdrError(f"no size rule for {type(codec).__name__}")
+
+    def sample(self, type_codec) -> dict[str, float]:
+        """Sizes of a complete sample (header, body, trailing padding) per mode."""
+        out = {}
+        for mode in MODES:
+            body = self.extent(type_codec.codec, 0, mode)
+            out[mode] = body if body == INF else 4 + body + (-body % 4)
+        return out
+
+
+def qos_profiles(version: str) -> dict[str, dict[str, str]]:
+    """Rows of the QoS profile table (section 3.3.3) of one spec version."""
+    path = ROOT / "sections" / f"v{version}" / "02-idl-profiles.md"
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return {}
+    heading = re.search(r"^#+ .*QoS Profiles", text, re.M)
+    if heading is None:
+        return {}
+    profiles = {}
+    for line in text[heading.end():].splitlines():
+        if line.startswith("#"):
+            break
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        if len(cells) >= 5 and cells[0].startswith("`"):
+            profiles[cells[0].strip("`")] = {
+                "reliability": cells[1], "ordering": cells[2], "deadline": cells[3], "use": cells[4],
+            }
+    return profiles
+
+
+def human(size: float) -> str:
+    if size == INF:
+        return "unbounded"
+    for unit, scale in (("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if size >= scale:
+            return f"{size / scale:.1f} {unit}"
+    return f"{int(size)} B"
+
+
+def flags(sizes: dict[str, float], mtu: int, shm: int) -> list[str]:
+    worst = sizes["max"]
+    if worst == INF:
+        out = ["unbounded"]
+    else:
+        out = [f"> MTU ({math.ceil(worst / mtu)} datagrams)"] if worst > mtu else []
+        if worst > shm:
+            out.append("> shm chunk")
+        if sizes["idl_max"] == INF:
+            out.append("unbounded strings assumed")
+    if sizes["typical"] > mtu:
+        out.append("typical > MTU")
+    return out
+
+
+def declared(schema, name: str) -> bool:
+    """Whether the schema declares name, scoped or unscoped."""
+    return any(n == name or n.endswith("::" + name) for n in schema.decls)
+
+
+def report(version: str, sizes: dict[str, dict[str, float]], groups: dict[str, list[str]],
+           profiles: dict[str, dict[str, str]], fill: dict, mtu: int, shm: int) -> str:
+    caps = [f"unbounded {kind}s as {fill['max_' + kind]} {unit}"
+            for kind, unit in (("string", "bytes"), ("sequence", "elements")) if fill["max_" + kind] is not None]
+    lines = [
+        f"# XCDR2 size budget, SpatialDDS {version}",
+        "",
+        f"MTU budget {mtu} B, shared-memory chunk {human(shm)}. Sizes include the 4-byte",
+        "encapsulation header and trailing padding. Typical sizes fill bounded members to",
+        f"{fill['default']:.0%} unless configured; the worst case counts {', '.join(caps) or 'only IDL bounds'}.",
+        "",
+    ]
+    for group, names in groups.items():
+        info = profiles.get(group)
+        lines.append(f"## {group}")
+        lines.append("")
+        if info:
+            lines += [f"{info['reliability']}, {info['ordering'].lower()}, deadline {info['deadline']}: {info['use']}", ""]
+        if not names:
+            lines += ["No IDL type is mapped to this profile.", ""]
+            continue
+        sized = [n for n in names if n in sizes]
+        if sized:
+            lines += ["| Type | Min | Typical | Max | Flags |", "|------|-----|---------|-----|-------|"]
+            for name in sized:
+                s = sizes[name]
+                lines.append(f"| `{name}` | {human(s['min'])} | {human(s['typical'])} | {human(s['max'])} "
+                             f"| {', '.join(flags(s, mtu, shm))} |")
+            lines.append("")
+        undeclared = [n for n in names if n not in sizes]
+        if undeclared:
+            lines += [f"Not declared in idl/v{version}: {', '.join(f'`{n}`' for n in undeclared)}.", ""]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("types", nargs="*", help="types to size (default: every type in PROFILE_TYPES)")
+    parser.add_argument("--idl-version", default="1.7", help="idl/v<ver> tree to load (default: 1.7)")
+    parser.add_argument("--examples", action="store_true", help="also load idl/v<ver>/examples/")
+    parser.add_argument("--fill", type=Path, help="JSON file of fill ratios for the typical size")
+    parser.add_argument("--mtu", type=int, default=DEFAULT_MTU, help=f"transport payload budget in bytes (default: {DEFAULT_MTU})")
+    parser.add_argument("--shm", type=int, default=DEFAULT_SHM, help=f"shared-memory chunk size in bytes (default: {DEFAULT_SHM})")
+    parser.add_argument("-o", "--output", type=Path, help="write the Markdown report here instead of stdout")
+    parser.add_argument("--json", metavar="PATH", help="also write sizes as JSON ('-': stdout, with the report on stderr unless -o)")
+    args = parser.parse_args(argv)
+
+    try:
+        fill = json.loads(args.fill.read_text(encoding="utf-8")) if args.fill else {}
+        schema = load_version(args.idl_version, examples=args.examples)
+    except (OSError, ValueError, IdlError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    profiles = qos_profiles(args.idl_version)
+    if args.types:
+        groups = {"Requested types": args.types}
+    else:
+        groups = {p: PROFILE_TYPES.get(p, []) for p in profiles or PROFILE_TYPES}
+    model = SizeModel(fill)
+    sizes: dict[str, dict[str, float]] = {}
+    missing, undeclared = [], []
+    for names in groups.values():
+        for name in names:
+            if name in sizes or name in undeclared:
+                continue
+            if not args.types and not declared(schema, name):
+                undeclared.append(name)
+                continue
+            try:
+                sizes[name] = model.sample(compile_type(schema, name))
+            except (KeyError, XcdrError) as exc:
+                missing.append(f"{name}: {exc.args[0]}")
+    if missing:
+        print("error: cannot size " + "; ".join(missing), file=sys.stderr)
+        return 2
+
+    text = report(args.idl_version, sizes, groups, profiles, model.fill, args.mtu, args.shm)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        # With --json - stdout carries only the JSON document.
+        print(text, file=sys.stderr if args.json == "-" else sys.stdout)
+    if args.json:
+        doc = {
+            "version": args.idl_version, "mtu": args.mtu, "shm": args.shm,
+            "profiles": {g: {"qos": profiles.get(g), "types": names} for g, names in groups.items()},
+            "types": {name: {**{m: None if s[m] == INF else int(s[m]) for m in MODES},
+                             "flags": flags(s, args.mtu, args.shm)}
+                      for name, s in sizes.items()},
+            "undeclared": undeclared,
+        }
+        out = json.dumps(doc, indent=2) + "\n"
+        if args.json == "-":
+            sys.stdout.write(out)
+        else:
+            Path(args.json).write_text(out, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())